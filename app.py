@@ -14,6 +14,11 @@ if __name__ == "__main__":
     print("Starting AI Resume Analyzer...")
     print("Navigate to the URL shown below in your browser")
     print("-" * 50)
+
+    # Load the model and job catalog in the background while the server starts;
+    # the UI shows "warming up" until they are ready
+    from backend.warmup import start_warmup
+    start_warmup()
     
     # Run the Streamlit app
     import streamlit.web.cli as stcli
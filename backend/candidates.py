@@ -0,0 +1,209 @@
+import sys
+import os
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from typing import Dict, List
+
+import numpy as np
+
+from backend.catalog import normalize_rows
+from backend.ranking import fuse_scores, semantic_scores, top_k_indices
+from backend.skills import SkillExtractor
+
+
+class CandidateIndex:
+    """
+    Rank previously analyzed resumes for a job role (reverse matching).
+
+    Keeps an inverted skill -> resume posting list and a normalized matrix of
+    resume skill-profile embeddings, then scores a role against the whole
+    pool with the same hybrid logic JobMatcher uses for a single resume.
+    """
+
+    def __init__(self, matcher, capacity: int = 1024):
+        self.matcher         = matcher
+        self.embedding_model = matcher.embedding_model
+        self.extractor       = SkillExtractor()
+
+        self.resume_ids: List[str]  = []
+        self.profiles:   List[Dict] = []
+        self.row_by_id:  Dict[str, int]       = {}
+        self.postings:   Dict[str, List[int]] = {}
+        self._embeddings = None
+        self._capacity   = capacity
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Normalized resume embeddings, one row per indexed resume"""
+        if self._embeddings is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self._embeddings[:len(self)]
+
+    # ── Indexing ─────────────────────────────────────────────────────────────
+
+    def add(self, resume_id: str, skills_data: Dict, resume_data: Dict = None):
+        """Index one analyzed resume"""
+        self.add_many([(resume_id, skills_data, resume_data)])
+
+    def add_many(self, entries: List[tuple]):
+        """
+        Index (resume_id, skills_data, resume_data) tuples, encoding all skill
+        profiles in one batch.
+        """
+        entries = [e if len(e) == 3 else (e[0], e[1], None) for e in entries]
+        for resume_id, _, _ in entries:
+            if resume_id in self.row_by_id:
+                raise ValueError(f"Resume {resume_id!r} is already indexed")
+
+        texts = [
+            self.embedding_model.create_skill_profile_text(
+                sd.get('skills', []), sd.get('experience_years', 0))
+            for _, sd, _ in entries
+        ]
+        vectors = normalize_rows(self.embedding_model.generate_embeddings(texts))
+        if vectors.ndim != 2 or vectors.shape[0] != len(entries):
+            vectors = None
+
+        for n, (resume_id, skills_data, resume_data) in enumerate(entries):
+            row = len(self.resume_ids)
+            self.resume_ids.append(resume_id)
+            self.row_by_id[resume_id] = row
+            self.profiles.append({
+                'name':             (resume_data or {}).get('name', resume_id),
+                'skills':           list(skills_data.get('skills', [])),
+                'experience_years': skills_data.get('experience_years', 0),
+            })
+            for skill in {s.lower() for s in skills_data.get('skills', [])}:
+                self.postings.setdefault(skill, []).append(row)
+            if vectors is not None:
+                self._store_embedding(row, vectors[n])
+
+    def _store_embedding(self, row: int, vector: np.ndarray):
+        # Rows of batches that failed to encode stay zero, so `row` may be far ahead
+        if self._embeddings is None:
+            self._embeddings = np.zeros((max(self._capacity, row + 1), len(vector)), dtype=np.float32)
+        elif row >= len(self._embeddings):
+            size  = max(row + 1, len(self._embeddings) * 2)
+            grown = np.zeros((size, self._embeddings.shape[1]), dtype=np.float32)
+            grown[:len(self._embeddings)] = self._embeddings
+            self._embeddings = grown
+        self._embeddings[row] = vector
+
+    # ── Scoring ──────────────────────────────────────────────────────────────
+
+    def _skill_counts(self, skills) -> np.ndarray:
+        """How many of `skills` each indexed resume has (via posting lists)"""
+        rows = [self.postings[s] for s in skills if s in self.postings]
+        if not rows:
+            return np.zeros(len(self), dtype=np.int64)
+        return np.bincount(np.concatenate(rows), minlength=len(self))
+
+    def _skill_credit(self, skills: List[str]) -> np.ndarray:
+        """
+        Per-resume credit summed over `skills` (lowercase): 1 for each skill
+        the resume has, otherwise the best related skill's similarity times
+        the matcher's partial_credit, exactly as JobMatcher credits a resume
+        against a role (see SkillSimilarity.credit).
+        """
+        similarity = self.matcher.skill_similarity
+        partial    = self.matcher.partial_credit
+        if similarity is None or not partial:
+            return self._skill_counts(skills).astype(np.float64)
+        column = {skill: j for j, skill in enumerate(skills)}
+        credit = np.zeros((len(self), len(skills)))
+        for skill, rows in self.postings.items():
+            for related, sim in similarity.neighbours(skill).items():
+                j = column.get(related)
+                if j is not None:
+                    credit[rows, j] = np.maximum(credit[rows, j], sim * partial)
+        for skill, j in column.items():
+            credit[self.postings.get(skill, []), j] = 1.0
+        return credit.sum(axis=1)
+
+    def _candidate_entry(self, row: int, required: List[str], all_skills: List[str]) -> Dict:
+        profile      = self.profiles[row]
+        resume_lower = {s.lower() for s in profile['skills']}
+        all_lower    = {s.lower() for s in all_skills}
+        return {
+            'id':               self.resume_ids[row],
+            'name':             profile['name'],
+            'experience_years': profile['experience_years'],
+            'matching_skills':  [s for s in profile['skills'] if s.lower() in all_lower],
+            'missing_skills':   [s for s in required if s.lower() not in resume_lower],
+        }
+
+    def rank_candidates(self, role: Dict = None, role_id=None, description: str = None,
+                        top_k: int = 10) -> List[Dict]:
+        """
+        Rank indexed resumes for a catalog role (by dict or id) or an ad-hoc
+        job description. Skills of an ad-hoc description are extracted with
+        SkillExtractor and treated as required.
+        """
+        if len(self) == 0:
+            return []
+        catalog = self.matcher.catalog
+
+        # ── Resolve the role ─────────────────────────────────────────────────
+        query = None
+        if role_id is not None:
+            row = catalog.index_by_key.get(role_id)
+            if row is None:
+                return []
+            role = catalog.job_roles[row]
+            if catalog.has_embeddings:
+                query = np.asarray(catalog.embeddings[row], dtype=np.float32)
+        if role is not None:
+            required = list(role.get('required_skills', []))
+            nice     = list(role.get('nice_to_have', []))
+            if query is None:
+                text = self.embedding_model.create_job_description_text(role)
+                emb  = self.embedding_model.generate_embedding(text)
+                query = normalize_rows(emb.reshape(1, -1))[0] if len(emb) else None
+        elif description:
+            found    = self.extractor.extract_skills_regex(description)
+            required = sorted(self.extractor._display_name(s) for s in found)
+            nice     = []
+            emb      = self.embedding_model.generate_embedding(description)
+            query    = normalize_rows(emb.reshape(1, -1))[0] if len(emb) else None
+        else:
+            return []
+
+        req_lower  = {s.lower() for s in required}
+        all_lower  = req_lower | {s.lower() for s in nice}
+        all_skills = required + [s for s in nice if s.lower() not in req_lower]
+
+        # ── Skill scores from the posting lists, semantic scores from the matrix
+        req_match = np.zeros(len(self))
+        all_match = np.zeros(len(self))
+        if req_lower:
+            req_match = np.round(self._skill_credit(sorted(req_lower)) / len(req_lower) * 100, 2)
+        if all_lower:
+            all_match = np.round(self._skill_credit(sorted(all_lower)) / len(all_lower) * 100, 2)
+
+        sims       = None
+        embeddings = self.embeddings
+        if query is not None and embeddings.shape[0] == len(self):
+            sims = semantic_scores(embeddings, query)
+
+        # ── Fuse per resume, as JobMatcher does per role ─────────────────────
+        final = fuse_scores(req_match, all_match, sims,
+                            self.matcher.fusion, self.matcher.fusion_weights)
+        ranked = []
+        for row in top_k_indices(final, all_match, top_k):
+            entry = self._candidate_entry(row, required, all_skills)
+            entry['required_skill_match'] = float(req_match[row])
+            entry['overall_skill_match']  = float(all_match[row])
+            if sims is not None:
+                entry['similarity_score'] = float(sims[row])
+                entry['match_percentage'] = float(sims[row] * 100)
+            entry['final_score'] = float(final[row])
+            ranked.append(entry)
+        return ranked
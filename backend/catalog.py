@@ -0,0 +1,199 @@
+import hashlib
+import json
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Role fields the matches can be filtered by
+FACETS = ('category', 'department')
+
+def role_key(job: Dict):
+    """Stable identity of a job role (its `id`, falling back to the title)"""
+    return job.get('id', job.get('title'))
+
+
+def role_facet(job: Dict, facet: str) -> str:
+    return job.get(facet) or 'Other'
+
+
+def role_content_hash(job: Dict) -> str:
+    """Hash of everything in a role that affects its embedding or skill indexes"""
+    payload = json.dumps(job, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize embedding rows so cosine similarity becomes a dot product"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.size == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_skill_arrays(job_roles: Sequence[Dict]):
+    """
+    Encode per-role skills as CSR arrays over a lowercase skill vocabulary.
+    Returns (vocab, required_indptr, required_indices, all_indptr, all_indices);
+    each row holds the unique vocabulary ids of that role's skills.
+    """
+    vocab, index = [], {}
+
+    def _ids(skills):
+        ids = []
+        for skill in skills:
+            key = skill.lower()
+            if key not in index:
+                index[key] = len(vocab)
+                vocab.append(key)
+            if index[key] not in ids:
+                ids.append(index[key])
+        return ids
+
+    req_rows, all_rows = [], []
+    for job in job_roles:
+        req = _ids(job.get('required_skills', []))
+        req_rows.append(req)
+        all_rows.append(req + [i for i in _ids(job.get('nice_to_have', [])) if i not in req])
+
+    def _csr(rows):
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in rows], out=indptr[1:])
+        indices = np.fromiter((i for r in rows for i in r), dtype=np.int32, count=int(indptr[-1]))
+        return indptr, indices
+
+    return (vocab,) + _csr(req_rows) + _csr(all_rows)
+
+
+class JobCatalog:
+    """
+    Immutable snapshot of the job roles, their normalized embeddings and
+    skill indexes (CSR arrays over a lowercase skill vocabulary).
+
+    A matcher swaps whole snapshots in a single attribute assignment, so a
+    request that grabbed a snapshot keeps a consistent view even while the
+    catalog is being reloaded. `job_roles` may be a plain list of dicts or a
+    lazy sequence backed by a memory-mapped bundle or shared-memory segment.
+    """
+
+    def __init__(self, job_roles: Sequence[Dict], embeddings: np.ndarray,
+                 role_hashes: Optional[Sequence[str]] = None,
+                 skill_arrays: Optional[tuple] = None,
+                 bundle_path: Optional[str] = None,
+                 shared_name: Optional[str] = None,
+                 bundle_id: Optional[str] = None):
+        self.job_roles   = job_roles
+        self.embeddings  = embeddings
+        self.role_hashes = role_hashes if role_hashes is not None else \
+            [role_content_hash(j) for j in job_roles]
+        self.bundle_path = bundle_path
+        self.bundle_id   = bundle_id     # manifest digest of the bundle it was loaded from
+        self.shared_name = shared_name
+        self._selections = {}   # filter -> row ids, see select_rows
+
+        (self.skill_vocab,
+         self.required_indptr, self.required_indices,
+         self.all_indptr, self.all_indices) = skill_arrays or build_skill_arrays(job_roles)
+
+    def __len__(self) -> int:
+        return len(self.job_roles)
+
+    @property
+    def has_embeddings(self) -> bool:
+        return self.embeddings.ndim == 2 and self.embeddings.shape[0] == len(self.job_roles)
+
+    @cached_property
+    def skill_index(self) -> Dict[str, int]:
+        """Lowercase skill -> vocabulary id"""
+        return {skill: i for i, skill in enumerate(self.skill_vocab)}
+
+    @cached_property
+    def index_by_key(self) -> Dict:
+        return {role_key(j): i for i, j in enumerate(self.job_roles)}
+
+    @cached_property
+    def facet_rows(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """facet -> value -> sorted ids of the roles with that value"""
+        rows = {facet: {} for facet in FACETS}
+        for i, job in enumerate(self.job_roles):
+            for facet in FACETS:
+                rows[facet].setdefault(role_facet(job, facet), []).append(i)
+        return {facet: {value: np.array(ids, dtype=np.int64) for value, ids in values.items()}
+                for facet, values in rows.items()}
+
+    def facet_values(self, facet: str) -> List[str]:
+        return sorted(self.facet_rows.get(facet, {}))
+
+    def select_rows(self, categories: Optional[Sequence[str]] = None,
+                    departments: Optional[Sequence[str]] = None) -> Optional[np.ndarray]:
+        """
+        Sorted ids of the roles in any of `categories` and any of
+        `departments`, or None when neither filter is set (every role).
+        Built from the precomputed facet rows and kept per filter, so a
+        repeated filter costs a dict lookup.
+        """
+        filters = tuple((facet, frozenset(values)) for facet, values in
+                        zip(FACETS, (categories, departments)) if values)
+        if not filters:
+            return None
+        selected = self._selections.get(filters)
+        if selected is None:
+            for facet, values in filters:
+                postings = [self.facet_rows[facet][v] for v in values if v in self.facet_rows[facet]]
+                rows     = np.unique(np.concatenate(postings)) if postings else np.zeros(0, dtype=np.int64)
+                selected = rows if selected is None else np.intersect1d(selected, rows, assume_unique=True)
+            if len(self._selections) >= 256:
+                self._selections.clear()
+            self._selections[filters] = selected
+        return selected
+
+    @classmethod
+    def build(cls, job_roles: List[Dict], embedding_model,
+              previous: Optional['JobCatalog'] = None) -> 'JobCatalog':
+        """
+        Build a snapshot, re-encoding only roles that are new or whose content
+        hash changed since `previous`. Unchanged roles reuse their old row.
+        """
+        if not job_roles:
+            return cls([], np.array([]), [])
+
+        hashes = [role_content_hash(j) for j in job_roles]
+
+        reuse = {}
+        if previous is not None and previous.has_embeddings:
+            for i, (job, h) in enumerate(zip(job_roles, hashes)):
+                old = previous.index_by_key.get(role_key(job))
+                if old is not None and previous.role_hashes[old] == h:
+                    reuse[i] = old
+
+        stale = [i for i in range(len(job_roles)) if i not in reuse]
+        if stale:
+            texts = [embedding_model.create_job_description_text(job_roles[i]) for i in stale]
+            fresh = normalize_rows(embedding_model.generate_embeddings(texts))
+        else:
+            fresh = np.zeros((0, previous.embeddings.shape[1]), dtype=np.float32)
+
+        if fresh.ndim != 2 or fresh.shape[0] != len(stale):
+            # Encoding failed (e.g. model unavailable) — keep the old behaviour of
+            # an empty matrix so embedding matching degrades to no results
+            print("Could not encode job roles, semantic matching disabled")
+            return cls(job_roles, np.array([]), hashes)
+
+        if reuse and stale and fresh.shape[1] != previous.embeddings.shape[1]:
+            # Embedding model changed dimensions — old rows are not comparable
+            return cls.build(job_roles, embedding_model)
+
+        if not reuse:
+            embeddings = fresh
+        else:
+            dim        = previous.embeddings.shape[1]
+            embeddings = np.empty((len(job_roles), dim), dtype=np.float32)
+            for i, old in reuse.items():
+                embeddings[i] = previous.embeddings[old]
+            if stale:
+                embeddings[stale] = fresh
+
+        print(f"Job catalog: {len(reuse)} roles reused, {len(stale)} roles encoded")
+        return cls(job_roles, embeddings, hashes)
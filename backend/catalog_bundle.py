@@ -0,0 +1,301 @@
+"""
+Columnar binary job catalog bundle.
+
+`compile_catalog_bundle` turns job_roles.json into a directory of flat
+.npy columns (ids, UTF-8 string blobs with offsets, CSR skill indexes and the
+normalized embedding matrix). `load_catalog_bundle` opens every column with
+numpy.memmap, so loading is near-instant and the pages are shared by every
+process that maps the same bundle.
+
+Every compile writes a new generation of columns (`<column>.<generation>.npy`)
+and then swaps in the manifest that names it, so a loader never pairs one
+compile's manifest with another's columns. Older generations are removed
+once the new manifest is in place; processes that still map them keep
+their pages.
+
+Usage:
+    python -m backend.catalog_bundle data/job_roles.json data/job_roles.bundle
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.catalog import JobCatalog, build_skill_arrays, normalize_rows, role_content_hash
+
+BUNDLE_VERSION = 2
+MANIFEST       = 'manifest.json'
+LOAD_ATTEMPTS  = 3        # manifest re-reads when a recompile removes the columns being mapped
+STRING_FIELDS  = ('title', 'category', 'department', 'description')
+CORE_FIELDS    = ('id',) + STRING_FIELDS + ('required_skills', 'nice_to_have')
+
+
+# ── Column helpers ───────────────────────────────────────────────────────────
+
+def _column_path(bundle_dir: str, generation: str, name: str) -> str:
+    return os.path.join(bundle_dir, f'{name}.{generation}.npy')
+
+
+def _generation_of(filename: str) -> str:
+    """Generation in a column (or leftover .tmp) file name, or '' for other files"""
+    if filename.endswith('.tmp'):
+        filename = filename[:-len('.tmp')]
+    parts = filename.split('.')
+    if len(parts) < 3 or parts[-1] != 'npy' or len(parts[-2]) != 16:
+        return ''
+    try:
+        int(parts[-2], 16)
+    except ValueError:
+        return ''
+    return parts[-2]
+
+
+def _save(bundle_dir: str, generation: str, name: str, array: np.ndarray):
+    # Write-then-rename, so a column file is never seen half-written
+    path = _column_path(bundle_dir, generation, name)
+    with open(path + '.tmp', 'wb') as f:
+        np.save(f, array)
+    os.replace(path + '.tmp', path)
+
+
+def _load(bundle_dir: str, generation: str, name: str) -> np.ndarray:
+    return np.load(_column_path(bundle_dir, generation, name), mmap_mode='r')
+
+
+def _save_strings(bundle_dir: str, generation: str, name: str, values: Sequence[str]):
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    _save(bundle_dir, generation, f'{name}.offsets', offsets)
+    _save(bundle_dir, generation, f'{name}.utf8', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+
+def _remove_older_generations(bundle_dir: str, generation: str):
+    """
+    Delete columns of generations before `generation`. Newer ones belong to a
+    compile that is still running and are left alone.
+    """
+    for filename in os.listdir(bundle_dir):
+        old = _generation_of(filename)
+        if old and int(old, 16) < int(generation, 16):
+            try:
+                os.remove(os.path.join(bundle_dir, filename))
+            except OSError:
+                pass
+
+
+class StringColumn:
+    """Read-only sequence of strings decoded on access from a mapped UTF-8 blob"""
+
+    def __init__(self, bundle_dir: str, generation: str, name: str):
+        self.offsets = _load(bundle_dir, generation, f'{name}.offsets')
+        self.blob    = _load(bundle_dir, generation, f'{name}.utf8')
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class BundleRoles:
+    """Sequence of job role dicts materialized lazily from bundle columns"""
+
+    def __init__(self, bundle_dir: str, generation: str):
+        self.ids     = _load(bundle_dir, generation, 'ids')
+        self.present = _load(bundle_dir, generation, 'present')
+        self.strings = {f: StringColumn(bundle_dir, generation, f) for f in STRING_FIELDS}
+        self.skills  = StringColumn(bundle_dir, generation, 'skill_names')
+        self.extra   = StringColumn(bundle_dir, generation, 'extra')
+        self.required_indptr  = _load(bundle_dir, generation, 'display_required_indptr')
+        self.required_indices = _load(bundle_dir, generation, 'display_required_indices')
+        self.nice_indptr      = _load(bundle_dir, generation, 'display_nice_indptr')
+        self.nice_indices     = _load(bundle_dir, generation, 'display_nice_indices')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> Dict:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+
+        mask = int(self.present[i])
+        job  = {'id': int(self.ids[i])}
+        for bit, field in enumerate(STRING_FIELDS):
+            if mask & (1 << bit):
+                job[field] = self.strings[field][i]
+        job['required_skills'] = [
+            self.skills[j] for j in self.required_indices[self.required_indptr[i]:self.required_indptr[i + 1]]
+        ]
+        job['nice_to_have'] = [
+            self.skills[j] for j in self.nice_indices[self.nice_indptr[i]:self.nice_indptr[i + 1]]
+        ]
+        # Keep the JSON field order for the description
+        if 'description' in job:
+            job['description'] = job.pop('description')
+        extra = self.extra[i]
+        if extra:
+            job.update(json.loads(extra))
+        return job
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+# ── Compiler ─────────────────────────────────────────────────────────────────
+
+def compile_catalog_bundle(job_roles_path: str, bundle_dir: str, embedding_model=None) -> Dict:
+    """Compile job_roles.json into a columnar bundle; returns the manifest"""
+    with open(job_roles_path, 'rb') as f:
+        raw = f.read()
+    job_roles = json.loads(raw).get('job_roles', [])
+
+    for job in job_roles:
+        if not isinstance(job.get('id'), int):
+            raise ValueError(f"Bundle requires integer role ids, got {job.get('id')!r}")
+
+    if embedding_model is None:
+        from model.embeddings import EmbeddingModel
+        embedding_model = EmbeddingModel()
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    n = len(job_roles)
+    # Fixed-width hex of the start time: later compiles get larger generations
+    generation = f'{time.time_ns():016x}'
+
+    # ── Scalar and string columns ────────────────────────────────────────────
+    _save(bundle_dir, generation, 'ids', np.array([j['id'] for j in job_roles], dtype=np.int64))
+    present = np.zeros(n, dtype=np.uint8)
+    for bit, field in enumerate(STRING_FIELDS):
+        present |= np.array([(field in j) << bit for j in job_roles], dtype=np.uint8)
+        _save_strings(bundle_dir, generation, field, [str(j.get(field, '')) for j in job_roles])
+    _save(bundle_dir, generation, 'present', present)
+    _save_strings(bundle_dir, generation, 'extra', [
+        json.dumps({k: v for k, v in j.items() if k not in CORE_FIELDS}, ensure_ascii=False)
+        if set(j) - set(CORE_FIELDS) else ''
+        for j in job_roles
+    ])
+    _save_strings(bundle_dir, generation, 'role_hashes', [role_content_hash(j) for j in job_roles])
+
+    # ── Display skill lists (original spelling, original order) ─────────────
+    names, name_index = [], {}
+
+    def _display_csr(field):
+        indptr, indices = np.zeros(n + 1, dtype=np.int64), []
+        for i, job in enumerate(job_roles):
+            for skill in job.get(field, []):
+                if skill not in name_index:
+                    name_index[skill] = len(names)
+                    names.append(skill)
+                indices.append(name_index[skill])
+            indptr[i + 1] = len(indices)
+        return indptr, np.array(indices, dtype=np.int32)
+
+    for field, prefix in (('required_skills', 'required'), ('nice_to_have', 'nice')):
+        indptr, indices = _display_csr(field)
+        _save(bundle_dir, generation, f'display_{prefix}_indptr', indptr)
+        _save(bundle_dir, generation, f'display_{prefix}_indices', indices)
+    _save_strings(bundle_dir, generation, 'skill_names', names)
+
+    # ── Scoring skill indexes (lowercase, unique per role) ──────────────────
+    vocab, req_indptr, req_indices, all_indptr, all_indices = build_skill_arrays(job_roles)
+    _save_strings(bundle_dir, generation, 'skill_vocab', vocab)
+    _save(bundle_dir, generation, 'required_indptr', req_indptr)
+    _save(bundle_dir, generation, 'required_indices', req_indices)
+    _save(bundle_dir, generation, 'all_indptr', all_indptr)
+    _save(bundle_dir, generation, 'all_indices', all_indices)
+
+    # ── Normalized embeddings ────────────────────────────────────────────────
+    texts      = [embedding_model.create_job_description_text(j) for j in job_roles]
+    embeddings = normalize_rows(embedding_model.generate_embeddings(texts))
+    if embeddings.ndim != 2 or embeddings.shape[0] != n:
+        raise RuntimeError("Could not encode job roles for the bundle")
+    _save(bundle_dir, generation, 'embeddings', np.ascontiguousarray(embeddings, dtype=np.float32))
+
+    # Manifest last: its presence (and mtime) marks a complete bundle, and
+    # its generation says which columns belong to it
+    manifest = {
+        'version':       BUNDLE_VERSION,
+        'generation':    generation,
+        'count':         n,
+        'dim':           int(embeddings.shape[1]),
+        'model':         getattr(embedding_model, 'model_name', None),
+        'source_sha256': hashlib.sha256(raw).hexdigest(),
+    }
+    manifest_path = os.path.join(bundle_dir, MANIFEST)
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    _remove_older_generations(bundle_dir, generation)
+    return manifest
+
+
+# ── Loader ───────────────────────────────────────────────────────────────────
+
+def read_manifest(bundle_dir: str) -> Dict:
+    with open(os.path.join(bundle_dir, MANIFEST), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported catalog bundle version {manifest.get('version')}")
+    return manifest
+
+
+def bundle_id(manifest: Dict) -> str:
+    """Identity of one compiled bundle (every recompile changes it)"""
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_catalog_bundle(bundle_dir: str) -> JobCatalog:
+    """Open a compiled bundle as a JobCatalog backed by memory-mapped columns"""
+    for attempt in range(LOAD_ATTEMPTS):
+        manifest = read_manifest(bundle_dir)
+        try:
+            return _map_generation(bundle_dir, manifest)
+        except FileNotFoundError:
+            # A recompile swapped the manifest and removed this generation
+            # before all of its columns were mapped: start over from the new one
+            if attempt == LOAD_ATTEMPTS - 1:
+                raise
+
+
+def _map_generation(bundle_dir: str, manifest: Dict) -> JobCatalog:
+    generation = manifest['generation']
+    skill_arrays = (
+        list(StringColumn(bundle_dir, generation, 'skill_vocab')),
+        _load(bundle_dir, generation, 'required_indptr'),
+        _load(bundle_dir, generation, 'required_indices'),
+        _load(bundle_dir, generation, 'all_indptr'),
+        _load(bundle_dir, generation, 'all_indices'),
+    )
+    return JobCatalog(
+        BundleRoles(bundle_dir, generation),
+        _load(bundle_dir, generation, 'embeddings'),
+        role_hashes  = StringColumn(bundle_dir, generation, 'role_hashes'),
+        skill_arrays = skill_arrays,
+        bundle_path  = bundle_dir,
+        bundle_id    = bundle_id(manifest),
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m backend.catalog_bundle <job_roles.json> <bundle_dir>")
+        sys.exit(1)
+    info = compile_catalog_bundle(sys.argv[1], sys.argv[2])
+    print(f"Compiled {info['count']} roles ({info['dim']}-d embeddings) into {sys.argv[2]}")
@@ -0,0 +1,317 @@
+"""
+Cohort analytics over many analyzed resumes.
+
+`CohortStats` aggregates what placement cells ask about a whole batch: the
+most common skills, the most frequent gaps against each resume's target
+roles (from `CareerAdvisor.analyze_skill_gaps`), which roles resumes fit best
+and how well, and experience / coverage distributions. Everything is kept as
+numpy count arrays indexed by skill or role id, so adding a resume costs
+O(its skills + matches) and a report never re-analyzes anyone. Stats can be
+saved to and loaded from an .npz file, or rebuilt from the ResumeStore
+without re-parsing PDFs.
+
+Usage:
+    python -m backend.cohort [--db data/resumes.db] [--top 20] [--stats data/cohort.npz]
+"""
+
+import json
+import os
+import sys
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.advisor import CareerAdvisor
+
+EXPERIENCE_BINS   = (0, 1, 3, 5, 10)   # lower bounds, in years
+EXPERIENCE_LABELS = ('0', '1-2', '3-4', '5-9', '10+')
+SCORE_BINS        = 10                 # 0-10, 10-20, ... 90-100
+SCORE_LABELS      = tuple(f'{10 * i}-{10 * (i + 1)}' for i in range(SCORE_BINS))
+GAP_TARGETS       = 3                  # gaps are measured against the top 3 matches
+MATCH_TOP_K       = 5                  # matches counted per resume, over all roles
+DEFAULT_PATH      = os.path.join(parent_dir, 'data', 'cohort.npz')
+
+
+def _score_bin(score: float) -> int:
+    return min(max(int(score // 10), 0), SCORE_BINS - 1)
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Array with at least `size` rows (capacity doubles), zero-filled"""
+    if size <= len(array):
+        return array
+    grown = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class CohortStats:
+    """Incremental skill, gap and role-fit counts over a set of resumes"""
+
+    def __init__(self, advisor: CareerAdvisor = None):
+        self.advisor     = advisor
+        self._lock       = threading.RLock()   # one stats object is shared by UI sessions
+        self.keys        = set()   # resume keys already counted
+        self.count       = 0
+
+        self.skill_ids   = {}      # lowercase skill -> id
+        self.skill_names = []      # display name per id
+        self.role_ids    = {}      # role id (or title) -> id
+        self.role_titles = []
+
+        self.skill_counts    = np.zeros(64, dtype=np.int64)
+        self.gap_counts      = np.zeros(64, dtype=np.int64)
+        self.top_role_counts = np.zeros(16, dtype=np.int64)
+        self.role_fit        = np.zeros((16, SCORE_BINS), dtype=np.int64)
+        self.role_score_sum  = np.zeros(16, dtype=np.float64)
+        self.experience_hist = np.zeros(len(EXPERIENCE_BINS), dtype=np.int64)
+        self.coverage_hist   = np.zeros(SCORE_BINS, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # ── Vocabulary ───────────────────────────────────────────────────────────
+
+    def _skill_id_array(self, skills: Iterable[str]) -> np.ndarray:
+        ids = set()
+        for skill in skills:
+            key = skill.lower()
+            if key not in self.skill_ids:
+                self.skill_ids[key] = len(self.skill_names)
+                self.skill_names.append(skill)
+            ids.add(self.skill_ids[key])
+        size = len(self.skill_names)
+        self.skill_counts = _grow(self.skill_counts, size)
+        self.gap_counts   = _grow(self.gap_counts, size)
+        return np.fromiter(ids, dtype=np.int64, count=len(ids))
+
+    def _role_id(self, match: Dict) -> int:
+        key = match.get('id', match.get('title'))
+        if key not in self.role_ids:
+            self.role_ids[key] = len(self.role_titles)
+            self.role_titles.append(match.get('title', str(key)))
+            size = len(self.role_titles)
+            self.top_role_counts = _grow(self.top_role_counts, size)
+            self.role_fit        = _grow(self.role_fit, size)
+            self.role_score_sum  = _grow(self.role_score_sum, size)
+        return self.role_ids[key]
+
+    # ── Accumulation ─────────────────────────────────────────────────────────
+
+    def add(self, skills_data: Dict, job_matches: List[Dict], gap_analysis: Dict = None,
+            key: str = None) -> bool:
+        """
+        Count one analyzed resume (`extract_all_skills` output plus its job
+        match dicts). The gap analysis is computed against the top matches if
+        not given. Returns False if `key` was already counted.
+        """
+        skills = skills_data.get('skills', [])
+        years  = int(skills_data.get('experience_years', 0) or 0)
+        if gap_analysis is None and job_matches:
+            if self.advisor is None:
+                self.advisor = CareerAdvisor()
+            gap_analysis = self.advisor.analyze_skill_gaps(skills, job_matches[:GAP_TARGETS], years)
+
+        with self._lock:
+            if key is not None:
+                if key in self.keys:
+                    return False
+                self.keys.add(key)
+            self._count(skills, years, job_matches, gap_analysis)
+        return True
+
+    def _count(self, skills: List[str], years: int, job_matches: List[Dict], gap_analysis: Dict):
+        # Ids first: registering new skills may reallocate the count arrays
+        ids = self._skill_id_array(skills)
+        self.skill_counts[ids] += 1
+        if gap_analysis and 'error' not in gap_analysis:
+            gaps = self._skill_id_array(gap_analysis.get('top_missing_skills', []))
+            self.gap_counts[gaps] += 1
+            self.coverage_hist[_score_bin(gap_analysis.get('skill_coverage_percentage', 0))] += 1
+
+        for rank, match in enumerate(job_matches):
+            role  = self._role_id(match)
+            score = float(match.get('final_score', match.get('required_skill_match', 0)))
+            self.role_fit[role, _score_bin(score)] += 1
+            self.role_score_sum[role] += score
+            if rank == 0:
+                self.top_role_counts[role] += 1
+
+        self.experience_hist[np.searchsorted(EXPERIENCE_BINS, years, side='right') - 1] += 1
+        self.count += 1
+
+    def add_batch(self, batch: Dict) -> int:
+        """Count the results of backend.dedup.analyze_resume_batch; returns how many were new"""
+        return sum(
+            self.add(result['skills_data'], result['job_matches'], key=doc_id)
+            for doc_id, result in batch.get('results', {}).items()
+        )
+
+    def sync_store(self, store, matcher, top_k: int = MATCH_TOP_K) -> int:
+        """
+        Count the ResumeStore resumes not counted yet, matching their stored
+        skills (no PDF parsing). Returns how many were added.
+        """
+        from backend.results import to_dicts
+
+        added = 0
+        for key, skills, years in store.iter_profiles():
+            if key in self.keys:
+                continue
+            matches = to_dicts(matcher.rank_jobs(skills, years, top_k)) if skills else []
+            added  += self.add({'skills': skills, 'experience_years': years}, matches, key=key)
+        return added
+
+    @classmethod
+    def from_store(cls, store, matcher, top_k: int = MATCH_TOP_K,
+                   advisor: CareerAdvisor = None) -> 'CohortStats':
+        """Build from every resume in a ResumeStore"""
+        stats = cls(advisor)
+        stats.sync_store(store, matcher, top_k)
+        return stats
+
+    # ── Report ───────────────────────────────────────────────────────────────
+
+    def _top(self, counts: np.ndarray, names: List[str], top_n: int) -> List[Dict]:
+        counts = counts[:len(names)]
+        order  = np.argsort(-counts, kind='stable')[:top_n]
+        return [
+            {'name': names[i], 'count': int(counts[i]),
+             'percentage': round(100.0 * counts[i] / self.count, 1) if self.count else 0.0}
+            for i in order if counts[i] > 0
+        ]
+
+    def report(self, top_n: int = 20) -> Dict:
+        """Aggregate view of the cohort (plain dicts and lists, JSON-serializable)"""
+        with self._lock:
+            return self._report(top_n)
+
+    def _report(self, top_n: int) -> Dict:
+        n_roles = len(self.role_titles)
+        matched = self.role_fit[:n_roles].sum(axis=1)
+        mean    = np.divide(self.role_score_sum[:n_roles], matched,
+                            out=np.zeros(n_roles), where=matched > 0)
+        fit     = [
+            {'role': self.role_titles[i], 'matched': int(matched[i]),
+             'mean_score': round(float(mean[i]), 1),
+             'histogram': dict(zip(SCORE_LABELS, self.role_fit[i].tolist()))}
+            for i in np.argsort(-matched, kind='stable')[:top_n] if matched[i] > 0
+        ]
+        return {
+            'resumes':    self.count,
+            'top_skills': self._top(self.skill_counts, self.skill_names, top_n),
+            'top_gaps':   self._top(self.gap_counts, self.skill_names, top_n),
+            'top_roles':  self._top(self.top_role_counts, self.role_titles, top_n),
+            'role_fit':   fit,
+            'experience': dict(zip(EXPERIENCE_LABELS, self.experience_hist.tolist())),
+            'coverage':   dict(zip(SCORE_LABELS, self.coverage_hist.tolist())),
+        }
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: str = DEFAULT_PATH):
+        with self._lock:
+            self._save(path)
+
+    def _save(self, path: str):
+        meta = {
+            'count':       self.count,
+            'keys':        sorted(self.keys),
+            'skill_names': self.skill_names,
+            'role_keys':   list(self.role_ids),
+            'role_titles': self.role_titles,
+        }
+        n_skills, n_roles = len(self.skill_names), len(self.role_titles)
+        tmp = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp,
+            meta            = np.array(json.dumps(meta)),
+            skill_counts    = self.skill_counts[:n_skills],
+            gap_counts      = self.gap_counts[:n_skills],
+            top_role_counts = self.top_role_counts[:n_roles],
+            role_fit        = self.role_fit[:n_roles],
+            role_score_sum  = self.role_score_sum[:n_roles],
+            experience_hist = self.experience_hist,
+            coverage_hist   = self.coverage_hist,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, advisor: CareerAdvisor = None) -> 'CohortStats':
+        stats = cls(advisor)
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            for name in ('skill_counts', 'gap_counts', 'top_role_counts', 'role_fit',
+                         'role_score_sum', 'experience_hist', 'coverage_hist'):
+                setattr(stats, name, f[name].copy())
+        stats.count       = meta['count']
+        stats.keys        = set(meta['keys'])
+        stats.skill_names = meta['skill_names']
+        stats.skill_ids   = {s.lower(): i for i, s in enumerate(stats.skill_names)}
+        stats.role_titles = meta['role_titles']
+        stats.role_ids    = {k: i for i, k in enumerate(meta['role_keys'])}
+        return stats
+
+    @classmethod
+    def load_or_create(cls, path: str = DEFAULT_PATH) -> 'CohortStats':
+        """Saved stats if the file exists (and is readable), else empty stats"""
+        if os.path.exists(path):
+            try:
+                return cls.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Could not load cohort stats {path}: {e}")
+        return cls()
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text rendering of CohortStats.report() for the CLI"""
+    lines = [f"Cohort of {report['resumes']} resumes", '']
+
+    def _table(title, rows):
+        lines.append(title)
+        for row in rows:
+            lines.append(f"  {row['name']:<32} {row['count']:>6}  {row['percentage']:>5.1f}%")
+        lines.append('')
+
+    _table('Most common skills', report['top_skills'])
+    _table('Most frequent gaps', report['top_gaps'])
+    _table('Best-fit roles', report['top_roles'])
+
+    lines.append('Role fit (times matched, mean score)')
+    for row in report['role_fit']:
+        lines.append(f"  {row['role']:<32} {row['matched']:>6}  {row['mean_score']:>5.1f}")
+    lines.append('')
+
+    for title, key in (('Experience (years)', 'experience'), ('Skill coverage (%)', 'coverage')):
+        lines.append(title)
+        for label, count in report[key].items():
+            lines.append(f"  {label:<8} {count:>6}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from backend.matcher import JobMatcher
+    from backend.store import DEFAULT_DB_PATH, ResumeStore
+
+    parser = argparse.ArgumentParser(description="Cohort report over the resume store")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="ResumeStore database")
+    parser.add_argument('--top', type=int, default=20, help="rows per table")
+    parser.add_argument('--stats', default=DEFAULT_PATH,
+                        help="saved stats to update (only uncounted resumes are matched)")
+    args = parser.parse_args()
+
+    stats = CohortStats.load_or_create(args.stats)
+    with ResumeStore(args.db) as store:
+        if stats.sync_store(store, JobMatcher()):
+            stats.save(args.stats)
+    print(format_report(stats.report(args.top)))
@@ -0,0 +1,216 @@
+import hashlib
+import io
+import os
+import re
+import sys
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.pdf_cache import read_pdf_bytes
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH       = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """MinHash signatures over word shingles of resume text"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm     = num_perm
+        self.shingle_size = shingle_size
+        # a < 2^32 keeps a*x (x a 32-bit shingle hash) below 2^64, so uint64 never wraps
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-bit hashes of every run of `shingle_size` consecutive words"""
+        words = re.findall(r'\w+', text.lower())
+        k     = self.shingle_size
+        if len(words) < k:
+            grams = [' '.join(words)] if words else []
+        else:
+            grams = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+        return np.unique(np.fromiter(
+            (zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams)
+        ))
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (num_perm uint32 values); empty text gives all-max"""
+        hashes = self.shingles(text)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # (a*x + b) mod p, vectorized over permutations x shingles; reducing a*x
+        # first keeps the sum below 2^62, so every step is exact in uint64
+        permuted = (self.a[:, None] * hashes[None, :] % _MERSENNE_PRIME + self.b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets"""
+        return float(np.mean(sig1 == sig2))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of analyzed resumes. Signatures are split into `bands` bands of
+    `num_perm // bands` rows; resumes sharing any band bucket are candidates,
+    confirmed by estimated Jaccard similarity >= threshold.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, bands: int = 16,
+                 minhasher: MinHasher = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold  = threshold
+        self.minhasher  = minhasher or MinHasher(num_perm)
+        self.bands      = bands
+        self.rows       = num_perm // bands
+        self.buckets    = [dict() for _ in range(bands)]
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.analyses:   Dict[str, Dict]       = {}
+        self._parent:    Dict[str, str]        = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, doc_id: str, text: str = None, analysis: Dict = None,
+            signature: np.ndarray = None):
+        """Index a resume by its text (or precomputed signature)"""
+        if signature is None:
+            signature = self.minhasher.signature(text)
+        self.signatures[doc_id] = signature
+        if analysis is not None:
+            self.analyses[doc_id] = analysis
+        self._parent.setdefault(doc_id, doc_id)
+        for band, key in self._band_keys(signature):
+            self.buckets[band].setdefault(key, []).append(doc_id)
+
+    def query(self, text: str = None, signature: np.ndarray = None) -> Optional[Tuple[str, float]]:
+        """Return (doc_id, similarity) of the closest indexed near-duplicate, if any"""
+        if signature is None:
+            signature = self.minhasher.signature(text)
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        best = None
+        for doc_id in candidates:
+            sim = MinHasher.similarity(signature, self.signatures[doc_id])
+            if sim >= self.threshold and (best is None or sim > best[1]):
+                best = (doc_id, sim)
+        return best
+
+    def get_or_analyze(self, doc_id: str, text: str,
+                       analyze: Callable[[], Dict]) -> Tuple[Dict, Optional[str]]:
+        """
+        Reuse the analysis of a near-duplicate if one is indexed, otherwise run
+        `analyze()` and index the result. Returns (analysis, duplicate_of).
+        A reused analysis belongs to another document, so it should only hold
+        what near-duplicates share (skills, matches), never contact details.
+        """
+        if doc_id in self.signatures:
+            # Indexed before (e.g. in an earlier batch): reuse what it resolved to
+            original = self._find(doc_id)
+            return self.analyses[original], original
+        signature = self.minhasher.signature(text)
+        match     = self.query(signature=signature)
+        if match is not None and match[0] in self.analyses:
+            original = match[0]
+            self.add(doc_id, signature=signature)
+            self._union(doc_id, original)
+            return self.analyses[original], original
+
+        analysis = analyze()
+        self.add(doc_id, analysis=analysis, signature=signature)
+        return analysis, None
+
+    # ── Clusters (union-find over confirmed duplicates) ──────────────────────
+
+    def _find(self, doc_id: str) -> str:
+        root = doc_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[doc_id] != root:
+            self._parent[doc_id], doc_id = root, self._parent[doc_id]
+        return root
+
+    def _union(self, a: str, b: str):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            self._parent[ra] = rb
+
+    def clusters(self) -> List[List[str]]:
+        """Groups of resumes detected as near-duplicates of each other"""
+        groups: Dict[str, List[str]] = {}
+        for doc_id in self.signatures:
+            groups.setdefault(self._find(doc_id), []).append(doc_id)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def analyze_resume_batch(pdf_files: List, parser, extractor, matcher,
+                         index: NearDuplicateIndex = None, top_k: int = 5) -> Dict:
+    """
+    Analyze many resumes, paying skill extraction and job matching only once
+    per group of near-duplicates. PDF text is still needed per file, since the
+    signature is computed from it (served from the parser's cache if it has one).
+    Contact fields and sections are parsed from each file's own text, so a
+    near-duplicate built from the same template keeps its own name and email.
+
+    Results are keyed by the SHA-256 of each PDF, not its file name, so
+    different files with the same name ("resume.pdf") never overwrite each
+    other and the keys are stable across batches. Each result carries its
+    'name'; 'documents' lists (name, key) per upload, in order. The same
+    file uploaded twice is analyzed once and counted as reused.
+    """
+    index     = index if index is not None else NearDuplicateIndex()
+    results   = {}
+    documents = []
+    analyzed  = reused = 0
+
+    for pdf_file in pdf_files:
+        data   = read_pdf_bytes(pdf_file)
+        name   = getattr(pdf_file, 'name', str(pdf_file))
+        doc_id = hashlib.sha256(data).hexdigest()
+        documents.append((name, doc_id))
+        if doc_id in results:
+            reused += 1
+            continue
+        text        = parser.extract_text(io.BytesIO(data))
+        resume_data = parser.get_resume_data_from_text(text)
+
+        def _analyze():
+            skills_data = extractor.extract_all_skills(resume_data)
+            matches     = matcher.get_job_recommendations(skills_data, top_k=top_k)
+            return {
+                'skills_data': skills_data,
+                'job_matches': matches.get('top_matches', []),
+            }
+
+        analysis, duplicate_of = index.get_or_analyze(doc_id, text, _analyze)
+        if duplicate_of is not None:
+            reused += 1
+        else:
+            analyzed += 1
+        results[doc_id] = {'resume_data': resume_data, **analysis,
+                           'name': name, 'duplicate_of': duplicate_of}
+
+    return {
+        'results':   results,
+        'documents': documents,
+        'clusters':  index.clusters(),
+        'analyzed':  analyzed,
+        'reused':    reused,
+    }
@@ -0,0 +1,123 @@
+import os
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional, Tuple
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.fields import SECTION_PATTERNS
+
+SECTION_NAMES = tuple(SECTION_PATTERNS)
+FIELD_NAMES   = ('text', 'name', 'email', 'phone', 'linkedin', 'github', 'sections')
+
+
+def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Offsets of text[start:end].strip() without copying the slice"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+class ResumeSections(Mapping):
+    """Read-only section name -> text view; slices the document text on access"""
+
+    __slots__ = ('_doc',)
+
+    def __init__(self, doc: 'ResumeDocument'):
+        self._doc = doc
+
+    def span(self, name: str) -> Optional[Tuple[int, int]]:
+        """(start, end) offsets of a section in the text, or None if absent"""
+        i     = SECTION_NAMES.index(name)
+        start = self._doc._offsets[2 * i]
+        end   = self._doc._offsets[2 * i + 1]
+        return (start, end) if end > start else None
+
+    def __getitem__(self, name: str) -> str:
+        if name not in SECTION_NAMES:
+            raise KeyError(name)
+        span = self.span(name)
+        return self._doc.text[span[0]:span[1]] if span else ''
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(SECTION_NAMES)
+
+    def __len__(self) -> int:
+        return len(SECTION_NAMES)
+
+    def __repr__(self) -> str:
+        return f'ResumeSections({dict(self)!r})'
+
+
+class ResumeDocument(Mapping):
+    """
+    Parsed resume. The text is stored once and sections are kept as offset
+    ranges into it, sliced only when read. Behaves as a read-only mapping
+    with the same keys as the dict `get_resume_data` used to return, so
+    `doc['sections']['skills']` and `doc.get('email')` keep working.
+    """
+
+    __slots__ = ('text', 'name', 'email', 'phone', 'linkedin', 'github', '_offsets')
+
+    def __init__(self, text: str, name: str = "Not found", email: str = "Not found",
+                 phone: str = "Not found", linkedin: str = "Not found", github: str = "Not found",
+                 section_spans: Dict[str, Tuple[int, int]] = None):
+        self.text     = text
+        self.name     = name
+        self.email    = email
+        self.phone    = phone
+        self.linkedin = linkedin
+        self.github   = github
+
+        offsets = []
+        for section in SECTION_NAMES:
+            span = (section_spans or {}).get(section)
+            offsets.extend(_trim(text, *span) if span else (0, 0))
+        self._offsets = tuple(offsets)
+
+    @classmethod
+    def from_fields(cls, text: str, fields: Dict) -> 'ResumeDocument':
+        """Build from the output of backend.fields.extract_fields"""
+        return cls(text, fields['name'], fields['email'], fields['phone'],
+                   fields['linkedin'], fields['github'], fields['section_spans'])
+
+    @property
+    def sections(self) -> ResumeSections:
+        return ResumeSections(self)
+
+    @property
+    def section_spans(self) -> Dict[str, Tuple[int, int]]:
+        """Non-empty sections as name -> (start, end), e.g. for caching"""
+        view = self.sections
+        return {name: view.span(name) for name in SECTION_NAMES if view.span(name)}
+
+    # ── Mapping interface ────────────────────────────────────────────────────
+
+    def __getitem__(self, key: str):
+        if key == 'sections':
+            return self.sections
+        if key in FIELD_NAMES:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELD_NAMES)
+
+    def __len__(self) -> int:
+        return len(FIELD_NAMES)
+
+    def to_dict(self) -> Dict:
+        """Plain dict with materialized section strings"""
+        data = {key: self[key] for key in FIELD_NAMES}
+        data['sections'] = dict(data['sections'])
+        return data
+
+    def __repr__(self) -> str:
+        return (f'ResumeDocument(name={self.name!r}, email={self.email!r}, '
+                f'chars={len(self.text)}, sections={list(self.section_spans)})')
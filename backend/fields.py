@@ -0,0 +1,237 @@
+"""
+Single-pass field extractor for resume text.
+
+One precompiled pattern walks the text once and emits every contact field
+candidate and section header. Every repeat either ends its branch or is
+followed by a literal it cannot match, so a run is consumed once and never
+given back (possessive quantifiers would need Python 3.11). Emails are
+anchored on '@' and expanded by character scans, so no construct can
+backtrack over an unbounded run: worst-case time is linear in the text
+length (see benchmarks/field_extraction.py).
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+# Section header keywords, in the order sections are reported
+SECTION_PATTERNS = {
+    'experience':     r'work\s*experience|experience|employment|professional\s*experience|work\s*history',
+    'education':      r'education|academic|qualification|degree',
+    'skills':         r'skills|technical\s*skills|competencies|expertise|technologies',
+    'projects':       r'projects|portfolio|personal\s*projects|academic\s*projects',
+    'summary':        r'summary|objective|profile|about\s*me|career\s*objective',
+    'certifications': r'certifications?|certificates?|courses?|training',
+    'achievements':   r'achievements?|awards?|honors?|accomplishments?',
+}
+
+# Profile URL hosts. Only the prefix up to the handle is consumed; the handle
+# is read with _HANDLE, so keywords inside it are still scanned as before
+_URL_HOSTS = {
+    'linkedin': r'linkedin\.com/in/',
+    'github':   r'github\.com/',
+}
+_HANDLE = re.compile(r'[\w\-]+')
+
+# Phone runs: a digit (optionally after '+' or '(') followed by any digits and
+# separators. It ends the branch, so a run is consumed exactly once.
+_PHONE_RUN    = r'[\d\s\-.()+]*'
+_PHONE_STARTS = [r'\+(?=\d)', r'\((?=\d)'] + list('0123456789')
+
+
+def _scanner(flags: int = 0):
+    """
+    One alternation over every field. Each branch starts with a literal, so
+    the engine skips between candidate characters without trying branches,
+    and nothing can backtrack over more than a fixed-length prefix.
+    """
+    branches  = [start + _PHONE_RUN for start in _PHONE_STARTS] + ['@']
+    for host in _URL_HOSTS.values():
+        branches += [r'https?://(?:www\.)?' + host, r'www\.' + host, host]
+    # Headers consume only their first letter: keywords can overlap
+    # ("certificationskills"), and each must be seen at its own start
+    branches += [f'{alt[0]}(?={alt[1:]})'
+                 for pat in SECTION_PATTERNS.values() for alt in pat.split('|')]
+    return re.compile('|'.join(branches), flags)
+
+
+# Text is scanned lowercased (as section headers always were); if lowercasing
+# changes its length, fall back to case-insensitive matching on the original
+_SCANNER        = _scanner()
+_SCANNER_NOCASE = _scanner(re.IGNORECASE)
+_SECTION_ANCHORED = {name: re.compile(pat, re.IGNORECASE) for name, pat in SECTION_PATTERNS.items()}
+
+# Phone formats in priority order (most specific first); all fixed-width, and
+# only ever applied inside a single digit run
+_PHONE_PATTERNS = [
+    re.compile(r'\+91[\s\-]?\d{5}[\s\-]?\d{5}'),                      # +91-XXXXX-XXXXX
+    re.compile(r'91[\s\-]?\d{10}'),                                   # 91-XXXXXXXXXX
+    re.compile(r'\b\d{5}[\s\-]\d{5}\b'),                              # XXXXX-XXXXX
+    re.compile(r'\b[6-9]\d{9}\b'),                                    # plain 10-digit
+    re.compile(r'\+?1?[\s\-]?\(?\d{3}\)?[\s\-]\d{3}[\s\-]\d{4}'),     # +1 (123) 456-7890
+]
+_GENERIC_RUN   = re.compile(r'[\d\s\-.()]*')
+_GENERIC_START = re.compile(r'\b\d')
+_GENERIC_END   = re.compile(r'[\d\s\-.()]*\d\b')   # greedy: the last digit ending a word
+
+_EMAIL_LOCAL  = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-')
+_EMAIL_DOMAIN = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-')
+_ASCII_ALPHA  = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+_NAME_SKIP = re.compile(r'@|http|linkedin|github|resume|cv|\d{5,}', re.IGNORECASE)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _boundary(text: str, i: int) -> bool:
+    """Regex \\b semantics at index i"""
+    before = i > 0 and _is_word(text[i - 1])
+    after  = i < len(text) and _is_word(text[i])
+    return before != after
+
+
+def _email_at(text: str, at: int) -> Optional[str]:
+    """Email address around the '@' at index `at`, if there is a valid one"""
+    # Local part: maximal run to the left, then the first start with a \b
+    start = at
+    while start > 0 and text[start - 1] in _EMAIL_LOCAL:
+        start -= 1
+    while start < at and not _boundary(text, start):
+        start += 1
+    if start == at:
+        return None
+
+    # Domain: maximal run to the right, then the rightmost '.' followed by
+    # 2+ ASCII letters ending on a \b (what the greedy regex settles on)
+    end = at + 1
+    while end < len(text) and text[end] in _EMAIL_DOMAIN:
+        end += 1
+    dot = text.rfind('.', at + 2, end)
+    while dot != -1:
+        tld_end = dot + 1
+        while tld_end < end and text[tld_end] in _ASCII_ALPHA:
+            tld_end += 1
+        if tld_end - dot - 1 >= 2 and _boundary(text, tld_end):
+            return text[start:tld_end]
+        dot = text.rfind('.', at + 2, dot)
+    return None
+
+
+def _generic_phone(text: str, start: int, end: int) -> Optional[str]:
+    """
+    First match of the old `\\b\\d[\\d\\s\\-.()]{8,}\\d\\b` pattern inside the run
+    [start, end), found with one anchored scan per sub-run instead of a
+    backtracking search from every position.
+    """
+    i = start
+    while i < end:
+        # Sub-runs are split on '+', which the generic pattern does not allow
+        j    = _GENERIC_RUN.match(text, i, end).end()
+        last = _GENERIC_END.match(text, i, min(j + 1, len(text)))
+        if last:
+            first = _GENERIC_START.search(text, i, last.end())
+            if first and last.end() - first.start() >= 10:
+                return text[first.start():last.end()]
+        i = j + 1
+    return None
+
+
+def _extract_name(text: str) -> str:
+    """First plausible name among the first 8 non-empty lines"""
+    first_line = None
+    seen, pos  = 0, 0
+    while seen < 8 and pos <= len(text):
+        nl   = text.find('\n', pos)
+        nl   = len(text) if nl == -1 else nl
+        line = text[pos:nl].strip()
+        pos  = nl + 1
+        if not line:
+            continue
+        seen += 1
+        if first_line is None:
+            first_line = line
+        if _NAME_SKIP.search(line):
+            continue
+        words = line.split()
+        if 2 <= len(words) <= 5 and all(w[0].isupper() for w in words if w.isalpha()):
+            return line
+    return first_line if first_line is not None else "Not found"
+
+
+def extract_fields(text: str) -> Dict:
+    """
+    Extract name, email, phone, LinkedIn, GitHub and section boundaries in one
+    pass. `section_spans` maps each found section to its (start, end) offsets
+    in `text`; slicing is left to the caller (see backend.document).
+    """
+    email = linkedin = github = None
+    phone_hits = [None] * (len(_PHONE_PATTERNS) + 1)
+    positions: Dict[str, int] = {}
+    prev_end   = 0
+
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        matches = _SCANNER.finditer(lowered)
+    else:
+        matches = _SCANNER_NOCASE.finditer(text)
+
+    for m in matches:
+        s, e  = m.span()
+        first = text[s]
+
+        if first.isdigit() or first in '+(':
+            if phone_hits[0] is not None:
+                continue
+            # Formats may open with up to two separators the run does not
+            # include ('+-(', ' ('); let \b see one character past the run
+            begin    = max(s - 2, prev_end)
+            limit    = min(e + 1, len(text))
+            prev_end = e
+            for i, pattern in enumerate(_PHONE_PATTERNS):
+                if phone_hits[i] is None:
+                    hit = pattern.search(text, begin, limit)
+                    if hit:
+                        phone_hits[i] = hit.group(0)
+            if phone_hits[-1] is None:
+                phone_hits[-1] = _generic_phone(text, s, e)
+
+        elif first == '@':
+            if email is None:
+                email = _email_at(text, s)
+
+        elif m.group().endswith('/'):
+            handle = _HANDLE.match(text, e)
+            if handle is None:
+                continue
+            if 'linkedin' in m.group().lower():
+                linkedin = linkedin or text[s:handle.end()]
+            else:
+                github = github or text[s:handle.end()]
+
+        else:
+            # A section header; also record any other section whose keyword
+            # starts at the same position (e.g. "academic projects")
+            for name, pattern in _SECTION_ANCHORED.items():
+                if name not in positions and pattern.match(text, s):
+                    positions[name] = s
+
+    phone = next((p for p in phone_hits if p), None)
+    if phone:
+        phone = re.sub(r'\s+', ' ', phone.strip())
+
+    # Section bodies run from each header to the next one
+    ordered = sorted(positions.items(), key=lambda x: x[1])
+    spans: Dict[str, Tuple[int, int]] = {}
+    for idx, (name, start) in enumerate(ordered):
+        end = ordered[idx + 1][1] if idx + 1 < len(ordered) else len(text)
+        spans[name] = (start, end)
+
+    return {
+        'name':          _extract_name(text),
+        'email':         email or "Not found",
+        'phone':         phone or "Not found",
+        'linkedin':      linkedin or "Not found",
+        'github':        github or "Not found",
+        'section_spans': spans,
+    }
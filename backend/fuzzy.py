@@ -0,0 +1,156 @@
+"""
+Approximate skill lookup backed by a character-trigram index.
+
+Taxonomy skills and their aliases are reduced to a compact key (lowercase,
+letters/digits/'+'/'#' only, so "Node JS", "node-js" and "node.js" agree).
+Each key's trigrams go into an inverted index built once per skill set. A
+lookup only scores the skills that share a trigram with the token, applies a
+cheap overlap/length filter, and verifies the survivors with difflib, so
+misspellings like "Kubernates" or "Tenserflow" resolve without looping over
+the whole taxonomy.
+
+Ordinary words near a skill are not misspellings of it: a token that contains
+the whole skill plus extra letters ("excels", "reacts", "trails") is an
+inflection or a different word and never matches fuzzily, and short skills
+need a closer match ("iconic" is not Ionic).
+"""
+
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Alias -> canonical taxonomy skill. Only aliases whose target is in the
+# indexed skill set are used.
+SKILL_ALIASES = {
+    'reactjs':           'react',
+    'react js':          'react',
+    'nodejs':            'node.js',
+    'vuejs':             'vue.js',
+    'nextjs':            'next.js',
+    'nuxtjs':            'nuxt.js',
+    'expressjs':         'express',
+    'k8s':               'kubernetes',
+    'golang':            'go',
+    'sklearn':           'scikit-learn',
+    'sci-kit learn':     'scikit-learn',
+    'scikit':            'scikit-learn',
+    'postgres':          'postgresql',
+    'psql':              'postgresql',
+    'mongo':             'mongodb',
+    'torch':             'pytorch',
+    'huggingface':       'hugging face',
+    'js':                'javascript',
+    'ml':                'machine learning',
+    'amazon web services': 'aws',
+    'google cloud':      'gcp',
+    'google cloud platform': 'gcp',
+    'ms excel':          'excel',
+    'microsoft excel':   'excel',
+    'powerbi':           'power bi',
+    'gh actions':        'github actions',
+    'cicd':              'ci/cd',
+    'springboot':        'spring boot',
+    'vscode':            'vs code',
+    'visual studio code': 'vs code',
+}
+
+MIN_FUZZY_LEN  = 5      # shorter tokens only match exactly (too ambiguous)
+MIN_SIMILARITY = 0.88   # difflib ratio; rejects one-letter swaps in short words
+SHORT_KEY_LEN  = 7      # skills with shorter keys need MIN_SIMILARITY_SHORT
+MIN_SIMILARITY_SHORT = 0.92   # above one inserted letter in a 5-6 letter word
+MIN_OVERLAP    = 0.4    # Dice coefficient of trigram sets before verification
+CACHE_SIZE     = 50000  # memoized lookups per index
+
+_NON_KEY = re.compile(r'[^a-z0-9+#]+')
+
+
+def compact_key(term: str) -> str:
+    """Lowercase with separators and punctuation (except + and #) removed"""
+    return _NON_KEY.sub('', term.lower())
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f'${key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillIndex:
+    """Trigram index over taxonomy skills and aliases"""
+
+    def __init__(self, skills: Iterable[str], aliases: Dict[str, str] = None,
+                 min_similarity: float = MIN_SIMILARITY):
+        skills = {s.lower() for s in skills}
+        self.min_similarity = min_similarity
+        self.exact          = {}   # compact key -> canonical skill
+        for skill in sorted(skills):
+            self.exact.setdefault(compact_key(skill), skill)
+        for alias, skill in (SKILL_ALIASES if aliases is None else aliases).items():
+            if skill in skills:
+                self.exact.setdefault(compact_key(alias), skill)
+
+        # Fuzzy candidates: keys long enough to be matched approximately
+        self.keys     = [k for k in self.exact if len(k) >= MIN_FUZZY_LEN]
+        self.grams    = []   # trigram count per key
+        self.postings = {}   # trigram -> key positions
+        for i, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.grams.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def lookup(self, term: str) -> Optional[Tuple[str, float]]:
+        """(canonical skill, similarity) for a term, or None"""
+        key = compact_key(term)
+        if key in self.exact:
+            return self.exact[key], 1.0
+        if len(key) < MIN_FUZZY_LEN:
+            return None
+        if key not in self._cache:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = self._fuzzy(key)
+        return self._cache[key]
+
+    def _fuzzy(self, key: str) -> Optional[Tuple[str, float]]:
+        grams  = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best = None
+        for i, count in shared.items():
+            candidate = self.keys[i]
+            if 2 * count / (len(grams) + self.grams[i]) < MIN_OVERLAP:
+                continue
+            if abs(len(candidate) - len(key)) > max(2, len(key) // 4):
+                continue
+            if _affixed(key, candidate) or _affixed(key, compact_key(self.exact[candidate])):
+                continue
+            threshold = self.min_similarity if len(candidate) >= SHORT_KEY_LEN \
+                else max(self.min_similarity, MIN_SIMILARITY_SHORT)
+            score = SequenceMatcher(None, key, candidate, autojunk=False).ratio()
+            if score >= threshold and (best is None or score > best[1]):
+                best = (self.exact[candidate], round(score, 3))
+        return best
+
+
+def _affixed(key: str, skill_key: str) -> bool:
+    """True if `key` is the skill plus extra letters (an inflection or another word)"""
+    return len(key) > len(skill_key) and skill_key in key
+
+
+_indexes: Dict[frozenset, SkillIndex] = {}
+
+
+def get_skill_index(skills: Iterable[str]) -> SkillIndex:
+    """Shared index for a skill set, built on first use"""
+    skills = frozenset(skills)
+    if skills not in _indexes:
+        _indexes[skills] = SkillIndex(skills)
+    return _indexes[skills]
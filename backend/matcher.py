@@ -1,6 +1,8 @@
 import json
 import sys
 import os
+import threading
+import time
 
 # Add project root to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,7 +11,18 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 from typing import List, Dict, Set
+
+import numpy as np
 from model.embeddings import EmbeddingModel
+from backend.catalog import JobCatalog, normalize_rows
+from backend.catalog_bundle import MANIFEST as BUNDLE_MANIFEST, load_catalog_bundle, read_manifest
+from backend.profiling import stage
+from backend.ranking import (DEFAULT_WEIGHTS, FUSION_METHODS, fuse_scores, score_rows,
+                             skill_mask, skill_order, top_k_indices)
+from backend.results import JobMatch, to_dicts
+from backend.shared_catalog import SharedCatalog, segment_version
+from backend.skill_similarity import PARTIAL_CREDIT, SkillSimilarity, load_skill_similarity
+from backend.sharding import ShardPool
 
 
 def generate_job_portal_links(job_title: str, skills: List[str] = [], location: str = "India") -> Dict:
@@ -94,21 +107,83 @@ def generate_job_portal_links(job_title: str, skills: List[str] = [], location:
 class JobMatcher:
     """Match resume skills with suitable job roles"""
 
-    def __init__(self, job_roles_path: str = None):
-        """Initialize matcher with job roles data"""
+    def __init__(self, job_roles_path: str = None, num_shards: int = 0,
+                 bundle_path: str = None, fusion: str = 'weighted',
+                 weights: tuple = DEFAULT_WEIGHTS, shared_catalog: str = None,
+                 embedding_model: EmbeddingModel = None, skill_similarity=None,
+                 partial_credit: float = PARTIAL_CREDIT):
+        """
+        Initialize matcher with job roles data.
+        num_shards > 0 scores the catalog in that many worker processes.
+        bundle_path loads a compiled, memory-mapped catalog bundle instead of the JSON.
+        shared_catalog attaches to a catalog another process published into
+        shared memory (see backend.shared_catalog) instead of building one.
+        embedding_model reuses an already loaded model (see backend.warmup).
+        skill_similarity (a SkillSimilarity or .npz path; data/skill_similarity.npz
+        if built) gives related skills `partial_credit` x similarity credit;
+        partial_credit=0 scores exact matches only.
+        fusion combines skill and semantic scores: 'weighted' (by `weights`,
+        skill then semantic) or 'rrf' (reciprocal-rank fusion).
+        """
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method {fusion!r}; expected one of {FUSION_METHODS}")
+        if fusion == 'rrf' and num_shards:
+            raise ValueError("Reciprocal-rank fusion needs global ranks; use fusion='weighted' with shards")
+        self.fusion         = fusion
+        self.fusion_weights = tuple(weights)
+
         if job_roles_path is None:
             # Auto-detect path
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             job_roles_path = os.path.join(base_dir, 'data', 'job_roles.json')
 
-        self.job_roles      = self.load_job_roles(job_roles_path)
-        self.embedding_model = EmbeddingModel()
+        self.job_roles_path  = job_roles_path
+        self.bundle_path     = bundle_path
+        self.shared_catalog  = shared_catalog
+        self.embedding_model = embedding_model or EmbeddingModel()
+        self._reload_lock    = threading.Lock()
+        self._watcher        = None
+        self._catalog_mtime  = self._get_mtime()
 
-        # Pre-compute job embeddings
-        print("Computing job role embeddings...")
-        self.job_embeddings, self.job_roles_list = self.embedding_model.embed_job_roles(
-            self.job_roles['job_roles']
-        )
+        if shared_catalog:
+            self.catalog = SharedCatalog.attach(shared_catalog).catalog
+        elif bundle_path:
+            self.catalog = self._load_bundle()
+        else:
+            # Pre-compute job embeddings
+            print("Computing job role embeddings...")
+            self.catalog = JobCatalog.build(
+                self.load_job_roles(job_roles_path)['job_roles'], self.embedding_model
+            )
+
+        if isinstance(skill_similarity, SkillSimilarity):
+            self.skill_similarity = skill_similarity
+        else:
+            self.skill_similarity = (load_skill_similarity(skill_similarity) if skill_similarity
+                                     else load_skill_similarity())
+        if self.skill_similarity is not None and \
+                self.skill_similarity.model not in (None, self.embedding_model.model_name):
+            print(f"Warning: skill similarity matrix was built with {self.skill_similarity.model}, "
+                  f"matcher uses {self.embedding_model.model_name}")
+        self.partial_credit = partial_credit
+
+        self.num_shards = num_shards
+        self._shards    = ShardPool(self.catalog, num_shards) if num_shards else None
+
+    # ── Catalog snapshot ─────────────────────────────────────────────────────
+    # Readers take `self.catalog` once per request; reloads replace it whole.
+
+    @property
+    def job_roles(self) -> dict:
+        return {'job_roles': self.catalog.job_roles}
+
+    @property
+    def job_embeddings(self):
+        return self.catalog.embeddings
+
+    @property
+    def job_roles_list(self) -> List[Dict]:
+        return self.catalog.job_roles
 
     def load_job_roles(self, path: str) -> dict:
         """Load job roles from JSON file"""
@@ -119,14 +194,107 @@ class JobMatcher:
             print(f"Job roles file not found at {path}")
             return {"job_roles": []}
 
+    def _load_bundle(self) -> JobCatalog:
+        manifest = read_manifest(self.bundle_path)
+        if manifest.get('model') != self.embedding_model.model_name:
+            print(f"Warning: catalog bundle was encoded with {manifest.get('model')}, "
+                  f"matcher uses {self.embedding_model.model_name}")
+        return load_catalog_bundle(self.bundle_path)
+
+    def _get_mtime(self):
+        if self.shared_catalog:
+            return segment_version(self.shared_catalog)
+        path = (os.path.join(self.bundle_path, BUNDLE_MANIFEST) if self.bundle_path
+                else self.job_roles_path)
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the catalog if the JSON file (or recompiled bundle, or shared
+        segment) changed. Only added or edited roles are re-encoded; returns
+        True if swapped.
+        """
+        with self._reload_lock:
+            mtime = self._get_mtime()
+            if mtime == self._catalog_mtime:
+                return False
+            try:
+                if self.shared_catalog:
+                    catalog = SharedCatalog.attach(self.shared_catalog).catalog
+                elif self.bundle_path:
+                    catalog = self._load_bundle()
+                else:
+                    with open(self.job_roles_path, 'r') as f:
+                        job_roles = json.load(f).get('job_roles', [])
+                    catalog = JobCatalog.build(job_roles, self.embedding_model, self.catalog)
+            except (OSError, ValueError) as e:
+                # Half-written file or bad edit — keep serving the old snapshot
+                print(f"Skipping job roles reload: {e}")
+                return False
+
+            self.catalog        = catalog
+            self._catalog_mtime = mtime
+            if self.num_shards:
+                old_shards   = self._shards
+                self._shards = ShardPool(self.catalog, self.num_shards)
+                if old_shards is not None:
+                    old_shards.close()
+            return True
+
+    def _replace_shards(self, failed: ShardPool, error: Exception):
+        """
+        Pool to retry on after `failed` raised: the one a reload installed
+        meanwhile, else a fresh one (a crashed or stale worker leaves its
+        executor unusable). None if the pool cannot be restarted; the next
+        reload tries again.
+        """
+        with self._reload_lock:
+            if self._shards is not failed:
+                return self._shards
+            print(f"Shard pool failed ({error!r}), restarting it")
+            failed.close()
+            try:
+                self._shards = ShardPool(self.catalog, self.num_shards)
+            except Exception as e:
+                print(f"Could not restart shard pool, ranking in process: {e}")
+                self._shards = None
+            return self._shards
+
+    def start_watching(self, interval: float = 5.0):
+        """Poll the job roles file in a daemon thread and hot-reload on change"""
+        if self._watcher is not None:
+            return
+
+        def _watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"Job roles watcher error: {e}")
+
+        self._watcher = threading.Thread(target=_watch, name='job-roles-watcher', daemon=True)
+        self._watcher.start()
+
     def calculate_skill_match(self, resume_skills: List[str], job_skills: List[str]) -> float:
-        """Calculate percentage of matching skills"""
+        """Calculate percentage of matching skills (related skills earn partial credit)"""
         if not job_skills:
             return 0.0
         resume_lower = {s.lower() for s in resume_skills}
         job_lower    = {s.lower() for s in job_skills}
-        matching     = resume_lower.intersection(job_lower)
-        return (len(matching) / len(job_lower)) * 100
+        if self.skill_similarity is None or not self.partial_credit:
+            return (len(resume_lower & job_lower) / len(job_lower)) * 100
+
+        related = {}
+        for skill in resume_lower:
+            for other, score in self.skill_similarity.neighbours(skill).items():
+                related[other] = max(related.get(other, 0.0), score)
+        credit = sum(1.0 if s in resume_lower else related.get(s, 0.0) * self.partial_credit
+                     for s in job_lower)
+        return (credit / len(job_lower)) * 100
 
     def get_matching_skills(self, resume_skills: List[str], job_skills: List[str]) -> List[str]:
         """Get list of matching skills"""
@@ -139,80 +307,153 @@ class JobMatcher:
         resume_lower = {s.lower() for s in resume_skills}
         return [s for s in job_skills if s.lower() not in resume_lower]
 
-    def match_jobs_by_skills(self, resume_skills: List[str], top_k: int = 5) -> List[Dict]:
-        """Match jobs based on skill overlap"""
-        matches = []
-        for job in self.job_roles['job_roles']:
-            required      = job.get('required_skills', [])
-            nice          = job.get('nice_to_have', [])
-            all_skills    = required + nice
-            req_match     = self.calculate_skill_match(resume_skills, required)
-            overall_match = self.calculate_skill_match(resume_skills, all_skills)
-            job_match = {
-                **job,
-                'required_skill_match': round(req_match, 2),
-                'overall_skill_match':  round(overall_match, 2),
-                'matching_skills':      self.get_matching_skills(resume_skills, all_skills),
-                'missing_skills':       self.get_missing_skills(resume_skills, required),
-            }
-            matches.append(job_match)
-        matches.sort(
-            key=lambda x: (x['required_skill_match'], x['overall_skill_match']),
-            reverse=True
-        )
-        return matches[:top_k]
+    # ── Scoring ──────────────────────────────────────────────────────────────
 
-    def match_jobs_by_embeddings(self, resume_skills: List[str],
-                                  experience_years: int = 0, top_k: int = 5) -> List[Dict]:
-        """Match jobs using semantic embeddings"""
+    def _query_embedding(self, resume_skills: List[str], experience_years: int = 0):
+        """Normalized skill-profile embedding of the resume, or None without a model"""
         resume_text      = self.embedding_model.create_skill_profile_text(resume_skills, experience_years)
         resume_embedding = self.embedding_model.generate_embedding(resume_text)
-        matches          = self.embedding_model.find_top_matches(
-            resume_embedding, self.job_embeddings, self.job_roles_list, top_k
+        if not len(resume_embedding):
+            return None
+        return normalize_rows(resume_embedding.reshape(1, -1))[0]
+
+    def skill_credit(self, resume_skills: List[str], catalog: JobCatalog = None) -> np.ndarray:
+        """
+        Per-skill credit over the catalog vocabulary: the resume's skill mask,
+        plus partial credit for related skills when a similarity matrix is loaded.
+        """
+        catalog = catalog if catalog is not None else self.catalog
+        mask    = skill_mask(catalog.skill_index, resume_skills)
+        if self.skill_similarity is None or not self.partial_credit:
+            return mask
+        return self.skill_similarity.credit(catalog.skill_index, resume_skills, mask,
+                                            self.partial_credit)
+
+    def score_catalog(self, resume_skills: List[str], query=None, catalog: JobCatalog = None,
+                      rows: np.ndarray = None):
+        """
+        Score every role in one vectorized pass. Returns (required_match,
+        overall_match, similarity) arrays; similarity is None without embeddings.
+        With `rows` (see JobCatalog.select_rows) only those roles are scored
+        and the arrays are aligned with `rows`.
+        """
+        catalog = catalog if catalog is not None else self.catalog
+        mask    = self.skill_credit(resume_skills, catalog)
+        return score_rows((catalog.required_indptr, catalog.required_indices),
+                          (catalog.all_indptr, catalog.all_indices),
+                          catalog.embeddings if catalog.has_embeddings else np.array([]),
+                          mask, query, rows)
+
+    def _match_record(self, catalog: JobCatalog, i: int, resume_skills: List[str],
+                      req_match: float, overall_match: float, similarity: float = None,
+                      final_score: float = None) -> JobMatch:
+        job      = catalog.job_roles[i]
+        required = job.get('required_skills', [])
+        return JobMatch(
+            catalog              = catalog,
+            index                = int(i),
+            required_skill_match = float(req_match),
+            overall_skill_match  = float(overall_match),
+            similarity           = None if similarity is None else float(similarity),
+            final_score          = None if final_score is None else float(final_score),
+            matching_skills      = tuple(self.get_matching_skills(
+                resume_skills, required + job.get('nice_to_have', []))),
+            missing_skills       = tuple(self.get_missing_skills(resume_skills, required)),
         )
-        for match in matches:
-            required = match.get('required_skills', [])
-            all_sk   = required + match.get('nice_to_have', [])
-            match['matching_skills']      = self.get_matching_skills(resume_skills, all_sk)
-            match['missing_skills']       = self.get_missing_skills(resume_skills, required)
-            match['required_skill_match'] = self.calculate_skill_match(resume_skills, required)
-        return matches
+
+    def match_jobs_by_skills(self, resume_skills: List[str], top_k: int = 5,
+                             catalog: JobCatalog = None, categories: List[str] = None,
+                             departments: List[str] = None) -> List[Dict]:
+        """Match jobs based on skill overlap"""
+        catalog = catalog if catalog is not None else self.catalog
+        rows    = catalog.select_rows(categories, departments)
+        req, overall, _ = self.score_catalog(resume_skills, None, catalog, rows)
+        return to_dicts([
+            self._match_record(catalog, i if rows is None else rows[i], resume_skills,
+                               req[i], overall[i])
+            for i in skill_order(req, overall)[:top_k]
+        ])
+
+    def match_jobs_by_embeddings(self, resume_skills: List[str],
+                                  experience_years: int = 0, top_k: int = 5,
+                                  catalog: JobCatalog = None, categories: List[str] = None,
+                                  departments: List[str] = None) -> List[Dict]:
+        """Match jobs using semantic embeddings"""
+        catalog = catalog if catalog is not None else self.catalog
+        rows    = catalog.select_rows(categories, departments)
+        query   = self._query_embedding(resume_skills, experience_years)
+        req, overall, sims = self.score_catalog(resume_skills, query, catalog, rows)
+        if sims is None:
+            return []
+        return to_dicts([
+            self._match_record(catalog, i if rows is None else rows[i], resume_skills,
+                               req[i], overall[i], sims[i])
+            for i in top_k_indices(sims, np.zeros(len(sims)), top_k)
+        ])
+
+    @stage('match')
+    def rank_jobs(self, resume_skills: List[str], experience_years: int = 0,
+                  top_k: int = 5, categories: List[str] = None,
+                  departments: List[str] = None) -> List[JobMatch]:
+        """
+        Hybrid matching: skill overlap and semantic similarity are scored for
+        every role and fused per role (see backend.ranking), then the top_k
+        are selected. Returns JobMatch records referencing the catalog.
+
+        `categories` / `departments` restrict the candidates to roles in any
+        of the given values (both filters must hold when both are given).
+        Only those roles are scored, so a filtered query never costs more
+        than an unfiltered one.
+        """
+        query  = self._query_embedding(resume_skills, experience_years)
+        shards = self._shards
+        top    = None
+
+        def sharded_top(shards):
+            return shards.top_matches(resume_skills, query, top_k, self.fusion_weights,
+                                      self.skill_credit(resume_skills, shards.catalog),
+                                      shards.catalog.select_rows(categories, departments))
+
+        if shards is not None:
+            try:
+                top = sharded_top(shards)
+            except RuntimeError as e:
+                # Pool shut down by a catalog reload mid-request, or broken by a
+                # crashed (BrokenProcessPool) or stale (StaleShardError) worker
+                shards = self._replace_shards(shards, e)
+                try:
+                    top = sharded_top(shards) if shards is not None else None
+                except RuntimeError as e:
+                    print(f"Sharded ranking failed again ({e!r}), ranking in process")
+        if top is not None:
+            catalog = shards.catalog
+        else:
+            catalog = self.catalog   # one snapshot for the whole request
+            rows    = catalog.select_rows(categories, departments)
+            req, overall, sims = self.score_catalog(resume_skills, query, catalog, rows)
+            final = fuse_scores(req, overall, sims, self.fusion, self.fusion_weights)
+            top   = [(final[i], overall[i], i if rows is None else rows[i], req[i],
+                      None if sims is None else sims[i])
+                     for i in top_k_indices(final, overall, top_k)]
+
+        return [
+            self._match_record(catalog, i, resume_skills, req, overall, sim, final)
+            for final, overall, i, req, sim in top
+        ]
 
     def get_hybrid_matches(self, resume_skills: List[str],
                             experience_years: int = 0, top_k: int = 5) -> List[Dict]:
-        """Hybrid matching: skill-based + embedding-based"""
-        skill_matches     = self.match_jobs_by_skills(resume_skills, top_k=10)
-        embedding_matches = self.match_jobs_by_embeddings(resume_skills, experience_years, top_k=10)
-        combined = {}
-
-        for i, match in enumerate(skill_matches):
-            jid = match['id']
-            combined[jid] = match.copy()
-            combined[jid]['skill_rank_score'] = (10 - i) / 10
-
-        for i, match in enumerate(embedding_matches):
-            jid = match['id']
-            if jid in combined:
-                combined[jid]['embedding_rank_score'] = (10 - i) / 10
-                combined[jid]['embedding_similarity']  = match.get('match_percentage', 0)
-            else:
-                combined[jid] = match.copy()
-                combined[jid]['skill_rank_score']      = 0
-                combined[jid]['embedding_rank_score']  = (10 - i) / 10
-
-        for jid in combined:
-            sk  = combined[jid].get('skill_rank_score', 0)
-            em  = combined[jid].get('embedding_rank_score', 0)
-            combined[jid]['final_score'] = (sk * 0.6 + em * 0.4) * 100
-
-        results = sorted(combined.values(), key=lambda x: x['final_score'], reverse=True)
-        return results[:top_k]
+        """Hybrid matching: skill-based + embedding-based (as dicts)"""
+        return to_dicts(self.rank_jobs(resume_skills, experience_years, top_k))
 
     def get_job_recommendations(self, skills_data: dict,
                                  top_k: int = 5,
-                                 location: str = "India") -> dict:
+                                 location: str = "India",
+                                 categories: List[str] = None,
+                                 departments: List[str] = None) -> dict:
         """
-        Get job recommendations with job portal links.
+        Get job recommendations with job portal links, optionally only among
+        roles of the given categories / departments (see rank_jobs).
         """
         resume_skills    = skills_data.get('skills', [])
         experience_years = skills_data.get('experience_years', 0)
@@ -220,15 +461,15 @@ class JobMatcher:
         if not resume_skills:
             return {'top_matches': [], 'message': 'No skills found in resume'}
 
-        matches = self.get_hybrid_matches(resume_skills, experience_years, top_k)
-
-        # ✅ Add job portal links to EVERY match
-        for match in matches:
-            job_title = match.get('title', '')
-            matching  = match.get('matching_skills', [])
+        matches = []
+        for record in self.rank_jobs(resume_skills, experience_years, top_k,
+                                     categories, departments):
+            # ✅ Add job portal links to EVERY match
+            match = record.to_dict()
             match['job_portal_links'] = generate_job_portal_links(
-                job_title, matching, location
+                record.title, list(record.matching_skills), location
             )
+            matches.append(match)
 
         return {
             'top_matches':      matches,
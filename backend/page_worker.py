@@ -0,0 +1,292 @@
+"""
+PDF page extraction in a worker process, so every page runs under a deadline.
+
+Neither PyPDF2 nor pdfplumber can be interrupted once `extract_text()` has
+started, and a pathological page can keep either busy for minutes without
+failing. `PageExtractor` sends the document to a worker process and asks
+for one page at a time; a page that misses its deadline (or whose analysis
+is cancelled) gets the worker killed, which is the only way to stop it, and
+the next page starts a fresh worker. Idle workers are kept for the next
+document, so the start-up cost is paid once, not once per upload.
+
+Each worker handles one document at a time, so its memory growth belongs to
+that analysis alone; replies carry the worker's RSS for the memory limit.
+Where no worker can be started, pages are extracted in-process without a
+hard deadline (`LocalPages`).
+
+This module must stay free of torch / sentence-transformers imports: it is
+imported by every worker process.
+"""
+
+import io
+import multiprocessing
+import threading
+import time
+from typing import List, Optional
+
+import PyPDF2
+import pdfplumber
+
+from backend.resources import rss_bytes
+
+MAX_IDLE_WORKERS = 4      # workers kept alive between documents
+POLL_INTERVAL    = 0.05   # seconds between cancellation checks while a page runs
+
+# A forkserver forks workers from a clean single-threaded server instead of
+# the app process (never fork a loaded torch model); spawn where unavailable
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class PageTimeout(TimeoutError):
+    """A page missed its deadline; the worker extracting it was killed"""
+
+
+class PageCancelled(RuntimeError):
+    """The analysis was cancelled while a page was being extracted"""
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+def open_document(pdf_bytes: bytes) -> dict:
+    """Per-document state: the raw bytes and the readers opened on them"""
+    return {'bytes': pdf_bytes}
+
+
+def close_document(document: dict):
+    plumber = document.get('pdfplumber')
+    if plumber is not None:
+        plumber.close()
+
+
+def page_count(document: dict) -> int:
+    try:
+        return len(_reader(document, 'pypdf2').pages)
+    except Exception as e:
+        print(f"PyPDF2 failed: {e}, trying pdfplumber...")
+        return len(_reader(document, 'pdfplumber').pages)
+
+
+def extract_page(document: dict, engine: str, index: int) -> str:
+    """Text of page `index` read with `engine` ('pypdf2' or 'pdfplumber')"""
+    return _reader(document, engine).pages[index].extract_text() or ""
+
+
+def _reader(document: dict, engine: str):
+    reader = document.get(engine)
+    if reader is None:
+        data   = io.BytesIO(document['bytes'])
+        reader = PyPDF2.PdfReader(data) if engine == 'pypdf2' else pdfplumber.open(data)
+        document[engine] = reader
+    return reader
+
+
+def _serve(conn):
+    """Worker loop: ('open', bytes) -> page count, (engine, index) -> page text"""
+    document = None
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        command, arg = request
+        try:
+            if command == 'open':
+                if document is not None:
+                    close_document(document)
+                rss      = rss_bytes()
+                document = open_document(arg)
+                conn.send(('ok', (rss, page_count(document)), rss_bytes()))
+            else:
+                conn.send(('ok', extract_page(document, command, arg), rss_bytes()))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}", rss_bytes()))
+
+
+# ── Parent side ──────────────────────────────────────────────────────────────
+
+_idle: List['PageWorker'] = []
+_idle_lock = threading.Lock()
+
+
+class PageWorker:
+    """A worker process and the pipe to it"""
+
+    def __init__(self):
+        context = multiprocessing.get_context(START_METHOD)
+        if START_METHOD == 'forkserver':
+            context.set_forkserver_preload(['backend.page_worker'])
+        self.conn, child = context.Pipe()
+        self.process     = context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def call(self, request, deadline: float, cancel_event: Optional[threading.Event] = None):
+        """Send a request and wait for its reply until `deadline` (perf_counter)"""
+        self.conn.send(request)
+        while not self.conn.poll(max(0.0, min(POLL_INTERVAL, deadline - time.perf_counter()))):
+            if cancel_event is not None and cancel_event.is_set():
+                self.kill()
+                raise PageCancelled("Page extraction was cancelled")
+            if time.perf_counter() >= deadline:
+                self.kill()
+                raise PageTimeout("Page extraction missed its deadline")
+        try:
+            status, value, rss = self.conn.recv()
+        except EOFError:
+            self.kill()
+            raise RuntimeError("page worker exited") from None
+        if status != 'ok':
+            raise RuntimeError(value)
+        return value, rss
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _acquire() -> PageWorker:
+    with _idle_lock:
+        while _idle:
+            worker = _idle.pop()
+            if worker.alive:
+                return worker
+    return PageWorker()
+
+
+def _release(worker: PageWorker):
+    with _idle_lock:
+        if worker.alive and len(_idle) < MAX_IDLE_WORKERS:
+            _idle.append(worker)
+            return
+    worker.kill()
+
+
+def shutdown():
+    """Stop every idle worker"""
+    with _idle_lock:
+        workers = list(_idle)
+        _idle.clear()
+    for worker in workers:
+        worker.kill()
+
+
+class PageExtractor:
+    """
+    Pages of one PDF, each extracted in a worker process under a deadline.
+    Use as a context manager; the worker returns to the idle pool on exit.
+    """
+
+    isolated = True   # memory_mb() covers this document only
+
+    def __init__(self, pdf_bytes: bytes, cancel_event: Optional[threading.Event] = None,
+                 worker: Optional[PageWorker] = None):
+        self.pdf_bytes    = pdf_bytes
+        self.cancel_event = cancel_event
+        self.worker       = worker
+        self.loaded       = False   # whether self.worker holds this document
+        self.rss_start    = 0
+        self.grown        = 0       # largest RSS growth of any worker on this document
+
+    def __enter__(self) -> 'PageExtractor':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self, timeout: float) -> int:
+        """Number of pages in the document"""
+        return self._load(time.perf_counter() + timeout)
+
+    def page(self, engine: str, index: int, timeout: float) -> str:
+        """Text of one page; PageTimeout / PageCancelled if it does not finish in time"""
+        deadline = time.perf_counter() + timeout
+        if not self.loaded:
+            self._load(deadline)
+        return self._call((engine, index), deadline)
+
+    def memory_mb(self) -> float:
+        """RSS growth of the worker since this document was opened"""
+        return self.grown / 2**20
+
+    def close(self, discard: bool = False):
+        """Return the worker to the idle pool, or stop it if `discard`"""
+        if self.worker is not None:
+            if discard:
+                self.worker.kill()
+            else:
+                _release(self.worker)
+            self.worker = None
+
+    def _load(self, deadline: float) -> int:
+        if self.worker is None:
+            # First call, or the last worker was killed: start over on a fresh one
+            self.worker = _acquire()
+        self.loaded = False
+        rss, count  = self._call(('open', self.pdf_bytes), deadline)
+        self.loaded    = True
+        self.rss_start = rss
+        return count
+
+    def _call(self, request, deadline: float):
+        try:
+            value, rss = self.worker.call(request, deadline, self.cancel_event)
+        except (PageTimeout, PageCancelled):
+            self.worker = None
+            self.loaded = False
+            raise
+        except RuntimeError:
+            if not self.worker.alive:
+                self.worker = None
+                self.loaded = False
+            raise
+        if self.loaded:
+            self.grown = max(self.grown, rss - self.rss_start)
+        return value
+
+
+class LocalPages:
+    """PageExtractor stand-in that extracts in this process, without hard deadlines"""
+
+    isolated = False  # memory_mb() is process-wide: concurrent analyses count too
+
+    def __init__(self, pdf_bytes: bytes, cancel_event: Optional[threading.Event] = None):
+        self.document  = open_document(pdf_bytes)
+        self.rss_start = rss_bytes()
+        self.rss_peak  = self.rss_start
+
+    def __enter__(self) -> 'LocalPages':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self, timeout: float) -> int:
+        return page_count(self.document)
+
+    def page(self, engine: str, index: int, timeout: float) -> str:
+        text = extract_page(self.document, engine, index)
+        self.rss_peak = max(self.rss_peak, rss_bytes())
+        return text
+
+    def memory_mb(self) -> float:
+        return max(0, self.rss_peak - self.rss_start) / 2**20
+
+    def close(self, discard: bool = False):
+        close_document(self.document)
+
+
+def page_extractor(pdf_bytes: bytes, cancel_event: Optional[threading.Event] = None):
+    """A PageExtractor, or LocalPages where worker processes cannot be started"""
+    try:
+        worker = _acquire()
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Page workers unavailable ({e}), extracting pages in-process without deadlines")
+        return LocalPages(pdf_bytes, cancel_event)
+    return PageExtractor(pdf_bytes, cancel_event, worker)
@@ -1,181 +1,363 @@
-import PyPDF2
-import pdfplumber
-import re
-from typing import Dict, List
+import hashlib
+import io
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.document import ResumeDocument
+from backend.fields import extract_fields
+from backend.pdf_cache import ExtractionCache, read_pdf_bytes
+from backend.page_worker import PageCancelled, PageTimeout, page_extractor
+from backend.profiling import stage
+from model.settings import env_number
+
+# Bump whenever text or field extraction changes, to invalidate cached results
+PARSER_VERSION = '4'
+
+EXTRACTION_STRATEGIES = ('adaptive', 'pdfplumber', 'pypdf2')
+
+# Per-analysis resource limits; constructor arguments override the
+# environment, which overrides these defaults
+DEFAULT_MAX_UPLOAD_MB = 10        # RESUME_AI_MAX_UPLOAD_MB
+DEFAULT_MAX_PAGES     = 30        # RESUME_AI_MAX_PAGES
+DEFAULT_MAX_CHARS     = 100000    # RESUME_AI_MAX_TEXT_CHARS
+DEFAULT_MAX_MEMORY_MB = 512       # RESUME_AI_MAX_MEMORY_MB (RSS growth while extracting)
+DEFAULT_MAX_SECONDS   = 20        # RESUME_AI_MAX_PARSE_SECONDS (whole extraction)
+
+
+class ResourceLimitError(ValueError):
+    """The document cannot be analyzed at all within the configured limits"""
+
+
+def score_text_quality(text: str) -> float:
+    """
+    Heuristic 0..1 quality of extracted page text. Penalizes empty pages,
+    unmapped glyphs ('(cid:12)', U+FFFD), non-printable noise and words run
+    together without spaces — the typical failure modes of the fast extractor.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return 0.0
+
+    garbage = stripped.count('(cid:') * 6 + stripped.count('\ufffd')
+    noise   = sum(1 for ch in stripped if not (ch.isprintable() or ch.isspace()))
+    clean   = max(0.0, 1.0 - (garbage + noise) / len(stripped))
+
+    words    = stripped.split()
+    avg_word = sum(len(w) for w in words) / len(words)
+    spacing  = 1.0 if avg_word <= 12 else max(0.0, 1.0 - (avg_word - 12) / 12)
+
+    density  = min(1.0, len(stripped) / 100)
+    return clean * spacing * density
 
 
 class ResumeParser:
     """Parse resume PDFs and extract text content"""
 
-    def __init__(self):
-        self.text = ""
+    def __init__(self, cache: Optional[ExtractionCache] = None,
+                 strategy: str = 'adaptive', min_quality: float = 0.6,
+                 page_time_budget: float = 2.0, max_pages: int = None,
+                 max_bytes: int = None, max_chars: int = None, max_memory_mb: float = None,
+                 max_seconds: float = None):
+        """
+        Args:
+            cache:            optional ExtractionCache for extracted text/sections
+            strategy:         'adaptive' (PyPDF2 first, pdfplumber for poor pages),
+                              'pdfplumber' (pdfplumber, PyPDF2 on error) or 'pypdf2'
+            min_quality:      page quality below which adaptive mode escalates
+            page_time_budget: seconds one page may take with one extractor; a
+                              page still running then is abandoned
+            max_pages:        pages beyond this are not extracted
+            max_bytes:        larger uploads are rejected with ResourceLimitError
+            max_chars:        extracted text is cut to this many characters
+            max_memory_mb:    extraction stops at the next page once the
+                              extracting worker's RSS grew by this much
+            max_seconds:      extraction stops at the next page, and adaptive
+                              mode stops escalating, once it ran this long
+        Pages, characters, memory and time limits return partial results and
+        are reported in `last_extraction['limits']`.
+        """
+        if strategy not in EXTRACTION_STRATEGIES:
+            raise ValueError(f"Unknown extraction strategy: {strategy}")
+        self.text             = ""
+        self.cache            = cache
+        self.strategy         = strategy
+        self.min_quality      = min_quality
+        self.page_time_budget = page_time_budget
+        # An explicit 0 is a limit too; only None falls back to the environment
+        self.max_pages        = int(max_pages if max_pages is not None else
+                                    env_number('RESUME_AI_MAX_PAGES', DEFAULT_MAX_PAGES))
+        self.max_bytes        = int(max_bytes if max_bytes is not None else
+                                    env_number('RESUME_AI_MAX_UPLOAD_MB', DEFAULT_MAX_UPLOAD_MB) * 2**20)
+        self.max_chars        = int(max_chars if max_chars is not None else
+                                    env_number('RESUME_AI_MAX_TEXT_CHARS', DEFAULT_MAX_CHARS))
+        self.max_memory_mb    = float(max_memory_mb if max_memory_mb is not None else
+                                      env_number('RESUME_AI_MAX_MEMORY_MB', DEFAULT_MAX_MEMORY_MB))
+        self.max_seconds      = float(max_seconds if max_seconds is not None else
+                                      env_number('RESUME_AI_MAX_PARSE_SECONDS', DEFAULT_MAX_SECONDS))
+        self.last_extraction: Dict = {}
+        self.cancel_event: Optional[threading.Event] = None   # set to stop at the next page
+        self._pages           = None     # page extractor of the running extraction
+        self._escalate        = True     # whether pdfplumber may still be used
+        self._deadline        = 0.0
+        self._document        = ''       # short content hash of the PDF, for limit logs
 
     # ── PDF Text Extraction ──────────────────────────────────────────────────
 
     def extract_text_from_pdf(self, pdf_file) -> str:
-        """Extract text from PDF using pdfplumber (more reliable)"""
+        """Extract text from PDF using the configured strategy"""
+        start = time.perf_counter()
+        self.last_extraction = {'strategy': self.strategy, 'pages': 0, 'pages_total': 0,
+                                'escalated_pages': 0, 'over_budget_pages': 0,
+                                'memory_mb': 0.0, 'limits': []}
+        self._deadline  = start + self.max_seconds
+        pdf_bytes       = read_pdf_bytes(pdf_file)
+        self._document  = hashlib.sha256(pdf_bytes).hexdigest()[:12]
+        text = self._extract_pages(pdf_bytes)
+
+        stats = self.last_extraction
+        if stats['pages_total'] > stats['pages'] and not (stats['limits'] or stats.get('cancelled')):
+            self._limit_hit(f"Only the first {stats['pages']} of {stats['pages_total']} pages "
+                            f"were read (page limit {self.max_pages}).")
+        text = self._cap_text(text)
+        stats['elapsed']   = time.perf_counter() - start
+        stats['truncated'] = bool(stats['limits'])
+        self.text = text
+        return text
+
+    # ── Resource Limits ──────────────────────────────────────────────────────
+
+    def _limit_hit(self, message: str):
+        print(f"Resource limit (PDF {self._document or 'text'}): {message}")
+        self.last_extraction.setdefault('limits', []).append(message)
+
+    def _check_bytes(self, pdf_bytes: bytes):
+        if len(pdf_bytes) > self.max_bytes:
+            raise ResourceLimitError(
+                f"The file is {len(pdf_bytes) / 2**20:.1f} MB; uploads are limited to "
+                f"{self.max_bytes / 2**20:g} MB."
+            )
+
+    def _cap_text(self, text: str) -> str:
+        if len(text) <= self.max_chars:
+            return text
+        if not any('character limit' in m for m in self.last_extraction.get('limits', [])):
+            self._limit_hit(f"Text was cut to the first {self.max_chars:,} characters "
+                            f"(character limit).")
+        return text[:self.max_chars]
+
+    def _stop_before_page(self, chars: int) -> bool:
+        """True if no further page should be extracted; records which limit was hit"""
+        stats = self.last_extraction
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            stats['cancelled'] = True
+            return True
+        if chars >= self.max_chars:
+            self._limit_hit(f"Stopped after {stats['pages']} of {stats['pages_total']} pages: "
+                            f"the text reached the {self.max_chars:,} character limit.")
+            return True
+        grown = self._pages.memory_mb()
+        stats['memory_mb'] = round(max(stats['memory_mb'], grown), 1)
+        if grown > self.max_memory_mb and stats['pages']:   # always keep the first page
+            stats['memory_limited'] = True
+            self._limit_hit(f"Stopped after {stats['pages']} of {stats['pages_total']} pages: "
+                            f"{'extraction' if self._pages.isolated else 'process'} memory "
+                            f"grew by {grown:.0f} MB (limit {self.max_memory_mb:.0f} MB).")
+            return True
+        if self._out_of_time() and stats['pages']:
+            stats['time_limited'] = True
+            self._limit_hit(f"Stopped after {stats['pages']} of {stats['pages_total']} pages: "
+                            f"extraction ran past the {self.max_seconds:g} second limit.")
+            return True
+        return False
+
+    def _time_left(self) -> float:
+        return self._deadline - time.perf_counter()
+
+    def _out_of_time(self) -> bool:
+        return self._time_left() <= 0
+
+    def _extract_pages(self, pdf_bytes: bytes) -> str:
+        """
+        Extract page by page in a worker process (see backend.page_worker).
+        'adaptive' reads each page with PyPDF2 and re-extracts only poor-quality
+        pages with pdfplumber; 'pdfplumber' reads with pdfplumber and falls
+        back to PyPDF2 for pages it fails on; 'pypdf2' uses PyPDF2 alone.
+        Every read is abandoned once it overruns `page_time_budget` or the
+        total time limit, and after an overrun or a pdfplumber failure
+        pdfplumber is not used again for the document, bounding the cost of
+        pathological documents.
+        """
+        stats          = self.last_extraction
+        self._escalate = self.strategy != 'pypdf2'
+        self._pages    = pages = page_extractor(pdf_bytes, self.cancel_event)
+        page_texts     = []
+        chars          = 0
         try:
-            with pdfplumber.open(pdf_file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                self.text = text
-                return text
-        except Exception as e:
-            print(f"pdfplumber failed: {e}, trying PyPDF2...")
-            return self._extract_with_pypdf2(pdf_file)
+            try:
+                stats['pages_total'] = pages.open(max(0.0, self._time_left()))
+            except PageCancelled:
+                stats['cancelled'] = True
+                return ""
+            except PageTimeout:
+                stats['time_limited'] = True
+                self._limit_hit(f"The PDF could not be opened within the "
+                                f"{self.max_seconds:g} second limit.")
+                return ""
+            except Exception as e:
+                print(f"Could not read PDF: {e}")
+                return ""
+
+            for i in range(min(stats['pages_total'], self.max_pages)):
+                if self._stop_before_page(chars):
+                    break
+                page_text = self._page_text(i)
+                page_texts.append(page_text)
+                chars += len(page_text) + 1
+                stats['pages'] += 1
+        finally:
+            pages.close(discard=bool(stats.get('memory_limited')))
+            self._pages = None
+
+        return "".join(t + "\n" for t in page_texts)
 
-    def _extract_with_pypdf2(self, pdf_file) -> str:
-        """Fallback method using PyPDF2"""
+    def _page_text(self, i: int) -> str:
+        """Text of page `i` with the extractor(s) the strategy calls for"""
+        if self.strategy == 'pdfplumber':
+            text = self._read_page('pdfplumber', i) if self._escalate else None
+            return text if text is not None else (self._read_page('pypdf2', i) or "")
+
+        text = self._read_page('pypdf2', i) or ""
+        if (self.strategy == 'adaptive' and self._escalate and not self._out_of_time()
+                and score_text_quality(text) < self.min_quality):
+            self.last_extraction['escalated_pages'] += 1
+            better = self._read_page('pdfplumber', i)
+            if better is not None and score_text_quality(better) >= score_text_quality(text):
+                text = better
+        return text
+
+    def _read_page(self, engine: str, i: int) -> Optional[str]:
+        """One page read with one extractor, or None if it failed or ran out of time"""
+        stats   = self.last_extraction
+        timeout = min(self.page_time_budget, self._time_left())
+        if timeout <= 0 or stats.get('cancelled'):
+            return None
+        started = time.perf_counter()
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += (page.extract_text() or "") + "\n"
-            self.text = text
-            return text
+            text = self._pages.page(engine, i, timeout)
+        except PageCancelled:
+            stats['cancelled'] = True
+            return None
+        except PageTimeout:
+            text = None
+            print(f"{engine} abandoned page {i + 1} after {timeout:.1f}s")
         except Exception as e:
-            print(f"PyPDF2 failed: {e}")
-            return ""
+            print(f"{engine} failed on page {i + 1}: {e}")
+            if engine == 'pdfplumber':
+                self._escalate = False
+            return None
+        if text is None or time.perf_counter() - started > self.page_time_budget:
+            # Overran (only possible without a worker when text is not None)
+            stats['over_budget_pages'] += 1
+            self._escalate = False
+        return text
 
     # ── Field Extractors ─────────────────────────────────────────────────────
 
-    def extract_email(self, text: str = None) -> str:
-        """Extract email address from resume"""
+    def extract_fields(self, text: str = None) -> Dict:
+        """All contact fields and sections in a single linear-time pass"""
         if text is None:
             text = self.text
-        pattern = r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b'
-        matches = re.findall(pattern, text)
-        return matches[0] if matches else "Not found"
+        return extract_fields(text)
+
+    def extract_email(self, text: str = None) -> str:
+        """Extract email address from resume"""
+        return self.extract_fields(text)['email']
 
     def extract_phone(self, text: str = None) -> str:
         """
         Extract phone number from resume.
         Handles Indian (+91) and international formats, spaces/dots/dashes.
         """
-        if text is None:
-            text = self.text
-
-        # ── Ordered patterns (most specific first) ──────────────────────────
-        patterns = [
-            # +91-XXXXX-XXXXX  or  +91 XXXXX XXXXX
-            r'\+91[\s\-]?\d{5}[\s\-]?\d{5}',
-            # 91-XXXXXXXXXX
-            r'91[\s\-]?\d{10}',
-            # 10-digit with separators: XXXXX-XXXXX or XXXXX XXXXX
-            r'\b\d{5}[\s\-]\d{5}\b',
-            # Plain 10-digit number
-            r'\b[6-9]\d{9}\b',
-            # International: +1 (123) 456-7890
-            r'\+?1?[\s\-]?\(?\d{3}\)?[\s\-]\d{3}[\s\-]\d{4}',
-            # Generic: any sequence of digits with common separators (10-15 digits)
-            r'\b\d[\d\s\-\.\(\)]{8,}\d\b',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                # Clean up whitespace and return first match
-                phone = matches[0].strip()
-                # Remove extra spaces but keep structure
-                phone = re.sub(r'\s+', ' ', phone)
-                return phone
-
-        return "Not found"
+        return self.extract_fields(text)['phone']
 
     def extract_name(self, text: str = None) -> str:
         """Extract name from resume (first non-empty line heuristic)"""
-        if text is None:
-            text = self.text
-
-        lines = [l.strip() for l in text.strip().split('\n') if l.strip()]
-
-        for line in lines[:8]:
-            # Skip lines that look like contact info, headers, or URLs
-            if re.search(r'@|http|linkedin|github|resume|cv|\d{5,}', line, re.I):
-                continue
-            words = line.split()
-            # Name: 2–5 words, each starting with capital letter
-            if 2 <= len(words) <= 5 and all(w[0].isupper() for w in words if w.isalpha()):
-                return line
-
-        return lines[0] if lines else "Not found"
+        return self.extract_fields(text)['name']
 
     def extract_linkedin(self, text: str = None) -> str:
         """Extract LinkedIn URL if present"""
-        if text is None:
-            text = self.text
-        pattern = r'(https?://)?(?:www\.)?linkedin\.com/in/[\w\-]+'
-        matches = re.findall(pattern, text, re.I)
-        return matches[0] if matches else "Not found"
+        return self.extract_fields(text)['linkedin']
 
     def extract_github(self, text: str = None) -> str:
         """Extract GitHub URL if present"""
-        if text is None:
-            text = self.text
-        pattern = r'(https?://)?(?:www\.)?github\.com/[\w\-]+'
-        matches = re.findall(pattern, text, re.I)
-        return matches[0] if matches else "Not found"
+        return self.extract_fields(text)['github']
 
     def extract_sections(self, text: str = None) -> Dict[str, str]:
         """Extract different sections from resume text"""
         if text is None:
             text = self.text
+        return dict(ResumeDocument.from_fields(text, extract_fields(text)).sections)
+
+    # ── Cached Extraction ────────────────────────────────────────────────────
 
-        sections = {
-            'experience': '',
-            'education':  '',
-            'skills':     '',
-            'projects':   '',
-            'summary':    '',
-            'certifications': '',
-            'achievements': '',
-        }
-
-        patterns = {
-            'experience':     r'(work\s*experience|experience|employment|professional\s*experience|work\s*history)',
-            'education':      r'(education|academic|qualification|degree)',
-            'skills':         r'(skills|technical\s*skills|competencies|expertise|technologies)',
-            'projects':       r'(projects|portfolio|personal\s*projects|academic\s*projects)',
-            'summary':        r'(summary|objective|profile|about\s*me|career\s*objective)',
-            'certifications': r'(certifications?|certificates?|courses?|training)',
-            'achievements':   r'(achievements?|awards?|honors?|accomplishments?)',
-        }
-
-        text_lower = text.lower()
-
-        # Find all section positions
-        section_positions = {}
-        for sec, pat in patterns.items():
-            match = re.search(pat, text_lower)
-            if match:
-                section_positions[sec] = match.start()
-
-        # Sort sections by their position in the document
-        sorted_sections = sorted(section_positions.items(), key=lambda x: x[1])
-
-        # Extract text between consecutive section headers
-        for idx, (sec, start_pos) in enumerate(sorted_sections):
-            if idx + 1 < len(sorted_sections):
-                end_pos = sorted_sections[idx + 1][1]
-            else:
-                end_pos = len(text)
-            sections[sec] = text[start_pos:end_pos].strip()
-
-        return sections
-
-    def get_resume_data(self, pdf_file) -> Dict:
+    def _extract_cached(self, pdf_file) -> Tuple[str, Optional[Dict], Optional[str]]:
+        """
+        Return (text, cached_fields, cache_key). On a cache miss the PDF is
+        parsed and cached_fields is None; cache_key is None without a cache.
+        """
+        pdf_bytes = read_pdf_bytes(pdf_file)
+        self._check_bytes(pdf_bytes)
+        if self.cache is None:
+            return self.extract_text_from_pdf(io.BytesIO(pdf_bytes)), None, None
+
+        key       = self.cache.key(
+            pdf_bytes, f'{PARSER_VERSION}-{self.strategy}-{self.max_pages}-{self.max_chars}'
+        )
+        entry     = self.cache.get(key)
+        if entry is not None:
+            self.text = entry['text']
+            self.last_extraction = {'cached': True, 'limits': list(entry.get('limits', []))}
+            return entry['text'], entry, key
+        return self.extract_text_from_pdf(io.BytesIO(pdf_bytes)), None, key
+
+    def _cache_put(self, key: str, text: str, fields: Dict):
+        # Memory- and time-limited results depend on what else ran at the time
+        stats = self.last_extraction
+        if stats.get('memory_limited') or stats.get('time_limited') or stats.get('cancelled'):
+            return
+        self.cache.put(key, {'text': text, **fields, 'limits': self.last_extraction.get('limits', [])})
+
+    def extract_text(self, pdf_file) -> str:
+        """Extract text, served from the cache when this exact PDF was seen before"""
+        text, fields, key = self._extract_cached(pdf_file)
+        if key is not None and fields is None:
+            self._cache_put(key, text, extract_fields(text))
+        return text
+
+    @stage('parse')
+    def get_resume_data(self, pdf_file) -> ResumeDocument:
         """Extract all relevant data from resume"""
-        text = self.extract_text_from_pdf(pdf_file)
-
-        return {
-            'text':      text,
-            'name':      self.extract_name(text),
-            'email':     self.extract_email(text),
-            'phone':     self.extract_phone(text),
-            'linkedin':  self.extract_linkedin(text),
-            'github':    self.extract_github(text),
-            'sections':  self.extract_sections(text),
-        }
\ No newline at end of file
+        text, fields, key = self._extract_cached(pdf_file)
+        if fields is None:
+            fields = extract_fields(text)
+            if key is not None:
+                self._cache_put(key, text, fields)
+        self.text = text
+        return ResumeDocument.from_fields(text, fields)
+
+    def get_resume_data_from_text(self, text: str) -> ResumeDocument:
+        """Extract all relevant data from already-extracted resume text"""
+        self.last_extraction = {'limits': []}
+        self._document = ''
+        text = self._cap_text(text)
+        self.text = text
+        return ResumeDocument.from_fields(text, extract_fields(text))
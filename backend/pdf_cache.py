@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', '.pdf_cache'
+)
+
+
+def read_pdf_bytes(pdf_file) -> bytes:
+    """Read raw bytes from a path or file-like object, restoring its position"""
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, 'rb') as f:
+            return f.read()
+    if hasattr(pdf_file, 'getvalue'):
+        return pdf_file.getvalue()
+    pos  = pdf_file.tell()
+    data = pdf_file.read()
+    pdf_file.seek(pos)
+    return data
+
+
+class ExtractionCache:
+    """
+    Content-addressed on-disk cache of extracted PDF text and parsed fields.
+
+    Entries are keyed by SHA-256 of the PDF bytes plus the parser version, so
+    a parser change invalidates everything. The cache is bounded by total
+    size; least recently used entries (by mtime, refreshed on hit) are evicted.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total    = sum(os.path.getsize(p) for p in self._entries())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json'):
+                    yield os.path.join(root, name)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    @staticmethod
+    def key(pdf_bytes: bytes, parser_version: str) -> str:
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        return f'{digest}-v{parser_version}'
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)   # mark as recently used
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, entry: Dict):
+        path = self._path(key)
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            self._total += len(data) - old
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of the budget"""
+        entries = []
+        for p in self._entries():
+            try:
+                st = os.stat(p)
+                entries.append((st.st_mtime, st.st_size, p))
+            except OSError:
+                pass
+        entries.sort()
+
+        total  = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
+
+    def clear(self):
+        with self._lock:
+            for p in list(self._entries()):
+                os.remove(p)
+            self._total = 0
@@ -0,0 +1,422 @@
+"""
+Lazy, memoized resume analysis.
+
+`ResumeAnalysisPipeline` wires the parser, skill extractor, job matcher,
+career advisor and chatbot together for one resume. Each stage is computed
+on first access and kept, so a user who never opens the advice or chat tab
+never pays for them and revisiting a tab costs nothing.
+
+Invalidation rules:
+    - a stage is recomputed only after it (or a stage it depends on) is
+      invalidated; invalidating a stage also drops everything downstream
+    - `set_location` / `set_top_k` / `set_filters` invalidate the
+      recommendations when the value actually changes
+    - the recommendations are invalidated when the matcher's catalog was
+      reloaded since they were computed
+    - a different upload is a different pipeline (see `matches`)
+
+`analyze` is the asyncio entry point: it runs every stage on an executor as
+soon as the stages it depends on are done, so independent stages overlap:
+acquiring the warmed-up matcher with parsing, embedding the resume text
+(torch, which releases the GIL) with skill extraction, and advice with the
+chatbot. `cancel` abandons the analysis: stages not started yet
+never run and PDF extraction stops at the next page.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import io
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.advisor import CareerAdvisor
+from backend.catalog import normalize_rows
+from backend.chatbot import ResumeChat
+from backend.cohort import MATCH_TOP_K
+from backend.parser import ResumeParser
+from backend.pdf_cache import read_pdf_bytes
+from backend.results import to_dicts
+from backend.skills import SkillExtractor
+
+# Stage -> stages it is computed from
+DEPENDENCIES = {
+    'resume_data':      (),
+    'matcher':          (),
+    'skills_data':      ('resume_data',),
+    'resume_embedding': ('resume_data', 'matcher'),
+    'recommendations':  ('skills_data', 'matcher'),
+    'advice':           ('skills_data', 'recommendations'),
+    'chatbot':          ('resume_data', 'skills_data', 'recommendations'),
+}
+STAGES = tuple(DEPENDENCIES)
+
+
+class AnalysisCancelled(Exception):
+    """The pipeline was cancelled (e.g. the user uploaded another file)"""
+
+
+def _downstream(stage: str) -> List[str]:
+    """`stage` and every stage that (transitively) depends on it, in order"""
+    found = [stage]
+    for name in STAGES:
+        if name not in found and any(dep in found for dep in DEPENDENCIES[name]):
+            found.append(name)
+    return found
+
+
+class ResumeAnalysisPipeline:
+    """Analysis of one resume whose stages are computed on demand"""
+
+    def __init__(self, pdf_file=None, text: str = None,
+                 parser: ResumeParser = None, extractor: SkillExtractor = None,
+                 matcher=None, matcher_factory: Callable = None,
+                 advisor: CareerAdvisor = None, location: str = 'India', top_k: int = 5):
+        """
+        Args:
+            pdf_file:        PDF path, bytes or file-like object (read once)
+            text:            already-extracted resume text, instead of a PDF
+            matcher:         JobMatcher to use, or
+            matcher_factory: called once the matches are first needed
+                             (default: the process-wide warmed-up matcher)
+        """
+        if (pdf_file is None) == (text is None):
+            raise ValueError("Pass exactly one of pdf_file or text")
+        if isinstance(pdf_file, bytes):
+            self.pdf_bytes = pdf_file
+        elif pdf_file is not None:
+            self.pdf_bytes = read_pdf_bytes(pdf_file)
+        else:
+            self.pdf_bytes = None
+        self.text            = text
+        self.digest          = hashlib.sha256(
+            self.pdf_bytes if text is None else text.encode('utf-8')
+        ).hexdigest()
+        self.parser          = parser or ResumeParser()
+        self.extractor       = extractor or SkillExtractor()
+        self.advisor         = advisor or CareerAdvisor()
+        self.matcher         = matcher
+        self.matcher_factory = matcher_factory
+        self.location        = location
+        self.top_k           = top_k
+        self.categories: List[str]  = []   # match filters, see JobMatcher.rank_jobs
+        self.departments: List[str] = []
+        self.extraction: Dict = {}     # parser.last_extraction of the parse stage
+        self.timings: Dict    = {}     # stage -> seconds of its last computation
+        self._values          = {}
+        self._catalog         = None   # matcher catalog the recommendations came from
+        self._generation      = 0      # bumped by every invalidation
+        self._lock            = threading.RLock()
+        self._stage_locks     = {stage: threading.Lock() for stage in STAGES}
+        self._cancel          = threading.Event()
+        self._running         = (None, [])   # (event loop, tasks) of the active analyze()
+        self.parser.cancel_event = self._cancel
+
+    def matches(self, pdf_file=None, text: str = None) -> bool:
+        """True if this pipeline analyzes exactly this input"""
+        if text is not None:
+            data = text.encode('utf-8')
+        elif isinstance(pdf_file, bytes):
+            data = pdf_file
+        else:
+            data = read_pdf_bytes(pdf_file)
+        return hashlib.sha256(data).hexdigest() == self.digest
+
+    # ── Stages ───────────────────────────────────────────────────────────────
+
+    def _compute_resume_data(self):
+        if self.text is not None:
+            document = self.parser.get_resume_data_from_text(self.text)
+        else:
+            document = self.parser.get_resume_data(io.BytesIO(self.pdf_bytes))
+        self.extraction = dict(self.parser.last_extraction)
+        if self.extraction.get('cancelled'):
+            raise AnalysisCancelled("Resume parsing was cancelled")
+        return document
+
+    def _compute_matcher(self):
+        if self.matcher is None:
+            if self.matcher_factory is None:
+                from backend.warmup import start_warmup
+                warmup = start_warmup()
+                warmup.wait()
+                if warmup.matcher is None:
+                    raise RuntimeError(f"Job matcher could not be loaded ({warmup.error})")
+                self.matcher = warmup.matcher
+            else:
+                self.matcher = self.matcher_factory()
+        return self.matcher
+
+    def _compute_skills_data(self):
+        return self.extractor.extract_all_skills(self.resume_data)
+
+    def _compute_resume_embedding(self):
+        """Normalized embedding of the resume text, or None without a model"""
+        text = self.resume_data.get('text', '')
+        if not text.strip():
+            return None
+        embedding = self.get('matcher').embedding_model.generate_embedding(text)
+        if not len(embedding):
+            return None
+        return normalize_rows(np.asarray(embedding).reshape(1, -1))[0]
+
+    def _compute_recommendations(self):
+        matcher       = self.get('matcher')
+        self._catalog = matcher.catalog
+        return matcher.get_job_recommendations(self.skills_data, top_k=self.top_k,
+                                               location=self.location,
+                                               categories=self.categories,
+                                               departments=self.departments)
+
+    def _compute_advice(self):
+        return self.advisor.get_career_advice(self.skills_data, self.job_matches)
+
+    def _compute_chatbot(self):
+        return ResumeChat(resume_data=self.resume_data, skills_data=self.skills_data,
+                          job_matches=self.job_matches)
+
+    def get(self, stage: str):
+        """The stage's result, computing it (and what it depends on) if needed"""
+        if stage not in DEPENDENCIES:
+            raise KeyError(stage)
+        with self._lock:
+            if (stage in _downstream('recommendations') and self._catalog is not None
+                    and self.matcher is not None and self.matcher.catalog is not self._catalog):
+                self.invalidate('recommendations')
+            if stage in self._values:
+                return self._values[stage]
+        for dep in DEPENDENCIES[stage]:
+            self.get(dep)
+        # One computation per stage; independent stages may run in parallel threads
+        with self._stage_locks[stage]:
+            if stage in self._values:
+                return self._values[stage]
+            if self._cancel.is_set():
+                raise AnalysisCancelled(f"Analysis cancelled before {stage}")
+            generation = self._generation
+            t0         = time.perf_counter()
+            value      = getattr(self, f'_compute_{stage}')()
+            with self._lock:
+                self.timings[stage] = round(time.perf_counter() - t0, 6)
+                # Not memoized if invalidated meanwhile (e.g. location changed)
+                if generation == self._generation:
+                    self._values[stage] = value
+            return value
+
+    @property
+    def resume_data(self):
+        return self.get('resume_data')
+
+    @property
+    def skills_data(self) -> Dict:
+        return self.get('skills_data')
+
+    @property
+    def resume_embedding(self) -> Optional[np.ndarray]:
+        return self.get('resume_embedding')
+
+    @property
+    def recommendations(self) -> Dict:
+        return self.get('recommendations')
+
+    @property
+    def job_matches(self) -> List[Dict]:
+        return self.recommendations.get('top_matches', [])
+
+    def cohort_matches(self, top_k: int = MATCH_TOP_K) -> List[Dict]:
+        """
+        Top matches among all roles, for the shared cohort counts: this
+        session's filters and top_k must not skew what every user sees
+        """
+        with self._lock:
+            filtered = bool(self.categories or self.departments) or self.top_k < top_k
+        if not filtered:
+            return self.job_matches[:top_k]
+        skills = self.skills_data.get('skills', [])
+        if not skills:
+            return []
+        years  = self.skills_data.get('experience_years', 0)
+        return to_dicts(self.get('matcher').rank_jobs(skills, years, top_k))
+
+    @property
+    def advice(self) -> Dict:
+        return self.get('advice')
+
+    @property
+    def chatbot(self) -> ResumeChat:
+        return self.get('chatbot')
+
+    @property
+    def limits(self) -> List[str]:
+        """Resource limits hit while parsing (partial analysis), see ResumeParser"""
+        return self.extraction.get('limits', [])
+
+    # ── Async API ────────────────────────────────────────────────────────────
+
+    async def analyze(self, stages: Iterable[str] = ('recommendations',),
+                      executor: Executor = None, on_stage: Callable = None) -> Dict:
+        """
+        Compute `stages` and everything they depend on, each on `executor`
+        (default: the event loop's) as soon as its dependencies are done.
+        `on_stage(stage, result)` is called on the event loop as each of them
+        completes. Returns stage -> result for the requested stages; raises
+        AnalysisCancelled if the pipeline is cancelled meanwhile.
+        """
+        stages = list(stages)
+        needed = set()
+        for stage in stages:
+            needed.update(self._upstream(stage))
+
+        loop  = asyncio.get_running_loop()
+        tasks = {}
+
+        async def run(stage):
+            await asyncio.gather(*(tasks[dep] for dep in DEPENDENCIES[stage]))
+            # Like asyncio.to_thread: stage hooks see the caller's profiled request
+            context = contextvars.copy_context()
+            value   = await loop.run_in_executor(executor, context.run, self.get, stage)
+            if on_stage is not None:
+                on_stage(stage, value)
+            return value
+
+        for stage in STAGES:   # dependencies first
+            if stage in needed:
+                tasks[stage] = asyncio.ensure_future(run(stage))
+        self._running = (loop, list(tasks.values()))
+        try:
+            results = await asyncio.gather(*(tasks[stage] for stage in stages))
+        except asyncio.CancelledError:
+            if self.cancelled:
+                raise AnalysisCancelled("Analysis cancelled") from None
+            raise
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            self._running = (None, [])
+        return dict(zip(stages, results))
+
+    def stream(self, stages: Iterable[str] = ('recommendations',), executor: Executor = None,
+               cancel_on_close: bool = True) -> Iterator[Tuple[str, object]]:
+        """
+        Yield (stage, result) as each stage completes, in completion order,
+        for callers that render progressively without an event loop. The
+        analysis runs in a background thread and its exception is re-raised
+        here. Closing the generator early cancels the pipeline unless
+        `cancel_on_close` is False, in which case the analysis keeps running
+        and a later `stream` or `get` picks up its results.
+        """
+        events = queue.Queue()
+        done   = object()
+
+        def worker():
+            try:
+                asyncio.run(self.analyze(stages, executor,
+                                         on_stage=lambda stage, value: events.put((stage, value))))
+            except BaseException as e:
+                events.put((done, e))
+            else:
+                events.put((done, None))
+
+        context  = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(worker,), name='pipeline-stream',
+                         daemon=True).start()
+        finished = False
+        try:
+            while True:
+                stage, value = events.get()
+                if stage is done:
+                    finished = True
+                    if value is not None:
+                        raise value
+                    return
+                yield stage, value
+        finally:
+            if not finished and cancel_on_close:
+                self.cancel()
+
+    def iter_stages(self, stages: Iterable[str] = ('recommendations',)) -> Iterator[Tuple[str, object]]:
+        """
+        The events of `stream`, computed one stage at a time in the calling
+        thread, dependencies first. For callers that need every stage on
+        their own thread, e.g. a profiled request (cProfile only sees the
+        thread that enabled it).
+        """
+        needed = set()
+        for stage in stages:
+            needed.update(self._upstream(stage))
+        for stage in STAGES:
+            if stage in needed:
+                yield stage, self.get(stage)
+
+    def cancel(self):
+        """
+        Abandon the analysis. Safe to call from any thread. Stages already
+        running finish (PDF extraction stops at the next page) but their
+        successors never start: computing any further stage raises AnalysisCancelled.
+        """
+        self._cancel.set()
+        loop, tasks = self._running
+        if loop is not None and not loop.is_closed():
+            for task in tasks:
+                loop.call_soon_threadsafe(task.cancel)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # ── Invalidation ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _upstream(stage: str) -> List[str]:
+        """`stage` and every stage it (transitively) depends on"""
+        found = [stage]
+        for name in found:
+            found.extend(dep for dep in DEPENDENCIES[name] if dep not in found)
+        return found
+
+    def computed(self, stage: str) -> bool:
+        return stage in self._values
+
+    def invalidate(self, stage: str):
+        """Drop a stage and everything computed from it"""
+        with self._lock:
+            self._generation += 1
+            for name in _downstream(stage):
+                self._values.pop(name, None)
+            if 'recommendations' in _downstream(stage):
+                self._catalog = None
+
+    def set_location(self, location: str):
+        """Job portal links are built per location"""
+        with self._lock:
+            if location != self.location:
+                self.location = location
+                self.invalidate('recommendations')
+
+    def set_top_k(self, top_k: int):
+        with self._lock:
+            if top_k != self.top_k:
+                self.top_k = top_k
+                self.invalidate('recommendations')
+
+    def set_filters(self, categories: Iterable[str] = (), departments: Iterable[str] = ()):
+        """Only match roles in these categories / departments (empty: any)"""
+        categories, departments = sorted(categories), sorted(departments)
+        with self._lock:
+            if (categories, departments) != (self.categories, self.departments):
+                self.categories  = categories
+                self.departments = departments
+                self.invalidate('recommendations')
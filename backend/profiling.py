@@ -0,0 +1,247 @@
+"""
+Opt-in per-request profiling.
+
+Enabled by environment variables (off by default):
+    RESUME_AI_PROFILE       sample rate, 0-1 ("1" profiles every request)
+    RESUME_AI_PROFILE_DIR   dump directory (default data/profiles)
+    RESUME_AI_PROFILE_TOP   rows in the text summaries (default 30)
+
+A sampled request runs under cProfile (its own thread only) and tracemalloc,
+and writes one directory per request containing:
+    profile.prof   raw cProfile stats (load with pstats or snakeviz)
+    profile.txt    top functions by cumulative time
+    memory.txt     top allocating source lines during the request
+    summary.json   name, metadata, wall time, per-stage timings, peak memory
+
+Backend entry points are wrapped with `stage`, which only records timings
+while a profiled request is active; otherwise it is a single context-variable
+lookup. tracemalloc is process-wide, so allocations of requests running
+concurrently with a profiled one are included in its memory report. A
+tracemalloc session started by something else is left running, with its
+peak untouched; requests profiled inside it report no peak.
+"""
+
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'data', 'profiles')
+TRACE_FRAMES = 10
+
+_current = contextvars.ContextVar('profiled_request', default=None)
+_tracing_lock  = threading.Lock()
+_tracing_users = 0       # profiled requests currently relying on tracemalloc
+_tracing_owned = False   # whether this module started the running tracemalloc session
+
+
+def sample_rate() -> float:
+    try:
+        return min(max(float(os.environ.get('RESUME_AI_PROFILE', '0')), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+
+def profile_dir() -> str:
+    return os.environ.get('RESUME_AI_PROFILE_DIR', DEFAULT_DIR)
+
+
+def enabled() -> bool:
+    return sample_rate() > 0
+
+
+def _top_rows() -> int:
+    try:
+        return int(os.environ.get('RESUME_AI_PROFILE_TOP', '30'))
+    except ValueError:
+        return 30
+
+
+# ── Stages ───────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _stage_timer(name: str):
+    request = _current.get()
+    if request is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        request['stages'].append({'stage': name, 'seconds': round(time.perf_counter() - t0, 6)})
+
+
+class stage:
+    """
+    Record the wall time of a pipeline stage in the active profiled request.
+    Works as a decorator (`@stage('parse')`) or a context manager
+    (`with stage('store'):`).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._cm  = None
+
+    def __enter__(self):
+        self._cm = _stage_timer(self.name)
+        return self._cm.__enter__()
+
+    def __exit__(self, *exc):
+        return self._cm.__exit__(*exc)
+
+    def __call__(self, func):
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with _stage_timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+# ── Requests ─────────────────────────────────────────────────────────────────
+
+def _start_tracing() -> bool:
+    """Start tracemalloc unless it runs already; True if this module owns the session"""
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0:
+            _tracing_owned = not tracemalloc.is_tracing()
+            if _tracing_owned:
+                tracemalloc.start(TRACE_FRAMES)
+        _tracing_users += 1
+        # Never reset someone else's peak; without reset_peak (Python 3.8)
+        # the peak covers the whole session
+        if _tracing_owned and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        return _tracing_owned
+
+
+def _stop_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+@contextmanager
+def profile_request(name: str, meta: Optional[Dict] = None, force: bool = False):
+    """
+    Profile the enclosed block if this request is sampled (or `force`).
+    Yields the dump directory path, or None when not profiled.
+    """
+    if _current.get() is not None or not (force or random.random() < sample_rate()):
+        yield None
+        return
+
+    stamp   = time.strftime('%Y%m%d-%H%M%S')
+    out_dir = os.path.join(profile_dir(), f'{stamp}-{name}-{uuid.uuid4().hex[:6]}')
+    request = {'name': name, 'meta': dict(meta or {}), 'stages': []}
+    token   = _current.set(request)
+    owned    = _start_tracing()
+    before   = tracemalloc.take_snapshot()
+    profiler = cProfile.Profile()
+    t0       = time.perf_counter()
+    profiler.enable()
+    error    = None
+    try:
+        yield out_dir
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - t0
+        _current.reset(token)
+        try:
+            after = tracemalloc.take_snapshot()
+            peak  = tracemalloc.get_traced_memory()[1] if owned else None
+        finally:
+            _stop_tracing()
+        try:
+            _write_dump(out_dir, request, profiler, before, after, elapsed, peak, error)
+        except OSError as e:
+            print(f"Could not write profile dump {out_dir}: {e}")
+
+
+def _write_dump(out_dir: str, request: Dict, profiler: cProfile.Profile,
+                before, after, elapsed: float, peak: Optional[int], error: Optional[str]):
+    os.makedirs(out_dir, exist_ok=True)
+    top = _top_rows()
+
+    profiler.dump_stats(os.path.join(out_dir, 'profile.prof'))
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(top)
+    with open(os.path.join(out_dir, 'profile.txt'), 'w') as f:
+        f.write(text.getvalue())
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff   = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    with open(os.path.join(out_dir, 'memory.txt'), 'w') as f:
+        if peak is None:
+            f.write("Peak traced memory: not measured (tracemalloc was started outside the profiler)\n")
+        else:
+            f.write(f"Peak traced memory: {peak / 2**20:.1f} MB\n")
+        f.write(f"Top {top} allocating lines (net change during the request):\n")
+        for entry in diff[:top]:
+            f.write(f"{entry}\n")
+
+    summary = {
+        'name':           request['name'],
+        'meta':           request['meta'],
+        'started':        os.path.basename(out_dir)[:15],
+        'seconds':        round(elapsed, 6),
+        'peak_memory_mb': None if peak is None else round(peak / 2**20, 2),
+        'stages':         request['stages'],
+        'error':          error,
+    }
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Profile written to {out_dir} ({elapsed:.2f}s"
+          + ("" if peak is None else f", peak {peak / 2**20:.1f} MB") + ")")
+
+
+# ── Browsing dumps ───────────────────────────────────────────────────────────
+
+def list_dumps(directory: str = None, limit: int = 100) -> List[Dict]:
+    """Summaries of the newest dumps, newest first (each with its 'path')"""
+    directory = directory or profile_dir()
+    try:
+        names = sorted(os.listdir(directory), reverse=True)
+    except OSError:
+        return []
+    dumps = []
+    for name in names:
+        path = os.path.join(directory, name, 'summary.json')
+        try:
+            with open(path, 'r') as f:
+                dumps.append({**json.load(f), 'path': os.path.dirname(path)})
+        except (OSError, ValueError):
+            continue
+        if len(dumps) >= limit:
+            break
+    return dumps
+
+
+def read_dump_file(dump_path: str, filename: str) -> str:
+    try:
+        with open(os.path.join(dump_path, filename), 'r') as f:
+            return f.read()
+    except OSError:
+        return ''
@@ -0,0 +1,169 @@
+"""
+Vectorized hybrid scoring shared by job matching, sharded workers and
+candidate ranking.
+
+Every role (or resume) gets a skill-overlap score and a semantic score in a
+single pass over the catalog arrays; the two are fused per row and the
+top-k is selected with argpartition, so nothing is cut off before fusion.
+Only numpy is imported here (shard workers import this module).
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+FUSION_METHODS  = ('weighted', 'rrf')
+DEFAULT_WEIGHTS = (0.6, 0.4)   # (skill, semantic)
+RRF_K           = 60
+# Filtered scoring gathers the selected roles first while they are at most
+# this share of the catalog; above it, scoring every role in place is cheaper
+GATHER_FRACTION = 0.6
+
+
+def skill_mask(skill_index: dict, resume_skills: Sequence[str]) -> np.ndarray:
+    """Boolean vocabulary mask of the resume's skills"""
+    mask = np.zeros(len(skill_index), dtype=bool)
+    ids  = [skill_index[s] for s in {s.lower() for s in resume_skills} if s in skill_index]
+    mask[ids] = True
+    return mask
+
+
+def skill_match_percentages(indptr: np.ndarray, indices: np.ndarray,
+                            mask: np.ndarray) -> np.ndarray:
+    """
+    Percentage of each CSR row's skills set in `mask`, rounded to 2 places
+    (0 for rows without skills). `mask` may instead hold per-skill credit in
+    [0, 1] (partial matches), which is summed per row. `indptr` may be a
+    slice of a larger matrix with `indices` the matching slice.
+    """
+    indptr  = np.asarray(indptr, dtype=np.int64)
+    indptr  = indptr - indptr[0]
+    lengths = np.diff(indptr)
+    if len(indices) == 0 or not mask.any():
+        return np.zeros(len(lengths))
+
+    hits    = np.zeros(len(indices) + 1, dtype=np.float64 if mask.dtype.kind == 'f' else np.int64)
+    np.cumsum(mask[indices], out=hits[1:])
+    counts  = hits[indptr[1:]] - hits[indptr[:-1]]
+    pct     = np.divide(counts * 100.0, lengths, out=np.zeros(len(lengths)), where=lengths > 0)
+    return np.round(pct, 2)
+
+
+def csr_subset(indptr: np.ndarray, indices: np.ndarray,
+               rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (indptr, indices) of only the given CSR rows, gathered in time
+    proportional to their own entries. `indptr` may be a slice of a larger
+    matrix with `indices` the matching slice.
+    """
+    indptr  = np.asarray(indptr, dtype=np.int64)
+    indptr  = indptr - indptr[0]
+    starts  = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    sub_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=sub_indptr[1:])
+    positions  = np.arange(sub_indptr[-1]) - np.repeat(sub_indptr[:-1] - starts, lengths)
+    return sub_indptr, indices[positions]
+
+
+def semantic_scores(embeddings: np.ndarray, query: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Cosine similarity of normalized rows to a normalized query, or None.
+    Rounded to 6 places: float32 dot products of identical rows can differ in
+    the last bit, which would otherwise break ties arbitrarily.
+    """
+    if query is None or embeddings.ndim != 2 or embeddings.shape[1] != len(query):
+        return None
+    return np.round(np.asarray(embeddings @ query, dtype=np.float64), 6)
+
+
+def score_rows(required: Tuple[np.ndarray, np.ndarray], all_skills: Tuple[np.ndarray, np.ndarray],
+               embeddings: np.ndarray, mask: np.ndarray, query: Optional[np.ndarray],
+               rows: Optional[np.ndarray] = None):
+    """
+    (required_match, overall_match, similarity) of the roles in the CSR
+    (indptr, indices) pairs `required` / `all_skills` and `embeddings`,
+    aligned with `rows` when given (else every role). A small subset is
+    gathered and only it is scored; for a large one, scoring every role and
+    picking the rows is cheaper than the gather, so a filter never costs
+    more than scoring the whole catalog.
+    """
+    if rows is not None and len(rows) < GATHER_FRACTION * (len(required[0]) - 1):
+        required   = csr_subset(*required, rows)
+        all_skills = csr_subset(*all_skills, rows)
+        if embeddings.ndim == 2:
+            embeddings = embeddings[rows]
+        rows = None
+    req     = skill_match_percentages(*required, mask)
+    overall = skill_match_percentages(*all_skills, mask)
+    sims    = semantic_scores(embeddings, query)
+    if rows is not None:
+        req, overall = req[rows], overall[rows]
+        sims         = None if sims is None else sims[rows]
+    return req, overall, sims
+
+
+def _ranks(order: np.ndarray) -> np.ndarray:
+    """1-based rank of each row given an ordering (best first)"""
+    ranks = np.empty(len(order), dtype=np.float64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def skill_order(req: np.ndarray, overall: np.ndarray) -> np.ndarray:
+    """Rows by required match, then overall match, then catalog order"""
+    return np.lexsort((np.arange(len(req)), -overall, -req))
+
+
+def fuse_scores(req: np.ndarray, overall: np.ndarray, sims: Optional[np.ndarray],
+                method: str = 'weighted',
+                weights: Tuple[float, float] = DEFAULT_WEIGHTS) -> np.ndarray:
+    """
+    Final 0-100 score per row.
+
+    weighted: w_skill * required match % + w_semantic * similarity %.
+    rrf:      reciprocal-rank fusion of the skill and semantic rankings,
+              scaled so a row ranked first by both scores 100.
+    Without semantic scores, only the skill component is used.
+    """
+    w_skill, w_sem = weights
+    if sims is None:
+        w_sem = 0.0
+    total = w_skill + w_sem
+    if total <= 0:
+        return np.zeros(len(req))
+
+    if method == 'weighted':
+        score = w_skill * req
+        if w_sem:
+            score = score + w_sem * np.clip(sims, 0.0, 1.0) * 100
+        return np.round(score / total, 4)
+
+    if method == 'rrf':
+        score = w_skill / (RRF_K + _ranks(skill_order(req, overall)))
+        if w_sem:
+            sem_order = np.argsort(-sims, kind='stable')
+            score = score + w_sem / (RRF_K + _ranks(sem_order))
+        return np.round(score * (RRF_K + 1) / total * 100, 4)
+
+    raise ValueError(f"Unknown fusion method {method!r}; expected one of {FUSION_METHODS}")
+
+
+def top_k_indices(final: np.ndarray, overall: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k best rows, best first: by final score, then overall
+    skill match, then row order. argpartition selects the candidates; only
+    those are sorted.
+    """
+    n = len(final)
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        # Keep every row tied with the k-th score so tie-breaks stay exact
+        kth  = final[np.argpartition(-final, k - 1)[:k]].min()
+        cand = np.flatnonzero(final >= kth)
+    else:
+        cand = np.arange(n)
+    order = np.lexsort((cand, -overall[cand], -final[cand]))
+    return cand[order[:k]]
@@ -0,0 +1,35 @@
+"""
+Process memory readings.
+
+RSS is read from /proc/self/statm (Linux); elsewhere it falls back to the
+process's peak RSS from getrusage, which still bounds growth but never goes
+down. Readings are process-wide: concurrent requests in the same process
+share them.
+"""
+
+import os
+import sys
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def peak_rss_bytes() -> int:
+    """Highest resident set size of this process so far"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024   # bytes on macOS, KiB elsewhere
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return peak_rss_bytes()
@@ -0,0 +1,50 @@
+from typing import Dict, List, NamedTuple, Optional
+
+
+class JobMatch(NamedTuple):
+    """
+    One ranked job role. References the role by its row in the catalog
+    snapshot it was scored against, instead of copying the role dict; call
+    `to_dict()` where the flat dict shape is needed (UI, API, storage).
+    """
+    catalog:              object
+    index:                int
+    required_skill_match: float
+    overall_skill_match:  float
+    similarity:           Optional[float]
+    final_score:          Optional[float]
+    matching_skills:      tuple
+    missing_skills:       tuple
+
+    @property
+    def job(self) -> Dict:
+        """The catalog role this match refers to (not a copy)"""
+        return self.catalog.job_roles[self.index]
+
+    @property
+    def id(self):
+        return self.job.get('id')
+
+    @property
+    def title(self) -> str:
+        return self.job.get('title', '')
+
+    def to_dict(self) -> Dict:
+        """Flat dict in the shape match results have always had"""
+        data = {
+            **self.job,
+            'required_skill_match': self.required_skill_match,
+            'overall_skill_match':  self.overall_skill_match,
+            'matching_skills':      list(self.matching_skills),
+            'missing_skills':       list(self.missing_skills),
+        }
+        if self.similarity is not None:
+            data['similarity_score'] = self.similarity
+            data['match_percentage'] = self.similarity * 100
+        if self.final_score is not None:
+            data['final_score'] = self.final_score
+        return data
+
+
+def to_dicts(matches: List[JobMatch]) -> List[Dict]:
+    return [m.to_dict() for m in matches]
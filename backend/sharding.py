@@ -0,0 +1,198 @@
+"""
+Sharded job matching across local worker processes.
+
+Each worker owns a contiguous slice of the catalog (its CSR skill rows and
+normalized embeddings) and returns its local top-k by fused hybrid score.
+Because the score of a role depends only on that role, the global top-k is
+always contained in the union of the per-shard top-k, so merging those
+candidate lists in the parent gives exactly the same ranking as scoring the
+whole catalog in one process.
+
+Workers do not receive pickled copies of their slice: they map the compiled
+bundle, or attach to a shared-memory copy of the catalog that the pool
+publishes once, so the catalog is held in memory once however many shards
+there are. Workers are started with the pool and pinned to the bundle the
+parent loaded: one that maps a recompiled bundle refuses to score
+(StaleShardError) instead of returning rows of a different catalog.
+
+This module must stay free of torch / sentence-transformers imports: it is
+imported by every spawned worker.
+"""
+
+import heapq
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from backend.ranking import fuse_scores, score_rows, skill_mask, top_k_indices
+from backend.shared_catalog import SharedCatalog
+
+
+class StaleShardError(RuntimeError):
+    """A shard worker mapped a different catalog bundle than its pool was built for"""
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+_shard = None   # per-process state installed by _init_shard
+
+
+def _csr_rows(indptr: np.ndarray, indices: np.ndarray, start: int, end: int):
+    """(indptr, indices) slices covering rows [start, end)"""
+    return indptr[start:end + 1], indices[indptr[start]:indptr[end]]
+
+
+def _init_shard(offset: int, end: int, bundle_path: Optional[str] = None,
+                required: tuple = None, all_skills: tuple = None,
+                embeddings: np.ndarray = None, shared_name: Optional[str] = None,
+                bundle_id: Optional[str] = None):
+    global _shard
+    if bundle_path is not None or shared_name is not None:
+        # Map the compiled bundle or attach to the shared segment instead of
+        # receiving a pickled copy, so every worker shares the same physical pages
+        if bundle_path is not None:
+            from backend.catalog_bundle import load_catalog_bundle
+            catalog = load_catalog_bundle(bundle_path)
+            if catalog.bundle_id != bundle_id:
+                # Recompiled since the parent loaded it: its rows are not the parent's
+                _shard = {'stale': f"bundle {bundle_path} changed since the pool was built"}
+                return
+        else:
+            catalog = SharedCatalog.attach(shared_name).catalog
+        required   = _csr_rows(catalog.required_indptr, catalog.required_indices, offset, end)
+        all_skills = _csr_rows(catalog.all_indptr, catalog.all_indices, offset, end)
+        embeddings = catalog.embeddings[offset:end]
+    _shard = {
+        'offset':     offset,
+        'required':   required,
+        'all':        all_skills,
+        'embeddings': embeddings,
+    }
+
+
+def _score_shard(mask: np.ndarray, query: Optional[np.ndarray], top_k: int,
+                 weights: Tuple[float, float], rows: Optional[np.ndarray] = None) -> List[tuple]:
+    """
+    Local top-k of this shard as (final, overall, -index, required, similarity)
+    tuples with global indices (negated so ties keep catalog order). `rows`
+    (shard-local ids) restricts scoring to those roles.
+    """
+    if 'stale' in _shard:
+        raise StaleShardError(_shard['stale'])
+    offset = _shard['offset']
+    req, overall, sims = score_rows(_shard['required'], _shard['all'], _shard['embeddings'],
+                                    mask, query, rows)
+    final  = fuse_scores(req, overall, sims, 'weighted', weights)
+    return [
+        (float(final[i]), float(overall[i]),
+         -(offset + int(i if rows is None else rows[i])), float(req[i]),
+         None if sims is None else float(sims[i]))
+        for i in top_k_indices(final, overall, top_k)
+    ]
+
+
+def _started() -> bool:
+    return _shard is not None
+
+
+# ── Coordinator side ─────────────────────────────────────────────────────────
+
+def _bundle_current(catalog) -> bool:
+    """True if the catalog's bundle on disk is still the one it was loaded from"""
+    from backend.catalog_bundle import bundle_id, read_manifest
+    try:
+        return bundle_id(read_manifest(catalog.bundle_path)) == catalog.bundle_id
+    except (OSError, ValueError):
+        return False
+
+class ShardPool:
+    """A fixed set of single-process executors, one per catalog shard"""
+
+    def __init__(self, catalog, num_shards: int = None):
+        num_shards = num_shards or os.cpu_count() or 1
+        num_shards = max(1, min(num_shards, len(catalog) or 1))
+
+        self.catalog = catalog
+        self.workers = []
+        self.bounds  = []   # [start, end) catalog rows of each worker
+        self._shared = None
+        context      = multiprocessing.get_context('spawn')   # never fork a loaded torch model
+        bounds       = np.linspace(0, len(catalog), num_shards + 1).astype(int)
+
+        bundle_path = catalog.bundle_path
+        if bundle_path is not None and not _bundle_current(catalog):
+            print("Catalog bundle changed on disk, sharing this snapshot through shared memory")
+            bundle_path = None
+        shared_name = catalog.shared_name
+        if bundle_path is None and shared_name is None:
+            try:
+                self._shared = SharedCatalog.publish(catalog)
+                shared_name  = self._shared.name
+            except OSError as e:
+                print(f"Shared memory unavailable ({e}), sending each shard a copy")
+
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            start, end = int(start), int(end)
+            self.bounds.append((start, end))
+            if bundle_path is not None:
+                initargs = (start, end, bundle_path, None, None, None, None, catalog.bundle_id)
+            elif shared_name is not None:
+                initargs = (start, end, None, None, None, None, shared_name)
+            else:
+                embeddings = (catalog.embeddings[start:end] if catalog.has_embeddings
+                              else np.array([]))
+                initargs = (start, end, None,
+                            _csr_rows(catalog.required_indptr, catalog.required_indices, start, end),
+                            _csr_rows(catalog.all_indptr, catalog.all_indices, start, end),
+                            embeddings)
+            worker = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_init_shard,
+                initargs=initargs,
+            )
+            # Executors spawn lazily on the first submit; start now so each
+            # worker maps the catalog while it is still the parent's snapshot
+            worker.submit(_started)
+            self.workers.append(worker)
+        print(f"Job catalog split into {len(self.workers)} shards")
+
+    def top_matches(self, resume_skills: List[str], query: Optional[np.ndarray],
+                    top_k: int, weights: Tuple[float, float],
+                    mask: Optional[np.ndarray] = None,
+                    rows: Optional[np.ndarray] = None) -> List[tuple]:
+        """
+        Score every shard in parallel and merge the per-shard top-k lists.
+        `mask` overrides the resume's skill mask (e.g. with partial credit).
+        `rows` (sorted catalog ids, see JobCatalog.select_rows) restricts the
+        candidates; shards holding none of them are not asked at all.
+        Returns [(final, overall_match, index, required_match, similarity)],
+        best first.
+        """
+        if mask is None:
+            mask = skill_mask(self.catalog.skill_index, resume_skills)
+        if rows is None:
+            futures = [w.submit(_score_shard, mask, query, top_k, weights) for w in self.workers]
+        else:
+            futures = []
+            for worker, (start, end) in zip(self.workers, self.bounds):
+                lo, hi = np.searchsorted(rows, (start, end))
+                if hi > lo:
+                    futures.append(worker.submit(_score_shard, mask, query, top_k, weights,
+                                                 rows[lo:hi] - start))
+
+        candidates = []
+        for future in futures:
+            candidates.extend(future.result())
+        return [(final, overall, -neg_i, req, sim)
+                for final, overall, neg_i, req, sim in heapq.nlargest(top_k, candidates)]
+
+    def close(self):
+        for worker in self.workers:
+            worker.shutdown(wait=False)
+        if self._shared is not None:
+            # Workers that are still running keep their mapping until they exit
+            self._shared.close()
@@ -0,0 +1,263 @@
+"""
+Job catalog published once into shared memory for multi-process deployments.
+
+`SharedCatalog.publish` packs a catalog's normalized embedding matrix, CSR
+skill indexes, skill vocabulary and role JSON into one named segment.
+`SharedCatalog.attach` opens that segment by name in any other process and
+returns a JobCatalog whose arrays are read-only views of the same physical
+pages, so memory grows with the catalog size, not with the number of
+Streamlit or worker processes.
+
+Usage (stays up, republishes when the JSON or bundle changes):
+    python -m backend.shared_catalog data/job_roles.json --name resume_ai_catalog
+then start each app process with RESUME_AI_SHARED_CATALOG=resume_ai_catalog,
+or create the matcher with JobMatcher(shared_catalog='resume_ai_catalog').
+
+Only numpy and the standard library are imported at module level (shard
+workers attach from here).
+"""
+
+import json
+import os
+import sys
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.catalog import JobCatalog
+
+SEGMENT_VERSION = 1
+DEFAULT_NAME    = 'resume_ai_catalog'
+SHM_DIR         = '/dev/shm'   # where POSIX shared memory lives on Linux
+DATA_START      = 64           # bytes 0-16 hold the header offset and length
+ALIGN           = 64
+
+_attached = []   # fallback SharedMemory handles; see _map_segment
+
+
+# ── Segment layout ───────────────────────────────────────────────────────────
+# [0:8)  header offset, [8:16) header length (written last, 0 while publishing)
+# [64:)  64-byte aligned columns, then the JSON header describing them
+
+def _align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _string_columns(name: str, values) -> Dict[str, np.ndarray]:
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        f'{name}.offsets': offsets,
+        f'{name}.utf8':    np.frombuffer(b''.join(encoded), dtype=np.uint8),
+    }
+
+
+def _catalog_columns(catalog: JobCatalog) -> Dict[str, np.ndarray]:
+    columns = {
+        'embeddings':       np.asarray(catalog.embeddings, dtype=np.float32),
+        'required_indptr':  np.asarray(catalog.required_indptr),
+        'required_indices': np.asarray(catalog.required_indices),
+        'all_indptr':       np.asarray(catalog.all_indptr),
+        'all_indices':      np.asarray(catalog.all_indices),
+    }
+    columns.update(_string_columns('vocab', catalog.skill_vocab))
+    columns.update(_string_columns('hashes', catalog.role_hashes))
+    columns.update(_string_columns('roles', (json.dumps(j, ensure_ascii=False)
+                                             for j in catalog.job_roles)))
+    return {key: np.ascontiguousarray(array) for key, array in columns.items()}
+
+
+class SharedStrings:
+    """Read-only sequence of strings decoded on access from a shared UTF-8 blob"""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray):
+        self.offsets = offsets
+        self.blob    = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class SharedRoles(SharedStrings):
+    """Sequence of job role dicts decoded lazily from shared JSON rows"""
+
+    def __getitem__(self, i: int) -> Dict:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return json.loads(super().__getitem__(i))
+
+
+def _map_segment(name: str) -> np.ndarray:
+    """The whole segment as a read-only uint8 array"""
+    path = os.path.join(SHM_DIR, name)
+    if os.path.exists(path):
+        # Linux: map the tmpfs file read-only. This also keeps attaching
+        # processes out of the resource tracker, which would otherwise unlink
+        # the publisher's segment when they exit.
+        return np.memmap(path, dtype=np.uint8, mode='r')
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)   # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    # The handle cannot be closed while numpy views export its buffer, so it
+    # lives as long as the process
+    _attached.append(shm)
+    buf = np.frombuffer(shm.buf, dtype=np.uint8)
+    buf.setflags(write=False)
+    return buf
+
+
+def segment_version(name: str):
+    """Identity of the currently published segment (changes on republish), or 0"""
+    try:
+        stat = os.stat(os.path.join(SHM_DIR, name))
+    except OSError:
+        return 0
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def _unlink(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ── Publisher / attacher ─────────────────────────────────────────────────────
+
+class SharedCatalog:
+    """A catalog segment in shared memory, either owned (published) or attached"""
+
+    def __init__(self, name: str, catalog: Optional[JobCatalog] = None,
+                 shm: Optional[shared_memory.SharedMemory] = None):
+        self.name       = name
+        self.catalog    = catalog
+        self._finalizer = weakref.finalize(self, _unlink, shm) if shm is not None else None
+
+    @property
+    def owner(self) -> bool:
+        return self._finalizer is not None
+
+    @classmethod
+    def publish(cls, catalog: JobCatalog, name: Optional[str] = None,
+                replace: bool = False) -> 'SharedCatalog':
+        """
+        Copy a catalog into a new segment (a random name if none is given).
+        The segment is unlinked when the returned object is closed, collected
+        or the process exits; replace=True first unlinks a segment left under
+        the same name.
+        """
+        columns = _catalog_columns(catalog)
+        layout, offset = {}, DATA_START
+        for key, array in columns.items():
+            layout[key] = [offset, array.dtype.str, list(array.shape)]
+            offset      = _align(offset + array.nbytes)
+        header = json.dumps({
+            'version': SEGMENT_VERSION,
+            'count':   len(catalog),
+            'columns': layout,
+        }).encode('utf-8')
+        size = offset + len(header)
+
+        if replace and name:
+            try:
+                _unlink(shared_memory.SharedMemory(name=name))
+            except FileNotFoundError:
+                pass
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        for key, array in columns.items():
+            start = layout[key][0]
+            shm.buf[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+        shm.buf[offset:size] = header
+        # Header position last: attachers treat a zero length as "not ready"
+        shm.buf[0:16] = np.array([offset, len(header)], dtype='<u8').tobytes()
+
+        print(f"Published {len(catalog)} job roles to shared memory "
+              f"'{shm.name}' ({size / 2**20:.1f} MB)")
+        return cls(shm.name, catalog, shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedCatalog':
+        """Open a published segment as a JobCatalog of read-only views"""
+        buf = _map_segment(name)
+        header_offset, header_len = (int(v) for v in buf[:16].view('<u8'))
+        if header_len == 0:
+            raise ValueError(f"Shared catalog '{name}' is still being published")
+        header = json.loads(buf[header_offset:header_offset + header_len].tobytes())
+        if header.get('version') != SEGMENT_VERSION:
+            raise ValueError(f"Unsupported shared catalog version {header.get('version')}")
+
+        columns = {}
+        for key, (start, dtype, shape) in header['columns'].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape))
+            columns[key] = buf[start:start + count * dtype.itemsize].view(dtype).reshape(shape)
+
+        skill_arrays = (
+            list(SharedStrings(columns['vocab.offsets'], columns['vocab.utf8'])),
+            columns['required_indptr'],
+            columns['required_indices'],
+            columns['all_indptr'],
+            columns['all_indices'],
+        )
+        catalog = JobCatalog(
+            SharedRoles(columns['roles.offsets'], columns['roles.utf8']),
+            columns['embeddings'],
+            role_hashes  = SharedStrings(columns['hashes.offsets'], columns['hashes.utf8']),
+            skill_arrays = skill_arrays,
+            shared_name  = name,
+        )
+        return cls(name, catalog)
+
+    def close(self):
+        """Unlink an owned segment; processes still attached keep their mapping"""
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from backend.matcher import JobMatcher
+
+    parser = argparse.ArgumentParser(description="Publish the job catalog into shared memory")
+    parser.add_argument('source', nargs='?', help="job_roles.json (default: data/job_roles.json)")
+    parser.add_argument('--bundle', help="compiled catalog bundle directory instead of the JSON")
+    parser.add_argument('--name', default=DEFAULT_NAME, help="segment name")
+    parser.add_argument('--interval', type=float, default=5.0, help="seconds between change checks")
+    args = parser.parse_args()
+
+    matcher = JobMatcher(job_roles_path=args.source, bundle_path=args.bundle)
+    shared  = SharedCatalog.publish(matcher.catalog, args.name, replace=True)
+    print("Press Ctrl+C to unpublish")
+    try:
+        while True:
+            time.sleep(args.interval)
+            if matcher.reload_if_changed():
+                shared.close()
+                shared = SharedCatalog.publish(matcher.catalog, args.name, replace=True)
+    except KeyboardInterrupt:
+        shared.close()
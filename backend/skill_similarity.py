@@ -0,0 +1,184 @@
+"""
+Precomputed skill-to-skill semantic similarity for partial-credit matching.
+
+`build_skill_similarity` encodes every skill of the taxonomy and the job
+catalog once with the EmbeddingModel and keeps, per skill, its most similar
+other skills above a threshold as a sparse CSR matrix saved to an .npz file.
+At match time `SkillSimilarity.credit` turns a resume's skills into a
+per-skill credit vector over the catalog vocabulary (1 for skills the resume
+has, a fraction for closely related ones), which the vectorized scorer sums
+per role exactly like exact matches. No model call happens per request.
+
+Usage:
+    python -m backend.skill_similarity [data/skill_similarity.npz]
+"""
+
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.catalog import normalize_rows
+
+DEFAULT_PATH      = os.path.join(parent_dir, 'data', 'skill_similarity.npz')
+DEFAULT_THRESHOLD = 0.55   # cosine similarity below this earns no credit
+DEFAULT_TOP_N     = 10     # related skills kept per skill
+PARTIAL_CREDIT    = 0.5    # credit of a related skill = similarity * this
+BLOCK_ROWS        = 1024
+
+
+# ── Offline build ────────────────────────────────────────────────────────────
+
+def build_skill_similarity(skills: Iterable[str], embedding_model,
+                           threshold: float = DEFAULT_THRESHOLD,
+                           top_n: int = DEFAULT_TOP_N) -> 'SkillSimilarity':
+    """Encode the skills and keep each one's top_n neighbours above threshold"""
+    vocab      = sorted({s.lower() for s in skills})
+    embeddings = normalize_rows(embedding_model.generate_embeddings(vocab))
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(vocab):
+        raise RuntimeError("Could not encode skills for the similarity matrix")
+
+    n       = len(vocab)
+    keep    = min(top_n, n - 1)
+    indptr  = np.zeros(n + 1, dtype=np.int64)
+    indices, data = [], []
+    for start in range(0, n, BLOCK_ROWS):
+        block = embeddings[start:start + BLOCK_ROWS] @ embeddings.T
+        rows  = np.arange(block.shape[0])
+        block[rows, start + rows] = -1.0          # a skill is not its own neighbour
+        if keep <= 0:
+            indptr[start + 1:start + len(rows) + 1] = indptr[start]
+            continue
+        top = np.argpartition(-block, keep - 1, axis=1)[:, :keep]
+        for r in rows:
+            cols = top[r][block[r, top[r]] >= threshold]
+            cols = cols[np.argsort(-block[r, cols], kind='stable')]
+            indices.append(cols.astype(np.int32))
+            data.append(block[r, cols].astype(np.float32))
+            indptr[start + r + 1] = indptr[start + r] + len(cols)
+
+    return SkillSimilarity(
+        vocab,
+        indptr,
+        np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+        np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+        model     = getattr(embedding_model, 'model_name', None),
+        threshold = threshold,
+    )
+
+
+# ── Lookup ───────────────────────────────────────────────────────────────────
+
+class SkillSimilarity:
+    """Sparse skill x skill similarity (CSR rows over a lowercase vocabulary)"""
+
+    def __init__(self, vocab: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, model: Optional[str] = None,
+                 threshold: float = DEFAULT_THRESHOLD):
+        self.vocab     = list(vocab)
+        self.index     = {skill: i for i, skill in enumerate(self.vocab)}
+        self.indptr    = indptr
+        self.indices   = indices
+        self.data      = data
+        self.model     = model
+        self.threshold = threshold
+        self._mapping  = (None, None)   # (catalog skill_index, vocab id -> catalog id)
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def save(self, path: str):
+        tmp = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp,
+            vocab     = np.array(self.vocab, dtype=str),
+            indptr    = self.indptr,
+            indices   = self.indices,
+            data      = self.data,
+            meta      = np.array(json.dumps({'model': self.model, 'threshold': self.threshold})),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillSimilarity':
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            return cls(f['vocab'].tolist(), f['indptr'], f['indices'], f['data'],
+                       model=meta.get('model'), threshold=meta.get('threshold', DEFAULT_THRESHOLD))
+
+    def neighbours(self, skill: str) -> Dict[str, float]:
+        """Related skills of `skill` with their similarity"""
+        i = self.index.get(skill.lower())
+        if i is None:
+            return {}
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return {self.vocab[j]: float(s) for j, s in zip(self.indices[lo:hi], self.data[lo:hi])}
+
+    def _catalog_ids(self, skill_index: Dict[str, int]) -> np.ndarray:
+        # Cached per catalog snapshot (a reload brings a new skill_index)
+        cached_for, ids = self._mapping
+        if cached_for is not skill_index:
+            ids = np.array([skill_index.get(s, -1) for s in self.vocab], dtype=np.int64)
+            self._mapping = (skill_index, ids)
+        return ids
+
+    def credit(self, skill_index: Dict[str, int], resume_skills: Iterable[str],
+               mask: np.ndarray, partial_credit: float = PARTIAL_CREDIT) -> np.ndarray:
+        """
+        Per-skill credit over a catalog vocabulary: 1.0 where `mask` (the
+        resume's exact skills) is set, otherwise the best similarity to any
+        resume skill times `partial_credit`, 0 if none is related.
+        """
+        credit = np.zeros(len(skill_index), dtype=np.float64)
+        ids    = self._catalog_ids(skill_index)
+        for skill in {s.lower() for s in resume_skills}:
+            i = self.index.get(skill)
+            if i is None:
+                continue
+            cols   = self.indices[self.indptr[i]:self.indptr[i + 1]]
+            target = ids[cols]
+            keep   = target >= 0
+            np.maximum.at(credit, target[keep],
+                          self.data[self.indptr[i]:self.indptr[i + 1]][keep] * partial_credit)
+        credit[mask] = 1.0
+        return credit
+
+
+def load_skill_similarity(path: str = DEFAULT_PATH) -> Optional[SkillSimilarity]:
+    """The saved matrix, or None if it has not been built"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return SkillSimilarity.load(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Could not load skill similarity matrix {path}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    from backend.skills import SkillExtractor
+    from model.embeddings import EmbeddingModel
+
+    out_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    with open(os.path.join(parent_dir, 'data', 'job_roles.json'), 'r') as f:
+        job_roles = json.load(f).get('job_roles', [])
+
+    skills = set(SkillExtractor().known_skills)
+    for job in job_roles:
+        skills.update(s.lower() for s in job.get('required_skills', []) + job.get('nice_to_have', []))
+
+    matrix = build_skill_similarity(skills, EmbeddingModel())
+    matrix.save(out_path)
+    print(f"Saved {len(matrix)} skills, {matrix.nnz} related pairs to {out_path}")
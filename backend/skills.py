@@ -1,11 +1,31 @@
+import os
 import re
+import sys
 from typing import List, Set, Dict
 
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.fuzzy import compact_key, get_skill_index
+from backend.profiling import stage
+
+# Phrases are split on list punctuation; fuzzy n-grams never span them
+_PHRASE_SPLIT = re.compile(r'[,•·|\n;:()\[\]]')
+_WORD         = re.compile(r'[a-z0-9+#][a-z0-9+#.\-/]*')
+
 
 class SkillExtractor:
     """Extract and categorize skills from resume text"""
 
-    def __init__(self):
+    def __init__(self, fuzzy: bool = True):
+        """
+        fuzzy also matches misspellings and aliases (e.g. "Kubernates",
+        "ReactJS") in the skills section
+        """
+        self.fuzzy = fuzzy
         # ── Master skills database ──────────────────────────────────────────
         self.known_skills = {
             # Programming Languages
@@ -144,6 +164,25 @@ class SkillExtractor:
 
         return found_skills
 
+    def extract_skills_fuzzy(self, text: str, max_words: int = 3) -> Set[str]:
+        """
+        Match aliases and near-misspellings of known skills via the trigram
+        index. Every run of 1..max_words words inside a phrase is looked up,
+        so "Node JS" and "sci-kit learn" resolve as well as single tokens.
+        """
+        index = get_skill_index(self.known_skills)
+        found = set()
+        for phrase in _PHRASE_SPLIT.split(text.lower()):
+            words = _WORD.findall(phrase)
+            for i in range(len(words)):
+                for n in range(1, min(max_words, len(words) - i) + 1):
+                    term = ' '.join(words[i:i + n])
+                    hit  = index.lookup(term)
+                    # Plain single-word taxonomy hits are the regex pass's job
+                    if hit and not (n == 1 and hit[0] == compact_key(term)):
+                        found.add(hit[0])
+        return found
+
     def extract_skills_from_section(self, skills_section: str) -> Set[str]:
         """Extract skills from the dedicated skills section"""
         if not skills_section:
@@ -287,6 +326,7 @@ class SkillExtractor:
 
     # ── Main Entry Point ─────────────────────────────────────────────────────
 
+    @stage('skills')
     def extract_all_skills(self, resume_data: Dict) -> Dict:
         """Extract all skills from the full resume"""
         text     = resume_data.get('text', '')
@@ -303,8 +343,11 @@ class SkillExtractor:
         for sec in ['projects', 'experience']:
             skills_from_text |= self.extract_skills_regex(sections.get(sec, ''))
 
-        # Merge all found skills
+        # Merge all found skills. Misspellings and aliases are only looked for
+        # in the skills list: in prose, ordinary words sit too close to skills
         all_skills = skills_from_text | skills_from_section
+        if self.fuzzy:
+            all_skills |= self.extract_skills_fuzzy(skills_section_text)
 
         # Get years of experience
         experience_years = self.extract_experience_years(text)
@@ -0,0 +1,257 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'resumes.db'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id                 INTEGER PRIMARY KEY,
+    resume_key         TEXT NOT NULL UNIQUE,
+    name               TEXT,
+    email              TEXT,
+    phone              TEXT,
+    linkedin           TEXT,
+    github             TEXT,
+    text               TEXT,
+    sections           TEXT,
+    experience_years   INTEGER NOT NULL DEFAULT 0,
+    skills_count       INTEGER NOT NULL DEFAULT 0,
+    categorized_skills TEXT,
+    created_at         REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resumes_experience ON resumes(experience_years);
+
+CREATE TABLE IF NOT EXISTS resume_skills (
+    skill     TEXT NOT NULL,
+    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+    display   TEXT NOT NULL,
+    PRIMARY KEY (skill, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_resume_skills_resume ON resume_skills(resume_id);
+
+CREATE TABLE IF NOT EXISTS resume_embeddings (
+    resume_id INTEGER PRIMARY KEY REFERENCES resumes(id) ON DELETE CASCADE,
+    model     TEXT NOT NULL DEFAULT '',
+    dim       INTEGER NOT NULL,
+    vector    BLOB NOT NULL
+);
+"""
+
+_CONTACT_FIELDS = ('name', 'email', 'phone', 'linkedin', 'github')
+
+
+class ResumeStore:
+    """
+    Embedded SQLite store for parsed resumes, extracted skills and embeddings.
+
+    Skills live in an indexed (skill, resume_id) table, so queries such as
+    "kubernetes and 3+ years" are index lookups rather than re-parses.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path  = path
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(resume_embeddings)')}
+        if 'model' not in columns:
+            # Stores created before embeddings recorded their model
+            self.conn.execute("ALTER TABLE resume_embeddings ADD COLUMN model TEXT NOT NULL DEFAULT ''")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM resumes').fetchone()[0]
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def save(self, resume_key: str, resume_data: Dict, skills_data: Dict,
+             embedding: Optional[np.ndarray] = None, model: str = '') -> int:
+        """Insert or replace one analysis; returns its row id"""
+        return self.save_many([(resume_key, resume_data, skills_data, embedding)], model)[0]
+
+    def save_many(self, entries: Iterable[Tuple], model: str = '') -> List[int]:
+        """
+        Bulk insert (resume_key, resume_data, skills_data[, embedding]) tuples
+        in a single transaction. Existing keys are replaced. `model` names the
+        embedding model, so embeddings of different models are never mixed.
+        """
+        entries = [tuple(e) + (None,) * (4 - len(e)) for e in entries]
+        now     = time.time()
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'DELETE FROM resumes WHERE resume_key = ?', [(e[0],) for e in entries]
+            )
+            ids = []
+            for key, resume_data, skills_data, _ in entries:
+                cur = self.conn.execute(
+                    'INSERT INTO resumes (resume_key, name, email, phone, linkedin, github, '
+                    'text, sections, experience_years, skills_count, categorized_skills, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key,
+                     *(resume_data.get(f) for f in _CONTACT_FIELDS),
+                     resume_data.get('text', ''),
+                     json.dumps(dict(resume_data.get('sections', {}))),
+                     int(skills_data.get('experience_years', 0)),
+                     int(skills_data.get('skills_count', len(skills_data.get('skills', [])))),
+                     json.dumps(skills_data.get('categorized_skills', {})),
+                     now),
+                )
+                ids.append(cur.lastrowid)
+
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO resume_skills (skill, resume_id, display) VALUES (?, ?, ?)',
+                [(skill.lower(), rid, skill)
+                 for rid, (_, _, skills_data, _) in zip(ids, entries)
+                 for skill in skills_data.get('skills', [])],
+            )
+            self.conn.executemany(
+                'INSERT INTO resume_embeddings (resume_id, model, dim, vector) VALUES (?, ?, ?, ?)',
+                [(rid, model or '', len(emb), np.asarray(emb, dtype=np.float32).tobytes())
+                 for rid, (_, _, _, emb) in zip(ids, entries)
+                 if emb is not None and len(emb)],
+            )
+        return ids
+
+    def delete(self, resume_key: str):
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM resumes WHERE resume_key = ?', (resume_key,))
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def get(self, resume_key: str) -> Optional[Tuple[Dict, Dict]]:
+        """Return (resume_data, skills_data) for a stored resume, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT * FROM resumes WHERE resume_key = ?', (resume_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            skills = [r['display'] for r in self.conn.execute(
+                'SELECT display FROM resume_skills WHERE resume_id = ?', (row['id'],)
+            )]
+
+        resume_data = {f: row[f] for f in _CONTACT_FIELDS}
+        resume_data['text']     = row['text']
+        resume_data['sections'] = json.loads(row['sections'] or '{}')
+        skills_data = {
+            'skills':             sorted(skills),
+            'skills_raw':         [s.lower() for s in skills],
+            'skills_count':       row['skills_count'],
+            'categorized_skills': json.loads(row['categorized_skills'] or '{}'),
+            'experience_years':   row['experience_years'],
+        }
+        return resume_data, skills_data
+
+    def find_resumes(self, skills: List[str] = None, min_years: int = None,
+                     match_all: bool = True, limit: int = 100) -> List[Dict]:
+        """
+        Find resumes having all (or any) of `skills` and at least `min_years`
+        of experience. Results are summaries ordered by matched skills, then
+        experience.
+        """
+        skills = sorted({s.lower() for s in (skills or [])})
+        params: List = []
+
+        if skills:
+            placeholders = ', '.join('?' * len(skills))
+            sql = ('SELECT r.id, r.resume_key, r.name, r.email, r.experience_years, '
+                   'COUNT(*) AS matched FROM resume_skills s '
+                   'JOIN resumes r ON r.id = s.resume_id '
+                   f'WHERE s.skill IN ({placeholders})')
+            params.extend(skills)
+        else:
+            sql = ('SELECT r.id, r.resume_key, r.name, r.email, r.experience_years, '
+                   '0 AS matched FROM resumes r WHERE 1')
+        if min_years is not None:
+            sql += ' AND r.experience_years >= ?'
+            params.append(int(min_years))
+        if skills:
+            sql += ' GROUP BY r.id'
+            if match_all:
+                sql += ' HAVING COUNT(*) = ?'
+                params.append(len(skills))
+        sql += ' ORDER BY matched DESC, r.experience_years DESC LIMIT ?'
+        params.append(int(limit))
+
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def skill_counts(self, limit: int = 50) -> List[Tuple[str, int]]:
+        """Most common skills across all stored resumes"""
+        with self._lock:
+            return [(r['display'], r['n']) for r in self.conn.execute(
+                'SELECT MIN(display) AS display, COUNT(*) AS n FROM resume_skills '
+                'GROUP BY skill ORDER BY n DESC LIMIT ?', (int(limit),)
+            )]
+
+    def iter_profiles(self) -> Iterable[Tuple[str, List[str], int]]:
+        """(resume_key, display skills, experience_years) of every stored resume"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT r.resume_key, r.experience_years, s.display FROM resumes r '
+                'LEFT JOIN resume_skills s ON s.resume_id = r.id ORDER BY r.id'
+            ).fetchall()
+        current, skills, years = None, [], 0
+        for row in rows:
+            if row['resume_key'] != current:
+                if current is not None:
+                    yield current, sorted(skills), years
+                current, skills, years = row['resume_key'], [], row['experience_years']
+            if row['display'] is not None:
+                skills.append(row['display'])
+        if current is not None:
+            yield current, sorted(skills), years
+
+    def load_embeddings(self, resume_keys: List[str] = None,
+                        model: str = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Return (resume_keys, matrix) of stored embeddings, only those of
+        `model` if given. Rows whose dimension differs from the newest
+        embedding's (left by an earlier model) are skipped, so the rows
+        always stack; re-save those resumes to include them again.
+        """
+        sql    = ('SELECT r.resume_key, r.created_at, e.dim, e.vector FROM resume_embeddings e '
+                  'JOIN resumes r ON r.id = e.resume_id')
+        where, params = [], []
+        if resume_keys is not None:
+            where.append(f"r.resume_key IN ({', '.join('?' * len(resume_keys))})")
+            params.extend(resume_keys)
+        if model is not None:
+            where.append('e.model = ?')
+            params.append(model)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        dim  = max(rows, key=lambda r: r['created_at'])['dim']
+        kept = [r for r in rows if r['dim'] == dim]
+        if len(kept) < len(rows):
+            print(f"Skipped {len(rows) - len(kept)} stored embeddings that are not {dim}-dimensional")
+        matrix = np.stack([np.frombuffer(r['vector'], dtype=np.float32, count=dim) for r in kept])
+        return [r['resume_key'] for r in kept], matrix
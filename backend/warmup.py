@@ -0,0 +1,161 @@
+"""
+Application warm-up and readiness reporting.
+
+Loading the sentence-transformer, encoding (or attaching) the job catalog
+and the first inference together take seconds. `start_warmup` runs them once
+per process in a background thread as soon as the app starts, so the first
+request finds a ready matcher, and the UI can show which stage is running
+and how long each one took instead of hanging.
+
+Heavy modules are imported inside the warm-up thread, so importing this
+module (e.g. from app.py before Streamlit starts) stays cheap.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+STAGES = {
+    'model':   'loading embedding model',
+    'catalog': 'preparing job catalog',
+    'encode':  'warming up the model',
+    'match':   'warming up job matching',
+}
+WARMUP_TEXTS  = ['Professional with skills in python sql docker',
+                 'Data Scientist: machine learning, statistics, pandas']
+WARMUP_SKILLS = ['Python', 'SQL', 'Docker']
+
+
+def _load_model():
+    # Importing sentence-transformers / torch is part of the cost
+    from model.embeddings import EmbeddingModel
+    return EmbeddingModel()
+
+
+def build_matcher(embedding_model=None):
+    """The app's matcher: attached to a shared catalog if one is configured, hot-reloading"""
+    from backend.matcher import JobMatcher
+    matcher = JobMatcher(shared_catalog=os.environ.get('RESUME_AI_SHARED_CATALOG'),
+                         embedding_model=embedding_model)
+    matcher.start_watching()
+    return matcher
+
+
+class Warmup:
+    """Builds the matcher in a background thread and reports progress"""
+
+    def __init__(self, matcher_factory: Callable = build_matcher):
+        self.matcher_factory = matcher_factory
+        self.matcher         = None
+        self.state           = 'pending'   # pending | warming | ready | failed
+        self.stage           = None
+        self.error           = None
+        self.timings         = {}          # stage -> seconds
+        self._started        = None
+        self._finished       = None
+        self._done           = threading.Event()
+        self._lock           = threading.Lock()
+
+    # ── Control ──────────────────────────────────────────────────────────────
+
+    def start(self, retry: bool = False) -> 'Warmup':
+        """
+        Start warming up. No-op if running or ready, and after a failure
+        unless `retry`: a failed model load is not repeated implicitly.
+        """
+        with self._lock:
+            if self.state in ('warming', 'ready') or (self.state == 'failed' and not retry):
+                return self
+            self.state, self.error, self.timings = 'warming', None, {}
+            self._started, self._finished = time.perf_counter(), None
+            self._done.clear()
+            threading.Thread(target=self._run, name='warmup', daemon=True).start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finished (ready or failed); False on timeout"""
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self.state == 'ready'
+
+    def _timed(self, stage: str, func: Callable):
+        self.stage = stage
+        t0 = time.perf_counter()
+        result = func()
+        self.timings[stage] = round(time.perf_counter() - t0, 3)
+        return result
+
+    def _run(self):
+        try:
+            model   = self._timed('model', _load_model)
+            matcher = self._timed('catalog', lambda: self.matcher_factory(model))
+            # First inference allocates buffers and JIT-initializes kernels
+            self._timed('encode', lambda: model.generate_embeddings(WARMUP_TEXTS))
+            # Spawns shard workers (if any) and touches the catalog pages
+            self._timed('match', lambda: matcher.rank_jobs(WARMUP_SKILLS, 0, 5))
+            self.matcher, self.state = matcher, 'ready'
+            print(f"Warm-up finished in {self.elapsed:.1f}s "
+                  + ", ".join(f"{k} {v:.2f}s" for k, v in self.timings.items()))
+        except Exception as e:
+            self.error, self.state = str(e), 'failed'
+            print(f"Warm-up failed during {self.stage}: {e}")
+        finally:
+            self.stage, self._finished = None, time.perf_counter()
+            self._done.set()
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+
+    @property
+    def elapsed(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    def describe(self) -> str:
+        """One-line human readable status"""
+        if self.state == 'warming':
+            return f"{STAGES.get(self.stage, 'starting')} ({self.elapsed:.0f}s)"
+        if self.state == 'ready':
+            return f"ready (warmed up in {self.elapsed:.1f}s)"
+        if self.state == 'failed':
+            return f"failed: {self.error}"
+        return 'not started'
+
+    def status(self) -> Dict:
+        return {
+            'state':   self.state,
+            'stage':   self.stage,
+            'elapsed': round(self.elapsed, 3),
+            'timings': dict(self.timings),
+            'error':   self.error,
+        }
+
+
+# ── Process-wide instance ────────────────────────────────────────────────────
+
+_warmup      = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """The process's Warmup, created on first use (not started)"""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup()
+        return _warmup
+
+
+def start_warmup(retry: bool = False) -> Warmup:
+    """Start (or join) the process-wide warm-up; `retry` restarts a failed one"""
+    return get_warmup().start(retry)
@@ -0,0 +1,123 @@
+"""
+Benchmark field extraction on adversarial resume text.
+
+Compares the previous per-field regex scans (reproduced below) with the
+single-pass extractor in backend/fields.py. Each input is doubled in size
+several times; linear code roughly doubles its time per step, while the
+backtracking patterns grow quadratically.
+
+    python benchmarks/field_extraction.py [--max-size 64000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.fields import extract_fields
+
+
+# ── Previous implementation (one scan per field) ─────────────────────────────
+
+_LEGACY_PHONE = [
+    r'\+91[\s\-]?\d{5}[\s\-]?\d{5}',
+    r'91[\s\-]?\d{10}',
+    r'\b\d{5}[\s\-]\d{5}\b',
+    r'\b[6-9]\d{9}\b',
+    r'\+?1?[\s\-]?\(?\d{3}\)?[\s\-]\d{3}[\s\-]\d{4}',
+    r'\b\d[\d\s\-\.\(\)]{8,}\d\b',
+]
+_LEGACY_SECTIONS = [
+    r'(work\s*experience|experience|employment|professional\s*experience|work\s*history)',
+    r'(education|academic|qualification|degree)',
+    r'(skills|technical\s*skills|competencies|expertise|technologies)',
+    r'(projects|portfolio|personal\s*projects|academic\s*projects)',
+    r'(summary|objective|profile|about\s*me|career\s*objective)',
+    r'(certifications?|certificates?|courses?|training)',
+    r'(achievements?|awards?|honors?|accomplishments?)',
+]
+
+
+def legacy_extract(text: str):
+    re.findall(r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b', text)
+    for pattern in _LEGACY_PHONE:
+        if re.findall(pattern, text):
+            break
+    lines = [l.strip() for l in text.strip().split('\n') if l.strip()]
+    for line in lines[:8]:
+        re.search(r'@|http|linkedin|github|resume|cv|\d{5,}', line, re.I)
+    re.findall(r'(https?://)?(?:www\.)?linkedin\.com/in/[\w\-]+', text, re.I)
+    re.findall(r'(https?://)?(?:www\.)?github\.com/[\w\-]+', text, re.I)
+    text_lower = text.lower()
+    for pattern in _LEGACY_SECTIONS:
+        re.search(pattern, text_lower)
+
+
+# ── Adversarial inputs ───────────────────────────────────────────────────────
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+CASES = {
+    # Table-of-contents leaders: every dot can start an email local part
+    'dot leaders':         lambda n: 'Experience ' + _repeat('.', n) + ' 3',
+    # Dotted tokens without an '@'
+    'a.a.a run':           lambda n: _repeat('a.', n),
+    # Long email-like local part with a dangling '@'
+    'local part + @':      lambda n: _repeat('ab', n) + '@',
+    # Numeric table columns separated by single spaces
+    'digit table':         lambda n: _repeat('12 ', n) + 'x',
+    # One very long digit run glued to a letter
+    'long digit run':      lambda n: _repeat('7', n) + 'x',
+    # Whitespace runs after a multi-word header prefix
+    'whitespace':          lambda n: 'work' + ' ' * n + 'x',
+    # Realistic resume text, for reference
+    'resume text':         lambda n: _repeat(
+        'Jane Doe\njane.doe@example.com | +91 98765 43210\n'
+        'Experience\nSoftware Engineer, 2019 - 2024, Python, SQL\n'
+        'Education\nB.Tech Computer Science\n', n),
+}
+
+
+def _time(fn, text: str, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--min-size', type=int, default=4000)
+    parser.add_argument('--max-size', type=int, default=64000)
+    parser.add_argument('--legacy-timeout', type=float, default=10.0,
+                        help='stop timing the legacy scans for a case once a run exceeds this')
+    args = parser.parse_args()
+
+    print(f"{'case':<16} {'chars':>8} {'legacy ms':>12} {'single-pass ms':>15} {'speedup':>9}")
+    for name, make in CASES.items():
+        size, legacy_done = args.min_size, False
+        while size <= args.max_size:
+            text = make(size)
+            new  = _time(extract_fields, text)
+            if legacy_done:
+                old_ms, ratio = 'skipped', ''
+            else:
+                old = _time(legacy_extract, text, repeat=1)
+                legacy_done = old > args.legacy_timeout
+                old_ms, ratio = f'{old * 1000:.1f}', f'{old / new:.1f}x'
+            print(f'{name:<16} {len(text):>8} {old_ms:>12} {new * 1000:>15.1f} {ratio:>9}')
+            size *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Load test the analysis flow with concurrent simulated users.
+
+Each user runs whole sessions against the backend classes, the same way the
+Streamlit UI does: parse → skills → match → advice → chat. Users start
+together and share one process-wide matcher (model and catalog) and,
+optionally, one extraction cache, so contention on them shows up in the
+latencies. Reports throughput, p50/p95/p99 latency per stage and peak RSS.
+
+    python benchmarks/load_test.py --users 8 --sessions 5
+    python benchmarks/load_test.py --users 16 --resumes resumes/*.pdf --cache /tmp/pdf_cache
+    python benchmarks/load_test.py --users 4 --json results.json
+
+Without --resumes, synthetic resume texts built from the job catalog are
+analyzed (the parse stage then covers field extraction only).
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from backend.advisor import CareerAdvisor
+from backend.chatbot import ResumeChat
+from backend.parser import ResumeParser
+from backend.pdf_cache import ExtractionCache
+from backend.resources import peak_rss_bytes, rss_bytes
+from backend.skills import SkillExtractor
+from backend.warmup import Warmup
+
+STAGES        = ('parse', 'skills', 'match', 'advice', 'chat', 'session')
+CHAT_MESSAGES = ['What skills do I have?', 'Show job recommendations', 'What skills am I missing?']
+PERCENTILES   = (50, 95, 99)
+
+
+# ── Inputs ───────────────────────────────────────────────────────────────────
+
+def synthetic_resumes(count: int, seed: int = 0) -> List[str]:
+    """Plausible resume texts mixing skills of random catalog roles"""
+    with open(os.path.join(parent_dir, 'data', 'job_roles.json'), 'r') as f:
+        roles = json.load(f).get('job_roles', [])
+    rng   = random.Random(seed)
+    texts = []
+    for i in range(count):
+        picked = rng.sample(roles, k=min(2, len(roles)))
+        skills = sorted({s for role in picked for s in role.get('required_skills', [])
+                         + role.get('nice_to_have', [])})
+        skills = rng.sample(skills, k=max(1, len(skills) * 2 // 3))
+        years  = rng.randint(0, 12)
+        texts.append(
+            f"Candidate {i}\ncandidate{i}@example.com | +91 98765 {10000 + i}\n\n"
+            f"Summary\n{picked[0]['title']} with {years} years of experience.\n\n"
+            f"Skills\n{', '.join(skills)}\n\n"
+            f"Experience\n{picked[0]['title']}, Example Corp, {2024 - years} - 2024\n"
+            f"Built systems using {', '.join(skills[:5])}.\n\n"
+            f"Education\nB.Tech Computer Science\n"
+        )
+    return texts
+
+
+# ── Simulated users ──────────────────────────────────────────────────────────
+
+class LoadTest:
+    """Runs sessions from concurrent user threads and collects stage latencies"""
+
+    def __init__(self, matcher, documents: List, users: int, sessions: int,
+                 cache: ExtractionCache = None, chat_messages: List[str] = CHAT_MESSAGES,
+                 think_time: float = 0.0, seed: int = 0):
+        self.matcher       = matcher
+        self.documents     = documents   # PDF bytes or resume text
+        self.users         = users
+        self.sessions      = sessions
+        self.cache         = cache
+        self.chat_messages = chat_messages
+        self.think_time    = think_time
+        self.seed          = seed
+        self.latencies     = {stage: [] for stage in STAGES}
+        self.errors        = {stage: 0 for stage in STAGES}
+        self.elapsed       = 0.0
+        self.peak_rss      = 0
+        self._lock         = threading.Lock()
+
+    def _record(self, stage: str, seconds: float = None):
+        with self._lock:
+            if seconds is None:
+                self.errors[stage] += 1
+            else:
+                self.latencies[stage].append(seconds)
+
+    def _timed(self, stage: str, func):
+        t0 = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            self._record(stage)
+            print(f"{stage} failed: {e}")
+            raise
+        self._record(stage, time.perf_counter() - t0)
+        if self.think_time:
+            time.sleep(self.think_time)
+        return result
+
+    def run_session(self, document) -> None:
+        """One user's upload → match → advice → chat flow, as the UI runs it"""
+        parser = ResumeParser(cache=self.cache)
+        if isinstance(document, bytes):
+            resume_data = self._timed('parse', lambda: parser.get_resume_data(io.BytesIO(document)))
+        else:
+            resume_data = self._timed('parse', lambda: parser.get_resume_data_from_text(document))
+        skills_data = self._timed('skills', lambda: SkillExtractor().extract_all_skills(resume_data))
+        matches     = self._timed('match', lambda: self.matcher.get_job_recommendations(
+            skills_data, top_k=5)).get('top_matches', [])
+        self._timed('advice', lambda: CareerAdvisor().get_career_advice(skills_data, matches))
+        chatbot = ResumeChat(resume_data=resume_data, skills_data=skills_data, job_matches=matches)
+        for message in self.chat_messages:
+            self._timed('chat', lambda: chatbot.chat(message))
+
+    def _user(self, user_id: int, start: threading.Barrier):
+        rng = random.Random(self.seed + user_id)
+        start.wait()
+        for _ in range(self.sessions):
+            t0 = time.perf_counter()
+            try:
+                self.run_session(rng.choice(self.documents))
+            except Exception:
+                self._record('session')
+                continue
+            self._record('session', time.perf_counter() - t0)
+
+    def _sample_rss(self, done: threading.Event, interval: float = 0.05):
+        while not done.is_set():
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+            done.wait(interval)
+
+    def run(self) -> 'LoadTest':
+        start   = threading.Barrier(self.users + 1)
+        done    = threading.Event()
+        sampler = threading.Thread(target=self._sample_rss, args=(done,), daemon=True)
+        threads = [threading.Thread(target=self._user, args=(i, start), name=f'user-{i}')
+                   for i in range(self.users)]
+        sampler.start()
+        for thread in threads:
+            thread.start()
+        start.wait()
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - t0
+        done.set()
+        sampler.join()
+        self.peak_rss = max(self.peak_rss, rss_bytes())
+        return self
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+
+    def report(self) -> Dict:
+        stages = {}
+        for stage in STAGES:
+            samples = np.array(self.latencies[stage]) * 1000
+            row     = {'count': len(samples), 'errors': self.errors[stage]}
+            if len(samples):
+                row['mean_ms'] = round(float(samples.mean()), 2)
+                row.update({f'p{p}_ms': round(float(v), 2)
+                            for p, v in zip(PERCENTILES, np.percentile(samples, PERCENTILES))})
+                row['max_ms']  = round(float(samples.max()), 2)
+            stages[stage] = row
+        sessions = len(self.latencies['session'])
+        return {
+            'users':              self.users,
+            'sessions_per_user':  self.sessions,
+            'elapsed_s':          round(self.elapsed, 3),
+            'sessions_per_s':     round(sessions / self.elapsed, 2) if self.elapsed else 0.0,
+            'peak_rss_mb':        round(self.peak_rss / 2**20, 1),
+            'process_peak_rss_mb': round(peak_rss_bytes() / 2**20, 1),
+            'stages':             stages,
+        }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"{report['users']} users x {report['sessions_per_user']} sessions in "
+        f"{report['elapsed_s']:.2f}s: {report['sessions_per_s']:.2f} sessions/s, "
+        f"peak RSS {report['peak_rss_mb']:.0f} MB",
+        '',
+        f"{'stage':<8} {'count':>6} {'errors':>6} {'mean ms':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for stage, row in report['stages'].items():
+        if not row['count']:
+            lines.append(f"{stage:<8} {0:>6} {row['errors']:>6}")
+            continue
+        lines.append(
+            f"{stage:<8} {row['count']:>6} {row['errors']:>6} {row['mean_ms']:>9.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=8, help='concurrent simulated users')
+    parser.add_argument('--sessions', type=int, default=5, help='sessions per user')
+    parser.add_argument('--resumes', nargs='*', default=[],
+                        help='PDF files or globs (default: synthetic resume texts)')
+    parser.add_argument('--synthetic', type=int, default=50, help='number of synthetic resumes')
+    parser.add_argument('--cache', help='share an extraction cache in this directory')
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help='seconds each user pauses after every stage')
+    parser.add_argument('--no-warmup', action='store_true',
+                        help='do not run one untimed session first')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.resumes for p in glob.glob(pattern)})
+    if args.resumes and not paths:
+        parser.error('no PDF matched --resumes')
+    if paths:
+        documents = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                documents.append(f.read())
+    else:
+        documents = synthetic_resumes(args.synthetic, args.seed)
+
+    rss_start = rss_bytes()
+    warmup    = Warmup().start()
+    warmup.wait()
+    if not warmup.ready:
+        sys.exit(f"Warm-up failed: {warmup.error}")
+    print(f"Warm-up {warmup.describe()}; RSS {rss_start / 2**20:.0f} MB -> {rss_bytes() / 2**20:.0f} MB")
+
+    test = LoadTest(warmup.matcher, documents, args.users, args.sessions,
+                    cache=ExtractionCache(args.cache) if args.cache else None,
+                    think_time=args.think_time, seed=args.seed)
+    if not args.no_warmup:
+        test.run_session(documents[0])
+        test.latencies = {stage: [] for stage in STAGES}
+        test.errors    = {stage: 0 for stage in STAGES}
+
+    report = test.run().report()
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
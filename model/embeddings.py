@@ -1,18 +1,39 @@
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import json
+import time
+
+from model.settings import env_number
+
+# Batch encoding defaults, overridable per EmbeddingModel or by RESUME_AI_EMBED_BATCH_SIZE
+# and RESUME_AI_EMBED_MEMORY_MB
+DEFAULT_BATCH_SIZE    = 32
+DEFAULT_MAX_MEMORY_MB = 512    # estimated working memory of one batch
+TOKEN_BYTES_PER_DIM   = 64     # float32 activations held per token, per embedding dimension
+CHARS_PER_TOKEN       = 4      # length estimate used for bucketing, without tokenizing
+PROGRESS_MIN_TEXTS    = 1000   # report progress only for inputs at least this large
+
 
 class EmbeddingModel:
     """Generate and compare embeddings for skills and job descriptions"""
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', batch_size: int = None,
+                 max_memory_mb: float = None):
         """
         Initialize the embedding model
         Args:
-            model_name: HuggingFace model name (default: lightweight sentence transformer)
+            model_name:    HuggingFace model name (default: lightweight sentence transformer)
+            batch_size:    most texts encoded per batch
+            max_memory_mb: cap on the estimated working memory of one batch;
+                           batches of long texts are made smaller to stay under it
         """
+        self.model_name    = model_name
+        self.batch_size    = max(1, int(batch_size or env_number('RESUME_AI_EMBED_BATCH_SIZE',
+                                                                 DEFAULT_BATCH_SIZE)))
+        self.max_memory_mb = max_memory_mb or env_number('RESUME_AI_EMBED_MEMORY_MB',
+                                                         DEFAULT_MAX_MEMORY_MB)
         print(f"Loading embedding model: {model_name}...")
         try:
             self.model = SentenceTransformer(model_name)
@@ -33,18 +54,96 @@ class EmbeddingModel:
             print(f"Error generating embedding: {e}")
             return np.array([])
     
-    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Generate embeddings for multiple texts"""
+    def generate_embeddings(self, texts: List[str], batch_size: int = None,
+                            progress: Callable[[int, int], None] = None) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts, in input order. Encoded in
+        length-bucketed, memory-capped batches (see iter_embeddings) straight
+        into one preallocated array.
+        """
         if self.model is None:
             return np.array([])
         
         try:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return embeddings
+            dim = self.model.get_sentence_embedding_dimension()
+            out = np.empty((len(texts), dim), dtype=np.float32) if dim and texts else None
+            for indices, embeddings in self.iter_embeddings(texts, batch_size, progress):
+                if out is None:
+                    out = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+                out[indices] = embeddings
+            return out if out is not None else np.array([])
         except Exception as e:
             print(f"Error generating embeddings: {e}")
             return np.array([])
     
+    def iter_embeddings(self, texts: List[str], batch_size: int = None,
+                        progress: Callable[[int, int], None] = None,
+                        out: np.ndarray = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Encode batch by batch, yielding (indices, embeddings) where
+        `embeddings[j]` belongs to `texts[indices[j]]`. Texts are grouped by
+        length so a batch pads to similar lengths, and a batch of long texts
+        holds fewer of them so its estimated memory stays under
+        `max_memory_mb`. Only one batch is held at a time unless `out` (e.g.
+        a preallocated array or np.memmap of len(texts) rows) is given, in
+        which case each batch is also written into it.
+
+        `progress(done, total)` is called after every batch; by default,
+        progress of large inputs is printed every 10%.
+        """
+        if self.model is None:
+            raise RuntimeError(f"Embedding model {self.model_name} is not loaded")
+        total    = len(texts)
+        progress = progress or self._print_progress(total)
+        done     = 0
+        for indices in self._batches(texts, batch_size or self.batch_size):
+            embeddings = np.asarray(self.model.encode(
+                [texts[i] for i in indices], batch_size=len(indices),
+                convert_to_numpy=True, show_progress_bar=False,
+            ), dtype=np.float32)
+            if out is not None:
+                out[indices] = embeddings
+            done += len(indices)
+            if progress is not None:
+                progress(done, total)
+            yield indices, embeddings
+    
+    def _batches(self, texts: List[str], batch_size: int) -> Iterator[np.ndarray]:
+        """
+        Index batches over `texts`, longest first so that each batch pads to
+        the length of its first text and an out-of-memory batch fails early
+        """
+        max_tokens = getattr(self.model, 'max_seq_length', None) or 512
+        dim        = self.model.get_sentence_embedding_dimension() or 768
+        budget     = max(1, int(self.max_memory_mb * 2**20 / (TOKEN_BYTES_PER_DIM * 4 * dim)))
+        lengths    = np.minimum(
+            np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+            // CHARS_PER_TOKEN + 2, max_tokens)   # + [CLS] / [SEP]
+        order      = np.argsort(-lengths, kind='stable')
+        start      = 0
+        while start < len(order):
+            # Every text in the batch is padded to the first (longest) one
+            size  = max(1, min(batch_size, budget // int(lengths[order[start]])))
+            yield order[start:start + size]
+            start += size
+    
+    @staticmethod
+    def _print_progress(total: int) -> Optional[Callable[[int, int], None]]:
+        if total < PROGRESS_MIN_TEXTS:
+            return None
+        t0     = time.perf_counter()
+        marks  = iter(range(10, 101, 10))
+        state  = {'next': next(marks)}
+
+        def report(done: int, total: int):
+            percent = 100 * done // total
+            if state['next'] is None or percent < state['next']:
+                return
+            print(f"Encoded {done}/{total} texts ({percent}%, {time.perf_counter() - t0:.1f}s)")
+            while state['next'] is not None and state['next'] <= percent:
+                state['next'] = next(marks, None)
+        return report
+    
     def calculate_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings"""
         if len(embedding1) == 0 or len(embedding2) == 0:
@@ -0,0 +1,19 @@
+"""
+Environment-configured settings, shared by the model and backend packages.
+
+Kept free of project imports so that `model` never depends on `backend`.
+"""
+
+import os
+
+
+def env_number(name: str, default: float) -> float:
+    """Numeric environment setting; `default` if unset or malformed"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
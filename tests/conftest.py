@@ -0,0 +1,89 @@
+import os
+import sys
+import zlib
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from typing import List
+
+import numpy as np
+import pytest
+
+
+def _pdf_string(line: str) -> str:
+    return '(' + line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def build_pdf(pages: List[str]) -> bytes:
+    """A minimal PDF with one page per string, each line drawn in Helvetica"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        lines  = ' '.join(f'{_pdf_string(line)} Tj T*' for line in text.split('\n'))
+        stream = f'BT /F1 11 Tf 14 TL 72 720 Td {lines} ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    out, offsets = bytearray(b'%PDF-1.4\n'), []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    out += ''.join(f'{o:010d} 00000 n \n' for o in offsets).encode('latin-1')
+    out += (f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+            f'startxref\n{xref}\n%%EOF\n').encode('latin-1')
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
+
+
+class HashingModel:
+    """
+    Stand-in for EmbeddingModel (which downloads its weights): bag-of-words
+    vectors hashed into `dim` buckets, deterministic across processes
+    """
+
+    model_name = 'hashing-test'
+
+    def __init__(self, dim: int = 64):
+        self.dim   = dim
+        self.model = self
+
+    def create_job_description_text(self, job) -> str:
+        return ' '.join([job['title'], job.get('description', '')] + job.get('required_skills', []))
+
+    def create_skill_profile_text(self, skills, experience_years=0) -> str:
+        return ' '.join(skills)
+
+    def generate_embedding(self, text: str) -> np.ndarray:
+        vector = np.full(self.dim, 0.01, dtype=np.float32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode('utf-8')) % self.dim] += 1
+        return vector
+
+    def generate_embeddings(self, texts) -> np.ndarray:
+        return np.array([self.generate_embedding(t) for t in texts]) if texts else np.array([])
+
+
+@pytest.fixture(scope='session')
+def embedding_model():
+    return HashingModel()
+
+
+@pytest.fixture(scope='session')
+def matcher(embedding_model):
+    """JobMatcher over data/job_roles.json, exact skill matches only"""
+    from backend.matcher import JobMatcher
+    return JobMatcher(embedding_model=embedding_model, partial_credit=0)
@@ -0,0 +1,95 @@
+import json
+import os
+
+import pytest
+
+from backend import catalog_bundle
+from backend.catalog_bundle import compile_catalog_bundle, load_catalog_bundle, read_manifest
+from backend.matcher import JobMatcher
+from backend.results import to_dicts
+
+JOB_ROLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'job_roles.json')
+SKILLS    = ['Python', 'SQL', 'Docker', 'Kubernetes', 'React', 'Machine Learning']
+
+
+def roles_file(tmp_path, job_roles, name='job_roles.json'):
+    path = tmp_path / name
+    path.write_text(json.dumps({'job_roles': job_roles}))
+    return str(path)
+
+
+def generations(bundle_dir):
+    return {catalog_bundle._generation_of(f) for f in os.listdir(bundle_dir)} - {''}
+
+
+@pytest.fixture(scope='module')
+def json_roles():
+    with open(JOB_ROLES) as f:
+        return json.load(f)['job_roles']
+
+
+@pytest.fixture
+def bundle(tmp_path, embedding_model):
+    path = str(tmp_path / 'job_roles.bundle')
+    compile_catalog_bundle(JOB_ROLES, path, embedding_model)
+    return path
+
+
+# ── Round trip and ranking ───────────────────────────────────────────────────
+
+def test_bundle_roles_match_the_json(bundle, json_roles):
+    catalog = load_catalog_bundle(bundle)
+    assert list(catalog.job_roles) == json_roles
+    assert catalog.embeddings.shape[0] == len(json_roles)
+
+
+def test_bundle_ranks_like_the_json(bundle, matcher, embedding_model):
+    from_bundle = JobMatcher(bundle_path=bundle, embedding_model=embedding_model, partial_credit=0)
+    for years in (0, 4, 12):
+        assert to_dicts(from_bundle.rank_jobs(SKILLS, years, 10)) == \
+               to_dicts(matcher.rank_jobs(SKILLS, years, 10))
+
+
+# ── Generations ──────────────────────────────────────────────────────────────
+
+def test_recompile_replaces_the_generation(bundle, tmp_path, json_roles, embedding_model):
+    before = load_catalog_bundle(bundle)
+    first  = read_manifest(bundle)['generation']
+    source = roles_file(tmp_path, json_roles[:5])
+    compile_catalog_bundle(source, bundle, embedding_model)
+
+    second = read_manifest(bundle)['generation']
+    assert second != first
+    assert generations(bundle) == {second}
+    assert len(load_catalog_bundle(bundle).job_roles) == 5
+    # Columns mapped before the recompile stay readable
+    assert list(before.job_roles) == json_roles
+
+
+def test_load_retries_when_a_recompile_lands_mid_load(bundle, tmp_path, json_roles,
+                                                     embedding_model, monkeypatch):
+    source   = roles_file(tmp_path, json_roles[:5])
+    original = catalog_bundle._map_generation
+    calls    = []
+
+    def recompile_first(bundle_dir, manifest):
+        calls.append(manifest['generation'])
+        if len(calls) == 1:
+            # The manifest was read; a compile swaps in a new one before mapping
+            compile_catalog_bundle(source, bundle_dir, embedding_model)
+        return original(bundle_dir, manifest)
+
+    monkeypatch.setattr(catalog_bundle, '_map_generation', recompile_first)
+    catalog = load_catalog_bundle(bundle)
+    assert len(calls) == 2 and calls[0] != calls[1]
+    assert len(catalog.job_roles) == 5 == catalog.embeddings.shape[0]
+    assert catalog.bundle_id == catalog_bundle.bundle_id(read_manifest(bundle))
+
+
+def test_running_compile_keeps_newer_generations(bundle):
+    newer = f'{int(read_manifest(bundle)["generation"], 16) + 1:016x}'
+    stray = os.path.join(bundle, f'ids.{newer}.npy.tmp')
+    open(stray, 'wb').close()
+    catalog_bundle._remove_older_generations(bundle, read_manifest(bundle)['generation'])
+    assert os.path.exists(stray)
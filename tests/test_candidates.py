@@ -0,0 +1,79 @@
+import pytest
+
+from backend.candidates import CandidateIndex
+
+RESUMES = {
+    'ana':   (['Python', 'SQL', 'Machine Learning', 'Pandas'], 3),
+    'bo':    (['Java', 'Spring', 'AWS', 'Docker'], 6),
+    'chen':  (['React', 'JavaScript', 'CSS', 'Figma'], 1),
+    'dev':   (['Excel', 'Communication'], 0),
+    'eli':   (['Python', 'Docker', 'Kubernetes', 'AWS', 'Linux'], 9),
+}
+
+
+def skills_data(skills, years):
+    return {'skills': skills, 'experience_years': years}
+
+
+@pytest.fixture(scope='module')
+def index(matcher):
+    index = CandidateIndex(matcher)
+    index.add_many([(rid, skills_data(*r), {'name': rid.title()}) for rid, r in RESUMES.items()])
+    return index
+
+
+def role_score(matcher, skills, years, role_id):
+    """The matcher's score for one resume against one role"""
+    ranked = matcher.rank_jobs(skills, years, len(matcher.catalog))
+    return next(m for m in ranked if m.to_dict()['id'] == role_id).to_dict()
+
+
+# ── Reverse matching ─────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('row', [0, 17, 54, 109])
+def test_candidate_scores_match_forward_matching(index, matcher, row):
+    role_id = matcher.catalog.job_roles[row]['id']
+    ranked  = index.rank_candidates(role_id=role_id, top_k=len(RESUMES))
+    assert sorted(c['id'] for c in ranked) == sorted(RESUMES)
+    assert [c['final_score'] for c in ranked] == sorted((c['final_score'] for c in ranked),
+                                                        reverse=True)
+    for candidate in ranked:
+        forward = role_score(matcher, *RESUMES[candidate['id']], role_id)
+        for key in ('required_skill_match', 'overall_skill_match', 'missing_skills'):
+            assert candidate[key] == forward[key]
+        assert candidate['similarity_score'] == pytest.approx(forward['similarity_score'], abs=1e-5)
+        assert candidate['final_score'] == pytest.approx(forward['final_score'], abs=1e-3)
+
+
+def test_role_dict_ranks_like_role_id(index, matcher):
+    role    = matcher.catalog.job_roles[17]
+    by_id   = index.rank_candidates(role_id=role['id'])
+    by_dict = index.rank_candidates(role=role)
+    assert [c['id'] for c in by_dict] == [c['id'] for c in by_id]
+    assert [c['final_score'] for c in by_dict] == pytest.approx([c['final_score'] for c in by_id],
+                                                                abs=1e-3)
+
+
+def test_description_uses_its_extracted_skills(index):
+    ranked = index.rank_candidates(description="We need Python, SQL and Pandas for ML work", top_k=2)
+    assert ranked[0]['id'] == 'ana' and ranked[0]['name'] == 'Ana'
+    assert ranked[0]['required_skill_match'] == 100.0
+
+
+# ── Indexing ─────────────────────────────────────────────────────────────────
+
+def test_embeddings_grow_past_capacity(matcher):
+    index = CandidateIndex(matcher, capacity=2)
+    for rid, resume in RESUMES.items():
+        index.add(rid, skills_data(*resume))
+    assert index.embeddings.shape == (len(RESUMES), matcher.embedding_model.dim)
+    assert len(index.rank_candidates(role_id=matcher.catalog.job_roles[0]['id'])) == len(RESUMES)
+
+
+def test_duplicate_ids_are_rejected(index):
+    with pytest.raises(ValueError):
+        index.add('ana', skills_data(['Go'], 2))
+
+
+def test_unknown_role_ranks_nobody(index):
+    assert index.rank_candidates(role_id=-1) == []
@@ -0,0 +1,90 @@
+import random
+from collections import Counter
+
+import pytest
+
+from backend.advisor import CareerAdvisor
+from backend.cohort import GAP_TARGETS, MATCH_TOP_K, CohortStats
+from backend.results import to_dicts
+
+
+@pytest.fixture(scope='module')
+def resumes(matcher):
+    """40 resumes drawn from the catalog's skills, with their top matches"""
+    rng    = random.Random(5)
+    skills = sorted({s for job in matcher.catalog.job_roles for s in job['required_skills']})
+    result = []
+    for i in range(40):
+        picked = rng.sample(skills, rng.randint(2, 8))
+        years  = rng.randint(0, 14)
+        result.append((f'resume-{i}', {'skills': picked, 'experience_years': years},
+                       to_dicts(matcher.rank_jobs(picked, years, MATCH_TOP_K))))
+    return result
+
+
+def counts(report):
+    """The report with ranked lists as mappings (ties are listed in first-seen order)"""
+    normalized = dict(report)
+    for key in ('top_skills', 'top_gaps', 'top_roles'):
+        normalized[key] = {r['name']: r['count'] for r in report[key]}
+    normalized['role_fit'] = {r['role']: r for r in report['role_fit']}
+    return normalized
+
+
+def build(resumes):
+    stats = CohortStats()
+    for key, skills_data, matches in resumes:
+        stats.add(skills_data, matches, key=key)
+    return stats
+
+
+# ── Counts ───────────────────────────────────────────────────────────────────
+
+def test_counts_match_a_recount(resumes):
+    stats  = build(resumes)
+    report = stats.report(top_n=1000)
+    assert report['resumes'] == len(resumes)
+    assert len(stats.skill_names) > 64 and len(stats.role_titles) > 16   # arrays grew
+
+    skills = Counter(s for _, sd, _ in resumes for s in sd['skills'])
+    assert {r['name']: r['count'] for r in report['top_skills']} == skills
+
+    advisor = CareerAdvisor()
+    gaps    = Counter(s for _, sd, m in resumes for s in advisor.analyze_skill_gaps(
+        sd['skills'], m[:GAP_TARGETS], sd['experience_years'])['top_missing_skills'])
+    assert {r['name']: r['count'] for r in report['top_gaps']} == gaps
+
+    tops = Counter(m[0]['title'] for _, _, m in resumes)
+    assert {r['name']: r['count'] for r in report['top_roles']} == tops
+    matched = Counter(match['title'] for _, _, m in resumes for match in m)
+    assert {r['role']: r['matched'] for r in report['role_fit']} == matched
+    assert sum(report['experience'].values()) == len(resumes)
+
+
+def test_order_does_not_change_the_report(resumes):
+    assert counts(build(resumes).report(1000)) == counts(build(resumes[::-1]).report(1000))
+
+
+def test_a_key_is_counted_once(resumes):
+    stats = build(resumes)
+    key, skills_data, matches = resumes[0]
+    assert not stats.add(skills_data, matches, key=key)
+    assert len(stats) == len(resumes)
+
+
+# ── Persistence ──────────────────────────────────────────────────────────────
+
+def test_saved_stats_keep_counting(resumes, tmp_path):
+    path  = str(tmp_path / 'cohort.npz')
+    build(resumes[:25]).save(path)
+    stats = CohortStats.load(path)
+    assert stats.keys == {key for key, _, _ in resumes[:25]}
+    for key, skills_data, matches in resumes:
+        stats.add(skills_data, matches, key=key)
+    assert stats.report() == build(resumes).report()
+
+
+def test_unreadable_file_gives_empty_stats(tmp_path):
+    path = tmp_path / 'cohort.npz'
+    path.write_bytes(b'not an npz')
+    assert len(CohortStats.load_or_create(str(path))) == 0
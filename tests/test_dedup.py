@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from backend.dedup import MinHasher, NearDuplicateIndex, analyze_resume_batch
+from backend.parser import ResumeParser
+from backend.skills import SkillExtractor
+
+TEMPLATE = ("{name}\n{email}\nSkills\nPython, SQL, Docker, Kubernetes, AWS, Pandas\n"
+            "Experience\nData Engineer at Acme building batch and streaming pipelines "
+            "for analytics, reporting and machine learning teams across the company\n"
+            "Education\nBSc Computer Science, State University")
+
+
+@pytest.fixture(scope='module')
+def tools(matcher):
+    return ResumeParser(), SkillExtractor(), matcher
+
+
+def upload(make_pdf, name, text):
+    pdf = io.BytesIO(make_pdf([text]))
+    pdf.name = name
+    return pdf
+
+
+# ── MinHash ──────────────────────────────────────────────────────────────────
+
+def test_signature_is_exact_universal_hash():
+    hasher = MinHasher(num_perm=8)
+    text   = "one two three four five six seven"
+    p      = (1 << 61) - 1
+    hashes = [int(h) for h in hasher.shingles(text)]
+    expect = [min((int(a) * x + int(b)) % p & 0xFFFFFFFF for x in hashes)
+              for a, b in zip(hasher.a, hasher.b)]
+    assert hasher.signature(text).tolist() == expect
+
+
+def test_near_duplicates_are_similar():
+    hasher = MinHasher()
+    a = TEMPLATE.format(name='Jane Doe', email='jane@example.com')
+    b = TEMPLATE.format(name='John Roe', email='john@example.com')
+    assert MinHasher.similarity(hasher.signature(a), hasher.signature(b)) > 0.6
+    assert MinHasher.similarity(hasher.signature(a), hasher.signature("unrelated text here")) < 0.1
+
+
+# ── Batches ──────────────────────────────────────────────────────────────────
+
+def test_batch_keys_and_duplicates(make_pdf, tools):
+    jane  = TEMPLATE.format(name='Jane Doe', email='jane@example.com')
+    john  = TEMPLATE.format(name='John Roe', email='john@example.com')
+    other = "Alex Poe\nalex@example.com\nSkills\nFigma, Sketch\nDesigner of mobile apps"
+    files = [upload(make_pdf, 'resume.pdf', jane), upload(make_pdf, 'resume.pdf', john),
+             upload(make_pdf, 'other.pdf', other), upload(make_pdf, 'copy.pdf', jane)]
+
+    index = NearDuplicateIndex(threshold=0.5)
+    batch = analyze_resume_batch(files, *tools, index=index)
+    keys  = [key for _, key in batch['documents']]
+
+    assert [name for name, _ in batch['documents']] == ['resume.pdf', 'resume.pdf', 'other.pdf', 'copy.pdf']
+    assert len(set(keys)) == 3 and keys[0] == keys[3]          # same bytes, same key
+    assert (batch['analyzed'], batch['reused']) == (2, 2)
+
+    first, second = batch['results'][keys[0]], batch['results'][keys[1]]
+    assert second['duplicate_of'] == keys[0]
+    assert second['skills_data'] is first['skills_data']        # costly parts reused
+    assert second['resume_data']['email'] == 'john@example.com'  # contact fields are its own
+    assert first['resume_data']['email'] == 'jane@example.com'
+    assert sorted(map(sorted, batch['clusters'])) == [sorted(keys[:2])]
+
+    again = analyze_resume_batch([upload(make_pdf, 'later.pdf', john)], *tools, index=index)
+    assert again['results'][keys[1]]['duplicate_of'] == keys[0]
+    assert again['results'][keys[1]]['resume_data']['name'] == 'John Roe'
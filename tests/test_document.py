@@ -0,0 +1,47 @@
+import json
+import pickle
+
+import pytest
+
+from backend.document import FIELD_NAMES, SECTION_NAMES, ResumeDocument
+from backend.fields import extract_fields
+
+TEXT = ("Jane Doe\njane.doe@example.com\n\nSummary\n  Data engineer.  \n"
+        "Experience\nAcme, 2019 - 2024\n\nSkills\nPython, SQL\n")
+
+
+@pytest.fixture
+def doc():
+    return ResumeDocument.from_fields(TEXT, extract_fields(TEXT))
+
+
+def test_reads_like_the_old_dict(doc):
+    assert list(doc) == list(FIELD_NAMES) and len(doc) == len(FIELD_NAMES)
+    assert doc['name'] == 'Jane Doe' and doc.get('email') == 'jane.doe@example.com'
+    assert doc.get('github') == 'Not found' and doc.get('missing', 'x') == 'x'
+    with pytest.raises(KeyError):
+        doc['missing']
+
+
+def test_sections_are_trimmed_slices_of_the_text(doc):
+    sections = doc['sections']
+    assert list(sections) == list(SECTION_NAMES)
+    assert sections['summary'] == 'Summary\n  Data engineer.'
+    assert sections['experience'] == 'Experience\nAcme, 2019 - 2024'
+    assert sections['skills'] == 'Skills\nPython, SQL'
+    assert sections['education'] == ''
+    for name, (start, end) in doc.section_spans.items():
+        assert TEXT[start:end] == sections[name]
+
+
+def test_section_spans_rebuild_the_same_document(doc):
+    rebuilt = ResumeDocument(doc.text, doc.name, doc.email, doc.phone, doc.linkedin,
+                             doc.github, doc.section_spans)
+    assert rebuilt.to_dict() == doc.to_dict()
+
+
+def test_to_dict_is_plain_and_serializable(doc):
+    data = doc.to_dict()
+    assert type(data['sections']) is dict
+    assert json.loads(json.dumps(data)) == data
+    assert pickle.loads(pickle.dumps(doc)).to_dict() == data
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from model.embeddings import CHARS_PER_TOKEN, TOKEN_BYTES_PER_DIM, EmbeddingModel
+
+DIM = 8
+
+
+class RecordingEncoder:
+    """SentenceTransformer stand-in: each text's vector is [len(text)] * DIM"""
+
+    max_seq_length = 128
+
+    def __init__(self):
+        self.batches = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, show_progress_bar=False):
+        self.batches.append(list(texts))
+        return np.array([[len(t)] * DIM for t in texts], dtype=np.float32)
+
+
+def make_model(batch_size=32, max_memory_mb=512) -> EmbeddingModel:
+    model = EmbeddingModel.__new__(EmbeddingModel)
+    model.model_name    = 'recording'
+    model.batch_size    = batch_size
+    model.max_memory_mb = max_memory_mb
+    model.model         = RecordingEncoder()
+    return model
+
+
+def texts(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return ['x' * int(k) for k in rng.integers(1, 600, n)]
+
+
+def tokens(text) -> int:
+    """The model's length estimate for a text, capped at its sequence length"""
+    return min(len(text) // CHARS_PER_TOKEN + 2, RecordingEncoder.max_seq_length)
+
+
+# ── Batching ─────────────────────────────────────────────────────────────────
+
+def test_embeddings_come_back_in_input_order():
+    inputs = texts(300)
+    out    = make_model(batch_size=16).generate_embeddings(inputs)
+    assert out.shape == (300, DIM) and out.dtype == np.float32
+    assert out[:, 0].tolist() == [len(t) for t in inputs]
+
+
+def test_batches_are_longest_first_and_within_the_memory_cap():
+    model  = make_model(batch_size=64, max_memory_mb=0.5)
+    inputs = texts(400, seed=1)
+    model.generate_embeddings(inputs)
+    batches = model.model.batches
+    assert sum(len(b) for b in batches) == 400
+    assert max(len(b) for b in batches) <= 64
+
+    budget = 0.5 * 2**20 / (TOKEN_BYTES_PER_DIM * 4 * DIM)
+    order  = [tokens(t) for batch in batches for t in batch]
+    assert order == sorted(order, reverse=True)
+    for batch in batches:
+        # Every text is padded to the first (longest) one
+        assert len(batch) == 1 or len(batch) * tokens(batch[0]) <= budget
+
+
+def test_iter_embeddings_fills_out_and_reports_progress():
+    inputs, seen = texts(50, seed=2), []
+    out = np.zeros((50, DIM), dtype=np.float32)
+    for indices, embeddings in make_model(batch_size=8).iter_embeddings(
+            inputs, out=out, progress=lambda done, total: seen.append((done, total))):
+        assert embeddings[:, 0].tolist() == [len(inputs[i]) for i in indices]
+    assert out[:, 0].tolist() == [len(t) for t in inputs]
+    assert seen[-1] == (50, 50) and len(seen) == len(set(seen))
+
+
+def test_settings_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv('RESUME_AI_EMBED_BATCH_SIZE', '7')
+    monkeypatch.setenv('RESUME_AI_EMBED_MEMORY_MB', 'lots')
+    monkeypatch.setattr('model.embeddings.SentenceTransformer', lambda name: RecordingEncoder())
+    model = EmbeddingModel('recording')
+    assert model.batch_size == 7 and model.max_memory_mb == 512
+    assert EmbeddingModel('recording', batch_size=3).batch_size == 3
+
+
+def test_unloaded_model_cannot_iterate():
+    model = make_model()
+    model.model = None
+    assert model.generate_embeddings(['a']).size == 0
+    with pytest.raises(RuntimeError):
+        next(model.iter_embeddings(['a']))
@@ -0,0 +1,131 @@
+import random
+import re
+import time
+
+import pytest
+
+from backend.document import ResumeDocument
+from backend.fields import extract_fields
+
+
+# ── Previous implementation (one regex scan per field) ───────────────────────
+
+LEGACY_PHONE = [
+    r'\+91[\s\-]?\d{5}[\s\-]?\d{5}',
+    r'91[\s\-]?\d{10}',
+    r'\b\d{5}[\s\-]\d{5}\b',
+    r'\b[6-9]\d{9}\b',
+    r'\+?1?[\s\-]?\(?\d{3}\)?[\s\-]\d{3}[\s\-]\d{4}',
+    r'\b\d[\d\s\-\.\(\)]{8,}\d\b',
+]
+LEGACY_SECTIONS = {
+    'experience':     r'(work\s*experience|experience|employment|professional\s*experience|work\s*history)',
+    'education':      r'(education|academic|qualification|degree)',
+    'skills':         r'(skills|technical\s*skills|competencies|expertise|technologies)',
+    'projects':       r'(projects|portfolio|personal\s*projects|academic\s*projects)',
+    'summary':        r'(summary|objective|profile|about\s*me|career\s*objective)',
+    'certifications': r'(certifications?|certificates?|courses?|training)',
+    'achievements':   r'(achievements?|awards?|honors?|accomplishments?)',
+}
+
+
+def first(pattern, text, flags=0):
+    match = re.search(pattern, text, flags)
+    return match.group(0) if match else 'Not found'
+
+
+def legacy_name(text):
+    lines = [l.strip() for l in text.strip().split('\n') if l.strip()]
+    for line in lines[:8]:
+        if re.search(r'@|http|linkedin|github|resume|cv|\d{5,}', line, re.I):
+            continue
+        words = line.split()
+        if 2 <= len(words) <= 5 and all(w[0].isupper() for w in words if w.isalpha()):
+            return line
+    return lines[0] if lines else 'Not found'
+
+
+def legacy_phone(text):
+    for pattern in LEGACY_PHONE:
+        match = re.search(pattern, text)
+        if match:
+            return re.sub(r'\s+', ' ', match.group(0).strip())
+    return 'Not found'
+
+
+def legacy_sections(text):
+    positions = {}
+    for section, pattern in LEGACY_SECTIONS.items():
+        match = re.search(pattern, text.lower())
+        if match:
+            positions[section] = match.start()
+    ordered  = sorted(positions.items(), key=lambda x: x[1])
+    sections = dict.fromkeys(LEGACY_SECTIONS, '')
+    for i, (section, start) in enumerate(ordered):
+        end = ordered[i + 1][1] if i + 1 < len(ordered) else len(text)
+        sections[section] = text[start:end].strip()
+    return sections
+
+
+def legacy_fields(text):
+    return {
+        'name':     legacy_name(text),
+        'email':    first(r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b', text),
+        'phone':    legacy_phone(text),
+        # The old code returned findall()'s capture group; the full URL is what was meant
+        'linkedin': first(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w\-]+', text, re.I),
+        'github':   first(r'(?:https?://)?(?:www\.)?github\.com/[\w\-]+', text, re.I),
+        'sections': legacy_sections(text),
+    }
+
+
+def single_pass(text):
+    fields = extract_fields(text)
+    result = {k: v for k, v in fields.items() if k != 'section_spans'}
+    result['sections'] = dict(ResumeDocument.from_fields(text, fields).sections)
+    return result
+
+
+# ── Parity ───────────────────────────────────────────────────────────────────
+
+RESUME = ("Jane Q Doe\nBengaluru | jane.doe@example.com | +91 98765 43210\n"
+          "https://www.linkedin.com/in/jane-doe | github.com/janedoe\n"
+          "Career Objective\nBuild data platforms.\n"
+          "Work Experience\nData Engineer, 2019 - 2024\n"
+          "Education\nB.Tech Computer Science\n"
+          "Technical Skills\nPython, SQL, Spark\n"
+          "Certifications\nAWS Solutions Architect\n")
+
+PIECES = ['John Smith\n', 'Jane Q Doe\n', 'jane.doe@gmail.com', ' a@b.c ', 'x@y.co.in', '@', '.',
+          'a.', '+91 98765 43210', '+91-9876543210', '919876543210', '98765-43210', '9876543210',
+          '+1 (123) 456-7890', '123.456.7890', '(555) 123-4567', '12345', '1', '2', ' ', '\n',
+          '-', '(', ')', '+', 'abc', 'Work Experience', 'EXPERIENCE', 'Education',
+          'Academic Projects', 'skills', 'Technical Skills', 'summary', 'Career Objective',
+          'certification', 'courses', 'awards', 'linkedin.com/in/jane',
+          'https://www.linkedin.com/in/jd-1', 'github.com/jd', 'http://github.com/experience',
+          '_', 'é', '9', '0', ' 2024 ', 'resume', 'WORK  EXPERIENCE', 'GitHub.com/X',
+          'HTTPS://LinkedIn.com/in/A']
+
+
+def test_resume_fields_match_the_per_field_regexes():
+    assert single_pass(RESUME) == legacy_fields(RESUME)
+    assert single_pass(RESUME)['phone'] == '+91 98765 43210'
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_texts_match_the_per_field_regexes(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        text = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 60)))
+        assert single_pass(text) == legacy_fields(text), repr(text)
+
+
+# ── Linear time ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('text', ['a.' * 100000, 'ab' * 100000 + '@', '12 ' * 70000 + 'x',
+                                  'work' + ' ' * 200000 + 'x'],
+                         ids=['dotted', 'dangling-at', 'digit-table', 'whitespace'])
+def test_adversarial_text_is_fast(text):
+    started = time.perf_counter()
+    extract_fields(text)
+    assert time.perf_counter() - started < 2
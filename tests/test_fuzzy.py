@@ -0,0 +1,58 @@
+import os
+import sys
+
+# Add project root to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import pytest
+
+from backend.fuzzy import get_skill_index
+from backend.skills import SkillExtractor
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return SkillExtractor()
+
+
+@pytest.fixture(scope='module')
+def index(extractor):
+    return get_skill_index(extractor.known_skills)
+
+
+# ── Lookups ──────────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('word', ['excels', 'iconic', 'trails', 'reacts', 'pythons',
+                                  'dockers', 'sparks', 'scalar', 'flasks', 'springs'])
+def test_english_words_are_not_skills(index, word):
+    assert index.lookup(word) is None
+
+
+@pytest.mark.parametrize('term, skill', [
+    ('kubernates', 'kubernetes'),
+    ('tenserflow', 'tensorflow'),
+    ('javscript',  'javascript'),
+    ('pytorh',     'pytorch'),
+    ('ReactJS',    'react'),
+    ('Node JS',    'node.js'),
+    ('sci-kit learn', 'scikit-learn'),
+])
+def test_misspellings_and_aliases_resolve(index, term, skill):
+    assert index.lookup(term)[0] == skill
+
+
+# ── Extraction ───────────────────────────────────────────────────────────────
+
+def test_prose_is_not_fuzzy_matched(extractor):
+    text = ("Skills\nPython, Kubernates\n"
+            "Experience\nLeads a team that excels at iconic launches, reacts fast and blazes trails.\n")
+    resume = {'text': text, 'sections': {
+        'skills':     'Python, Kubernates',
+        'experience': 'Leads a team that excels at iconic launches, reacts fast and blazes trails.',
+    }}
+    skills = {s.lower() for s in extractor.extract_all_skills(resume)['skills']}
+    assert 'kubernetes' in skills
+    assert not {'excel', 'ionic', 'rails', 'react'} & skills
@@ -0,0 +1,132 @@
+import io
+import multiprocessing
+import time
+
+import pytest
+
+from backend import page_worker
+from backend.parser import ResourceLimitError, ResumeParser
+
+PAGES = ['Jane Doe\njane.doe@example.com\nSkills\nPython, SQL',
+         'Experience\nData Engineer at Acme',
+         'Education\nBSc Computer Science']
+
+
+@pytest.fixture
+def slow_page(monkeypatch):
+    """
+    Make page 2 hang in the given extractor. Workers are forked after the
+    patch, so they inherit it; idle workers from before are stopped.
+    """
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork to patch the page workers")
+    page_worker.shutdown()
+    monkeypatch.setattr(page_worker, 'START_METHOD', 'fork')
+    original = page_worker.extract_page
+
+    def install(engine):
+        def extract_page(document, page_engine, index):
+            if page_engine == engine and index == 1:
+                time.sleep(60)
+            return original(document, page_engine, index)
+        monkeypatch.setattr(page_worker, 'extract_page', extract_page)
+
+    yield install
+    page_worker.shutdown()
+
+
+# ── Strategies ───────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('strategy', ['adaptive', 'pdfplumber', 'pypdf2'])
+def test_strategies_read_every_page(make_pdf, strategy):
+    parser = ResumeParser(strategy=strategy)
+    text   = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert all(line in text for page in PAGES for line in page.split('\n'))
+    assert parser.last_extraction['pages'] == 3
+    assert parser.last_extraction['limits'] == []
+
+
+# ── Page budgets ─────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('strategy', ['adaptive', 'pypdf2'])
+def test_slow_page_is_abandoned(make_pdf, slow_page, strategy):
+    slow_page('pypdf2')
+    parser  = ResumeParser(strategy=strategy, page_time_budget=0.5)
+    started = time.perf_counter()
+    text    = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert time.perf_counter() - started < 10
+    assert 'Jane Doe' in text and 'Education' in text and 'Data Engineer' not in text
+    assert parser.last_extraction['pages'] == 3
+    assert parser.last_extraction['over_budget_pages'] == 1
+
+
+def test_slow_pdfplumber_page_falls_back_to_pypdf2(make_pdf, slow_page):
+    slow_page('pdfplumber')
+    parser  = ResumeParser(strategy='pdfplumber', page_time_budget=0.5)
+    started = time.perf_counter()
+    text    = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert time.perf_counter() - started < 10
+    assert all(line in text for page in PAGES for line in page.split('\n'))
+    assert parser.last_extraction['over_budget_pages'] == 1
+
+
+def test_total_time_limit_stops_inside_a_page(make_pdf, slow_page):
+    slow_page('pypdf2')
+    parser  = ResumeParser(strategy='pypdf2', page_time_budget=30, max_seconds=1)
+    started = time.perf_counter()
+    text    = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert time.perf_counter() - started < 10
+    assert 'Jane Doe' in text and 'Education' not in text
+    assert parser.last_extraction['time_limited']
+    assert any('second limit' in m for m in parser.last_extraction['limits'])
+
+
+# ── Resource limits ──────────────────────────────────────────────────────────
+
+def test_limits_come_from_arguments_then_environment(monkeypatch):
+    monkeypatch.setenv('RESUME_AI_MAX_PAGES', '2')
+    monkeypatch.setenv('RESUME_AI_MAX_TEXT_CHARS', 'lots')
+    assert ResumeParser().max_pages == 2
+    assert ResumeParser(max_pages=7).max_pages == 7
+    assert ResumeParser(max_pages=0).max_pages == 0       # an explicit 0 is not "unset"
+    assert ResumeParser().max_chars == 100000             # malformed: the default
+
+
+def test_page_limit_is_reported(make_pdf):
+    parser = ResumeParser(max_pages=2)
+    text   = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert 'Data Engineer' in text and 'Education' not in text
+    assert parser.last_extraction['truncated']
+    assert parser.last_extraction['limits'] == ["Only the first 2 of 3 pages were read (page limit 2)."]
+
+
+def test_zero_page_limit_reads_nothing(make_pdf):
+    parser = ResumeParser(max_pages=0)
+    assert parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES))) == ''
+    assert parser.last_extraction['limits']
+
+
+def test_character_limit_cuts_text(make_pdf):
+    parser = ResumeParser(max_chars=20)
+    text   = parser.extract_text_from_pdf(io.BytesIO(make_pdf(PAGES)))
+    assert len(text) == 20
+    assert parser.last_extraction['pages'] == 1
+    assert any('character limit' in m for m in parser.last_extraction['limits'])
+
+
+def test_oversized_upload_is_rejected(make_pdf):
+    with pytest.raises(ResourceLimitError):
+        ResumeParser(max_bytes=100).get_resume_data(io.BytesIO(make_pdf(PAGES)))
+
+
+def test_limited_results_are_served_from_cache_with_their_limits(make_pdf, tmp_path):
+    from backend.pdf_cache import ExtractionCache
+    cache = ExtractionCache(str(tmp_path))
+    pdf   = make_pdf(PAGES)
+    first = ResumeParser(cache=cache, max_pages=1)
+    first.get_resume_data(io.BytesIO(pdf))
+    again = ResumeParser(cache=cache, max_pages=1)
+    doc   = again.get_resume_data(io.BytesIO(pdf))
+    assert again.last_extraction['cached']
+    assert again.last_extraction['limits'] == first.last_extraction['limits'] != []
+    assert doc['email'] == 'jane.doe@example.com'
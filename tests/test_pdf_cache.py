@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+
+from backend.parser import ResumeParser
+from backend.pdf_cache import ExtractionCache, read_pdf_bytes
+
+PAGES = ['Jane Doe\njane.doe@example.com\n+91 98765 43210\nSkills\nPython, SQL',
+         'Experience\nData Engineer at Acme\nEducation\nBSc Computer Science']
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExtractionCache(str(tmp_path / 'cache'))
+
+
+def fail_extraction(self, pdf_file):
+    raise AssertionError("the PDF was parsed again")
+
+
+# ── Parser integration ───────────────────────────────────────────────────────
+
+def test_hit_returns_the_same_document_without_parsing(cache, make_pdf, monkeypatch):
+    pdf   = make_pdf(PAGES)
+    first = ResumeParser(cache=cache).get_resume_data(io.BytesIO(pdf))
+
+    monkeypatch.setattr(ResumeParser, 'extract_text_from_pdf', fail_extraction)
+    parser = ResumeParser(cache=cache)
+    again  = parser.get_resume_data(io.BytesIO(pdf))
+    assert parser.last_extraction['cached']
+    assert dict(again) == dict(first)
+    assert again['sections']['experience'].startswith('Experience')
+
+
+def test_extract_text_fills_the_cache_for_get_resume_data(cache, make_pdf, monkeypatch):
+    pdf  = make_pdf(PAGES)
+    text = ResumeParser(cache=cache).extract_text(io.BytesIO(pdf))
+    monkeypatch.setattr(ResumeParser, 'extract_text_from_pdf', fail_extraction)
+    doc  = ResumeParser(cache=cache).get_resume_data(io.BytesIO(pdf))
+    assert doc['text'] == text and doc['phone'] == '+91 98765 43210'
+
+
+def test_parser_settings_are_part_of_the_key(cache, make_pdf):
+    pdf = make_pdf(PAGES)
+    ResumeParser(cache=cache).get_resume_data(io.BytesIO(pdf))
+    for parser in (ResumeParser(cache=cache, strategy='pypdf2'),
+                   ResumeParser(cache=cache, max_pages=1)):
+        parser.get_resume_data(io.BytesIO(pdf))
+        assert not parser.last_extraction.get('cached')
+
+
+def test_corrupt_entry_is_a_miss(cache, make_pdf):
+    pdf = make_pdf(PAGES)
+    ResumeParser(cache=cache).get_resume_data(io.BytesIO(pdf))
+    for path in cache._entries():
+        with open(path, 'w') as f:
+            f.write('{"text": ')
+    parser = ResumeParser(cache=cache)
+    assert parser.get_resume_data(io.BytesIO(pdf))['email'] == 'jane.doe@example.com'
+    assert not parser.last_extraction.get('cached')
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=3500)
+    keys  = [ExtractionCache.key(bytes([i]), 'test') for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, {'text': 'x' * 900})
+        # Older entries get older mtimes; the first one is then used again
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])
+
+    cache.put(ExtractionCache.key(b'new', 'test'), {'text': 'x' * 900})
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    assert cache._total <= 3500 * 0.9
+
+
+def test_oversized_entry_is_not_stored(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=100)
+    key   = ExtractionCache.key(b'pdf', 'test')
+    cache.put(key, {'text': 'x' * 200})
+    assert cache.get(key) is None and cache._total == 0
+
+
+def test_read_pdf_bytes_restores_the_position():
+    pdf_file = io.BufferedReader(io.BytesIO(b'%PDF-1.4 body'))
+    pdf_file.read(4)
+    assert read_pdf_bytes(pdf_file) == b'-1.4 body'
+    assert pdf_file.tell() == 4
@@ -0,0 +1,159 @@
+import asyncio
+import copy
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from backend.pipeline import STAGES, AnalysisCancelled, ResumeAnalysisPipeline
+from backend.results import to_dicts
+
+RESUME = ("Jane Doe\njane.doe@example.com\nSkills\nPython, SQL, Docker, Kubernetes, React, "
+          "Figma, Excel\nExperience\n4 years of experience as a software engineer")
+
+
+def titles(matches):
+    return [m['title'] for m in matches]
+
+
+def counted(pipeline) -> Counter:
+    """Count how often each stage of `pipeline` is computed"""
+    calls = Counter()
+    for stage in STAGES:
+        compute = getattr(pipeline, f'_compute_{stage}')
+
+        def run(stage=stage, compute=compute):
+            calls[stage] += 1
+            return compute()
+        setattr(pipeline, f'_compute_{stage}', run)
+    return calls
+
+
+# ── Memoization and invalidation ─────────────────────────────────────────────
+
+def test_stages_are_lazy_and_computed_once(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    calls    = counted(pipeline)
+    first    = pipeline.recommendations
+    assert pipeline.recommendations is first and pipeline.job_matches
+    assert calls == Counter(resume_data=1, matcher=1, skills_data=1, recommendations=1)
+    assert not pipeline.computed('advice') and not pipeline.computed('chatbot')
+
+
+def test_changed_settings_recompute_only_downstream(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    calls    = counted(pipeline)
+    pipeline.advice
+    pipeline.set_location('India')   # unchanged: nothing is dropped
+    pipeline.set_top_k(5)
+    assert pipeline.computed('advice')
+
+    pipeline.set_location('Germany')
+    assert pipeline.computed('skills_data') and not pipeline.computed('recommendations')
+    assert not pipeline.computed('advice')
+    links = pipeline.job_matches[0]['job_portal_links']
+    assert 'Germany' in str(links) and 'India' not in str(links)
+    pipeline.advice
+    assert calls['skills_data'] == 1 and calls['recommendations'] == calls['advice'] == 2
+
+
+def test_catalog_reload_invalidates_recommendations(matcher, monkeypatch):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    calls    = counted(pipeline)
+    pipeline.recommendations
+    monkeypatch.setattr(matcher, 'catalog', copy.copy(matcher.catalog))
+    pipeline.recommendations
+    assert calls['recommendations'] == 2 and calls['skills_data'] == 1
+
+
+def test_result_invalidated_while_computing_is_not_kept(matcher):
+    pipeline  = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    recommend = pipeline._compute_recommendations
+
+    def recommend_then_change_location():
+        result = recommend()
+        pipeline.set_location('Germany')
+        return result
+
+    pipeline._compute_recommendations = recommend_then_change_location
+    pipeline.recommendations
+    assert not pipeline.computed('recommendations')
+
+
+def test_matches_identifies_the_input(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    assert pipeline.matches(text=RESUME) and not pipeline.matches(text=RESUME + ' ')
+
+
+def test_iter_stages_runs_dependencies_first(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    stages   = [stage for stage, _ in pipeline.iter_stages(['advice'])]
+    assert stages == ['resume_data', 'matcher', 'skills_data', 'recommendations', 'advice']
+
+
+# ── Concurrency and cancellation ─────────────────────────────────────────────
+
+def test_resume_embedding_overlaps_skill_extraction(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    running  = {stage: threading.Event() for stage in ('skills_data', 'resume_embedding')}
+    overlap  = {}
+
+    def in_parallel(stage, other, compute):
+        def run():
+            running[stage].set()
+            # Only returns True if the other stage is running at the same time
+            overlap[stage] = running[other].wait(5)
+            return compute()
+        return run
+
+    pipeline._compute_skills_data = in_parallel(
+        'skills_data', 'resume_embedding', pipeline._compute_skills_data)
+    pipeline._compute_resume_embedding = in_parallel(
+        'resume_embedding', 'skills_data', pipeline._compute_resume_embedding)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = asyncio.run(pipeline.analyze(['recommendations', 'resume_embedding'], executor))
+    assert overlap == {'skills_data': True, 'resume_embedding': True}
+    assert np.isclose(np.linalg.norm(results['resume_embedding']), 1.0)
+    assert results['recommendations']['top_matches']
+
+
+def test_cancel_before_analysis_runs_nothing(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    pipeline.cancel()
+    with pytest.raises(AnalysisCancelled):
+        asyncio.run(pipeline.analyze(['recommendations']))
+    assert not pipeline.computed('resume_data')
+
+
+def test_cancel_mid_analysis_skips_later_stages(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher)
+    extract  = pipeline._compute_skills_data
+
+    def cancel_then_extract():
+        pipeline.cancel()
+        return extract()
+
+    pipeline._compute_skills_data = cancel_then_extract
+    with pytest.raises(AnalysisCancelled):
+        asyncio.run(pipeline.analyze(['advice']))
+    assert not pipeline.computed('recommendations')
+    assert not pipeline.computed('advice')
+
+
+# ── Cohort matches ───────────────────────────────────────────────────────────
+
+def test_cohort_matches_ignore_session_filters(matcher):
+    pipeline = ResumeAnalysisPipeline(text=RESUME, matcher=matcher, top_k=3)
+    skills   = pipeline.skills_data['skills']
+    expected = titles(to_dicts(matcher.rank_jobs(skills, pipeline.skills_data['experience_years'], 5)))
+
+    assert titles(pipeline.cohort_matches()) == expected
+    pipeline.set_top_k(10)
+    pipeline.set_filters(categories=['Marketing'])
+    assert {m['category'] for m in pipeline.job_matches} == {'Marketing'}
+    assert titles(pipeline.cohort_matches()) == expected
+    pipeline.set_filters()
+    assert titles(pipeline.cohort_matches()) == expected
@@ -0,0 +1,40 @@
+import json
+import os
+import tracemalloc
+
+import pytest
+
+from backend import profiling
+
+
+@pytest.fixture
+def profiles(monkeypatch, tmp_path):
+    monkeypatch.setenv('RESUME_AI_PROFILE_DIR', str(tmp_path))
+    assert not tracemalloc.is_tracing()
+    yield tmp_path
+    tracemalloc.stop()
+
+
+def test_request_dump_and_own_tracing(profiles):
+    with profiling.profile_request('analyze', force=True) as out_dir:
+        with profiling.stage('parse'):
+            data = [bytes(1000) for _ in range(1000)]
+    del data
+    assert not tracemalloc.is_tracing()
+    with open(os.path.join(out_dir, 'summary.json')) as f:
+        summary = json.load(f)
+    assert [s['stage'] for s in summary['stages']] == ['parse']
+    assert summary['peak_memory_mb'] >= 0.9
+
+
+def test_outside_tracemalloc_session_is_left_alone(profiles):
+    tracemalloc.start()
+    data = [bytes(1000) for _ in range(2000)]
+    _, peak_before = tracemalloc.get_traced_memory()
+    with profiling.profile_request('analyze', force=True) as out_dir:
+        pass
+    del data
+    assert tracemalloc.is_tracing()
+    assert tracemalloc.get_traced_memory()[1] >= peak_before
+    with open(os.path.join(out_dir, 'summary.json')) as f:
+        assert json.load(f)['peak_memory_mb'] is None
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from backend.ranking import fuse_scores, score_rows, top_k_indices
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'React', 'Machine Learning']
+
+
+def catalog_arrays(catalog):
+    return ((catalog.required_indptr, catalog.required_indices),
+            (catalog.all_indptr, catalog.all_indices), catalog.embeddings)
+
+
+# ── Vectorized scores vs per-role loops ──────────────────────────────────────
+
+def test_skill_scores_match_the_per_role_calculation(matcher):
+    req, overall, _ = matcher.score_catalog(SKILLS)
+    for i, job in enumerate(matcher.catalog.job_roles):
+        required = job.get('required_skills', [])
+        assert req[i] == round(matcher.calculate_skill_match(SKILLS, required), 2)
+        assert overall[i] == round(matcher.calculate_skill_match(
+            SKILLS, required + job.get('nice_to_have', [])), 2)
+
+
+@pytest.mark.parametrize('every_tenth', [True, False])
+def test_filtered_scores_are_the_unfiltered_rows(matcher, every_tenth):
+    # A small selection is gathered first, a large one scored in place
+    mask  = matcher.skill_credit(SKILLS)
+    query = matcher._query_embedding(SKILLS, 3)
+    rows  = np.flatnonzero((np.arange(len(matcher.catalog)) % 10 == 0) == every_tenth)
+    full  = score_rows(*catalog_arrays(matcher.catalog), mask, query)
+    part  = score_rows(*catalog_arrays(matcher.catalog), mask, query, rows)
+    assert part[2] is not None
+    for whole, subset in zip(full, part):
+        assert np.array_equal(whole[rows], subset)
+
+
+# ── Fusion and selection ─────────────────────────────────────────────────────
+
+def test_weighted_fusion_formula():
+    req   = np.array([100.0, 50.0, 0.0])
+    sims  = np.array([0.2, 0.9, -0.3])
+    final = fuse_scores(req, req, sims, 'weighted', (0.6, 0.4))
+    assert final.tolist() == pytest.approx([68.0, 66.0, 0.0])
+    assert fuse_scores(req, req, None, 'weighted', (0.6, 0.4)).tolist() == [100.0, 50.0, 0.0]
+
+
+def test_rrf_scores_a_row_first_in_both_rankings_100():
+    req   = np.array([10.0, 90.0, 40.0])
+    sims  = np.array([0.1, 0.8, 0.5])
+    final = fuse_scores(req, req, sims, 'rrf')
+    assert final[1] == 100.0 and final[2] > final[0]
+
+
+def test_top_k_matches_a_full_sort():
+    rng     = np.random.default_rng(3)
+    final   = rng.integers(0, 5, 200).astype(float)   # many ties
+    overall = rng.integers(0, 3, 200).astype(float)
+    order   = sorted(range(200), key=lambda i: (-final[i], -overall[i], i))
+    for k in (0, 1, 7, 50, 200, 500):
+        assert top_k_indices(final, overall, k).tolist() == order[:k]
+
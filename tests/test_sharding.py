@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+
+from backend.catalog_bundle import compile_catalog_bundle
+from backend.matcher import JobMatcher
+from backend.results import to_dicts
+
+JOB_ROLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'job_roles.json')
+QUERIES   = [(['Python', 'SQL', 'Docker', 'Kubernetes'], 4),
+             (['Figma', 'Excel', 'Communication'], 0),
+             (['Java', 'Spring', 'AWS', 'Machine Learning', 'React'], 12)]
+
+
+def assert_same_ranking(sharded, in_process):
+    assert [m['title'] for m in sharded] == [m['title'] for m in in_process]
+    for a, b in zip(sharded, in_process):
+        assert a['matching_skills'] == b['matching_skills']
+        assert a['final_score'] == pytest.approx(b['final_score'], abs=1e-4)
+
+
+@pytest.fixture(scope='module')
+def sharded(embedding_model):
+    matcher = JobMatcher(embedding_model=embedding_model, partial_credit=0, num_shards=3)
+    yield matcher
+    matcher._shards.close()
+
+
+# ── Sharded vs in-process ────────────────────────────────────────────────────
+
+@pytest.mark.parametrize('skills, years', QUERIES)
+def test_shards_rank_like_one_process(sharded, matcher, skills, years):
+    assert len(sharded._shards.workers) == 3
+    assert_same_ranking(to_dicts(sharded.rank_jobs(skills, years, 10)),
+                        to_dicts(matcher.rank_jobs(skills, years, 10)))
+
+
+def test_shards_apply_filters_like_one_process(sharded, matcher):
+    category = matcher.catalog.job_roles[0]['category']
+    skills, years = QUERIES[0]
+    ranked = to_dicts(sharded.rank_jobs(skills, years, 10, categories=[category]))
+    assert ranked and all(m['category'] == category for m in ranked)
+    assert_same_ranking(ranked, to_dicts(matcher.rank_jobs(skills, years, 10,
+                                                           categories=[category])))
+
+
+# ── Bundle-backed shards ─────────────────────────────────────────────────────
+
+def test_recompiled_bundle_does_not_mix_catalogs(tmp_path, embedding_model, matcher):
+    bundle  = str(tmp_path / 'job_roles.bundle')
+    compile_catalog_bundle(JOB_ROLES, bundle, embedding_model)
+    sharded = JobMatcher(bundle_path=bundle, embedding_model=embedding_model,
+                         partial_credit=0, num_shards=2)
+    try:
+        with open(JOB_ROLES) as f:
+            job_roles = json.load(f)['job_roles']
+        source = tmp_path / 'job_roles.json'
+        source.write_text(json.dumps({'job_roles': job_roles[::-1]}))
+        compile_catalog_bundle(str(source), bundle, embedding_model)
+
+        # Not reloaded yet: the ranking must still come from the loaded catalog
+        skills, years = QUERIES[0]
+        assert_same_ranking(to_dicts(sharded.rank_jobs(skills, years, 10)),
+                            to_dicts(matcher.rank_jobs(skills, years, 10)))
+    finally:
+        if sharded._shards is not None:
+            sharded._shards.close()
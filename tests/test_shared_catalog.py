@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pytest
+
+from backend.matcher import JobMatcher
+from backend.results import to_dicts
+from backend.shared_catalog import SHM_DIR, SharedCatalog, segment_version
+
+SKILLS = ['Python', 'SQL', 'Docker', 'Kubernetes', 'React', 'Machine Learning']
+
+
+@pytest.fixture
+def published(matcher):
+    shared = SharedCatalog.publish(matcher.catalog)
+    yield shared
+    shared.close()
+
+
+# ── Publish / attach ─────────────────────────────────────────────────────────
+
+def test_attached_catalog_matches_the_published_one(published, matcher):
+    catalog = SharedCatalog.attach(published.name).catalog
+    assert list(catalog.job_roles) == list(matcher.catalog.job_roles)
+    assert list(catalog.role_hashes) == list(matcher.catalog.role_hashes)
+    assert np.array_equal(catalog.embeddings, matcher.catalog.embeddings)
+    assert not catalog.embeddings.flags.writeable
+
+
+def test_attached_matcher_ranks_like_the_json(published, matcher, embedding_model):
+    attached = JobMatcher(shared_catalog=published.name, embedding_model=embedding_model,
+                          partial_credit=0)
+    for years in (0, 4, 12):
+        assert to_dicts(attached.rank_jobs(SKILLS, years, 10)) == \
+               to_dicts(matcher.rank_jobs(SKILLS, years, 10))
+
+
+@pytest.mark.skipif(not os.path.isdir(SHM_DIR), reason="segments are not files here")
+def test_close_unlinks_the_segment(matcher):
+    shared = SharedCatalog.publish(matcher.catalog)
+    assert segment_version(shared.name) != 0
+    shared.close()
+    assert segment_version(shared.name) == 0
+    with pytest.raises(FileNotFoundError):
+        SharedCatalog.attach(shared.name)
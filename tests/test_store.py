@@ -0,0 +1,80 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from backend.store import ResumeStore
+
+
+def analysis(name, skills, years):
+    resume_data = {'name': name, 'email': f'{name.lower()}@example.com', 'text': f'{name} resume',
+                   'sections': {'skills': ', '.join(skills)}}
+    return resume_data, {'skills': skills, 'experience_years': years}
+
+
+def keys(rows):
+    return [r['resume_key'] for r in rows]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResumeStore(str(tmp_path / 'resumes.db')) as store:
+        store.save_many([
+            ('a', *analysis('Ann', ['Python', 'Kubernetes', 'SQL'], 5)),
+            ('b', *analysis('Bob', ['Python', 'SQL'], 2)),
+            ('c', *analysis('Cid', ['Kubernetes'], 8)),
+        ])
+        yield store
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def test_round_trip(store):
+    resume_data, skills_data = store.get('a')
+    assert resume_data['name'] == 'Ann' and resume_data['sections'] == {'skills': 'Python, Kubernetes, SQL'}
+    assert skills_data['skills'] == ['Kubernetes', 'Python', 'SQL']
+    assert skills_data['experience_years'] == 5
+    assert store.get('missing') is None
+
+
+def test_find_resumes(store):
+    assert keys(store.find_resumes(skills=['kubernetes', 'PYTHON'])) == ['a']
+    assert keys(store.find_resumes(skills=['Kubernetes', 'Python'], match_all=False)) == ['a', 'c', 'b']
+    assert keys(store.find_resumes(skills=['Python'], min_years=3)) == ['a']
+    assert keys(store.find_resumes(min_years=5)) == ['c', 'a']
+    assert sorted(store.skill_counts()) == [('Kubernetes', 2), ('Python', 2), ('SQL', 2)]
+
+
+def test_saving_a_key_again_replaces_it(store):
+    store.save('b', *analysis('Bob', ['Go'], 3))
+    assert len(store) == 3
+    assert store.get('b')[1]['skills'] == ['Go']
+    assert keys(store.find_resumes(skills=['Python'])) == ['a']
+
+
+# ── Embeddings ───────────────────────────────────────────────────────────────
+
+def test_embeddings_of_another_dimension_are_skipped(store):
+    store.save('a', *analysis('Ann', ['Python'], 5), np.ones(4), model='old-model')
+    time.sleep(0.01)
+    store.save('b', *analysis('Bob', ['SQL'], 2), np.ones(3), model='new-model')
+    store.save('c', *analysis('Cid', ['Go'], 8), np.full(3, 2.0), model='new-model')
+
+    keys, matrix = store.load_embeddings()
+    assert sorted(keys) == ['b', 'c'] and matrix.shape == (2, 3)
+    keys, matrix = store.load_embeddings(model='old-model')
+    assert keys == ['a'] and matrix.shape == (1, 4)
+    keys, matrix = store.load_embeddings(['c'], model='new-model')
+    assert keys == ['c'] and matrix.tolist() == [[2.0, 2.0, 2.0]]
+
+
+def test_store_from_before_model_names_is_migrated(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE resume_embeddings (resume_id INTEGER PRIMARY KEY, '
+                 'dim INTEGER NOT NULL, vector BLOB NOT NULL)')
+    conn.close()
+    with ResumeStore(path) as store:
+        store.save('a', *analysis('Ann', ['Python'], 5), np.ones(2), model='m')
+        assert store.load_embeddings(model='m')[0] == ['a']
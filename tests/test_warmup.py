@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from backend import warmup
+from backend.matcher import JobMatcher
+from backend.warmup import STAGES, Warmup
+
+
+@pytest.fixture(autouse=True)
+def hashing_model(monkeypatch, embedding_model):
+    monkeypatch.setattr(warmup, '_load_model', lambda: embedding_model)
+
+
+def quick_matcher(embedding_model):
+    return JobMatcher(embedding_model=embedding_model, partial_credit=0)
+
+
+def test_warmup_builds_a_ready_matcher():
+    w = Warmup(quick_matcher)
+    assert w.describe() == 'not started'
+    assert w.start().wait(30)
+    assert w.ready and isinstance(w.matcher, JobMatcher)
+    assert list(w.timings) == list(STAGES)
+    assert w.status()['state'] == 'ready' and w.stage is None
+    assert w.describe().startswith('ready')
+
+
+def test_start_while_warming_does_not_start_again():
+    release, calls = threading.Event(), []
+
+    def slow_matcher(model):
+        calls.append(model)
+        release.wait(30)
+        return quick_matcher(model)
+
+    w = Warmup(slow_matcher).start()
+    w.start()
+    assert w.state == 'warming'
+    release.set()
+    assert w.wait(30) and w.ready
+    w.start()
+    assert len(calls) == 1
+
+
+def test_failure_is_not_retried_implicitly():
+    calls = []
+
+    def failing(model):
+        calls.append(model)
+        raise RuntimeError("catalog unavailable")
+
+    w = Warmup(failing)
+    assert w.start().wait(30)
+    assert w.state == 'failed' and w.matcher is None
+    assert w.describe() == 'failed: catalog unavailable'
+    assert w.start().wait(30) and len(calls) == 1
+
+    w.matcher_factory = quick_matcher
+    assert w.start(retry=True).wait(30)
+    assert w.ready and w.error is None
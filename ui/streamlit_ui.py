@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+from contextlib import closing, nullcontext
 
 #  Fix import path - MUST be at the top before any other imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,11 +9,15 @@ parent_dir  = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from backend.parser  import ResumeParser
-from backend.skills  import SkillExtractor
+from backend.parser  import ResourceLimitError, ResumeParser
 from backend.matcher import JobMatcher
-from backend.advisor import CareerAdvisor
-from backend.chatbot import ResumeChat
+from backend.pipeline import AnalysisCancelled, ResumeAnalysisPipeline
+from backend.store   import ResumeStore
+from backend.pdf_cache import ExtractionCache
+from backend.warmup  import get_warmup, start_warmup
+from backend.cohort  import CohortStats
+from backend import profiling
+from backend.profiling import profile_request, stage
 
 # ─── Page Configuration ────────────────────────────────────────────────────────
 st.set_page_config(
@@ -22,12 +27,68 @@ st.set_page_config(
 )
 
 # ─── Session State ─────────────────────────────────────────────────────────────
-for key in ['resume_data', 'skills_data', 'job_matches', 'chatbot', 'chat_history', 'location']:
+for key in ['pipeline', 'chat_history', 'location']:
     if key not in st.session_state:
         st.session_state[key] = None if key != 'chat_history' else []
+for key in ['categories', 'departments']:
+    if key not in st.session_state:
+        st.session_state[key] = []
 if 'location' not in st.session_state or st.session_state.location is None:
     st.session_state.location = "India"
 
+# ─── Shared Resources ──────────────────────────────────────────────────────────
+@st.cache_resource
+def start_background_warmup():
+    """Start the process-wide warm-up once per server process (app.py may already have)"""
+    return start_warmup()
+
+
+start_background_warmup()
+
+
+def get_matcher() -> JobMatcher:
+    """
+    One matcher per server process, built by the background warm-up
+    (backend.warmup); hot-reloads data/job_roles.json on edit. With
+    RESUME_AI_SHARED_CATALOG set, attaches to the catalog published by
+    `python -m backend.shared_catalog` instead of building a private copy.
+    Shows warm-up progress while waiting instead of blocking silently.
+    """
+    warmup = get_warmup()
+    if not warmup.wait(0):
+        status = st.empty()
+        while not warmup.wait(0.5):
+            status.info(f"⏳ Warming up: {warmup.describe()}...")
+        status.empty()
+    if warmup.matcher is None:
+        raise RuntimeError(f"Job matcher could not be loaded ({warmup.error})")
+    return warmup.matcher
+
+
+@st.cache_resource
+def get_extraction_cache() -> ExtractionCache:
+    """Extracted text and fields keyed by PDF hash, so re-uploads skip PDF parsing."""
+    return ExtractionCache()
+
+
+@st.cache_resource
+def get_store() -> ResumeStore:
+    """Persistent SQLite store of every analyzed resume (data/resumes.db)."""
+    return ResumeStore()
+
+
+@st.cache_resource(show_spinner="Loading cohort statistics...")
+def get_cohort() -> CohortStats:
+    """
+    Cohort counts over every stored resume (data/cohort.npz); only resumes
+    not counted yet are matched, then each new analysis is added as it happens.
+    """
+    cohort = CohortStats.load_or_create()
+    if cohort.sync_store(get_store(), get_matcher()):
+        cohort.save()
+    return cohort
+
+
 # ─── Custom CSS ────────────────────────────────────────────────────────────────
 st.markdown("""
 <style>
@@ -141,6 +202,93 @@ def render_portal_buttons(job_portal_links: dict):
     )
 
 
+# ─── Analysis Results (rendered progressively on the upload page) ──────────────
+def render_contact(resume_data):
+    st.markdown('<div class="sub-header">📋 Extracted Information</div>', unsafe_allow_html=True)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("👤 Name",  resume_data.get('name',  'Not found'))
+    c2.metric("📧 Email", resume_data.get('email', 'Not found'))
+    c3.metric("📞 Phone", resume_data.get('phone', 'Not found'))
+
+
+def render_skills(skills_data):
+    if not skills_data:
+        return
+    st.markdown('<div class="sub-header">🎯 Skills Extracted</div>', unsafe_allow_html=True)
+
+    m1, m2 = st.columns(2)
+    m1.metric("Total Skills Found",   skills_data.get('skills_count', 0))
+    m2.metric("Years of Experience",  f"{skills_data.get('experience_years', 0)} yrs")
+
+    categorized = skills_data.get('categorized_skills', {})
+    if categorized:
+        st.markdown("#### Skills by Category:")
+        for category, skills_list in categorized.items():
+            if skills_list:
+                badges = "".join(
+                    f'<span style="color:black;" class="skill-badge">{s}</span>'
+                    for s in skills_list
+                )
+                st.markdown(f"**{category}:** {badges}", unsafe_allow_html=True)
+
+
+def render_match_preview(recommendations):
+    st.markdown('<div class="sub-header">💼 Top Job Matches</div>', unsafe_allow_html=True)
+    job_matches = recommendations.get('top_matches', [])
+    if not job_matches:
+        st.warning(f"⚠️ {recommendations.get('message', 'No matching job roles found')}")
+        return
+    cols = st.columns(min(3, len(job_matches)))
+    for col, job in zip(cols, job_matches):
+        col.metric(job.get('title', 'Unknown Role'),
+                   f"{job.get('final_score', job.get('match_percentage', 0)):.1f}%")
+    st.caption("Open **🎯 Job Matches** for skill details and job portal links.")
+
+
+def render_advice_preview(advice):
+    st.markdown('<div class="sub-header">💡 Career Advice</div>', unsafe_allow_html=True)
+    st.markdown(f"🎯 Target role: **{advice['target_role']}** "
+                f"({advice['match_score']:.1f}% match)")
+    missing = advice.get('skill_gap_analysis', {}).get('top_missing_skills', [])[:5]
+    if missing:
+        st.markdown("Skills to focus on: " + ", ".join(f"**{s}**" for s in missing))
+    st.caption("Open **💡 Career Advice** for your learning path and action plan.")
+
+
+# Pipeline stage -> placeholder shown until it completes, and its renderer
+ANALYSIS_STAGES = {
+    'resume_data':     "⏳ Reading your resume...",
+    'skills_data':     "⏳ Extracting skills...",
+    'recommendations': "⏳ Matching jobs...",
+    'advice':          "⏳ Preparing career advice...",
+}
+STAGE_RENDERERS = {
+    'resume_data':     render_contact,
+    'skills_data':     render_skills,
+    'recommendations': render_match_preview,
+    'advice':          render_advice_preview,
+}
+# Computed alongside (the resume embedding overlaps skill extraction) for the store
+BACKGROUND_STAGES = ['resume_embedding']
+
+
+def save_analysis(pipeline: ResumeAnalysisPipeline):
+    """Persist a new analysis beyond this session (store and cohort counts), once"""
+    if st.session_state.get('saved_digest') == pipeline.digest:
+        return
+    st.session_state.saved_digest = pipeline.digest
+    try:
+        with stage('store'):
+            get_store().save(pipeline.digest, pipeline.resume_data, pipeline.skills_data,
+                             pipeline.resume_embedding,
+                             model=pipeline.get('matcher').embedding_model.model_name)
+            cohort = get_cohort()
+            if cohort.add(pipeline.skills_data, pipeline.cohort_matches(), key=pipeline.digest):
+                cohort.save()
+    except Exception as e:
+        print(f"Could not save resume analysis: {e}")
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  SIDEBAR
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -148,7 +296,8 @@ with st.sidebar:
     st.markdown("## 🎯 Navigation")
     page = st.radio(
         "Choose a section:",
-        ["📤 Upload Resume", "🎯 Job Matches", "💡 Career Advice", "💬 Ask Questions"]
+        ["📤 Upload Resume", "🎯 Job Matches", "💡 Career Advice", "💬 Ask Questions",
+         "📊 Cohort Report"] + (["🛠️ Profiles"] if profiling.enabled() else [])
     )
 
     st.markdown("---")
@@ -162,6 +311,38 @@ with st.sidebar:
         index=0
     )
     st.session_state.location = location
+    if st.session_state.pipeline:
+        st.session_state.pipeline.set_location(location)
+
+    # Match filters, offered once the catalog is loaded
+    warmup = get_warmup()
+    if warmup.ready:
+        st.markdown("### 🗂️ Job Filters")
+        catalog = warmup.matcher.catalog
+        st.session_state.categories = st.multiselect(
+            "Categories:", catalog.facet_values('category'),
+            default=[c for c in st.session_state.categories if c in catalog.facet_values('category')],
+            placeholder="Any category",
+        )
+        st.session_state.departments = st.multiselect(
+            "Departments:", catalog.facet_values('department'),
+            default=[d for d in st.session_state.departments if d in catalog.facet_values('department')],
+            placeholder="Any department",
+        )
+        if st.session_state.pipeline:
+            st.session_state.pipeline.set_filters(st.session_state.categories,
+                                                  st.session_state.departments)
+
+    st.markdown("---")
+    if warmup.ready:
+        st.caption(f"✅ Job matcher {warmup.describe()}")
+    elif warmup.state == 'failed':
+        st.error(f"❌ Job matcher {warmup.describe()}")
+        if st.button("🔁 Retry Loading"):
+            start_warmup(retry=True)
+            st.rerun()
+    else:
+        st.warning(f"⏳ Warming up: {warmup.describe()}")
 
     st.markdown("---")
     st.markdown("### ℹ️ About")
@@ -170,11 +351,10 @@ with st.sidebar:
         "matches you with relevant jobs, and links directly to job portals."
     )
 
-    if st.session_state.resume_data:
+    if st.session_state.pipeline:
         st.success("✅ Resume uploaded & analyzed!")
         if st.button("🔄 Reset / Upload New Resume"):
-            for key in ['resume_data', 'skills_data', 'job_matches', 'chatbot']:
-                st.session_state[key] = None
+            st.session_state.pipeline     = None
             st.session_state.chat_history = []
             st.rerun()
 
@@ -205,40 +385,7 @@ if page == "📤 Upload Resume":
             type=['pdf'],
             help="Upload your resume in PDF format"
         )
-
-        if uploaded_file is not None:
-            with st.spinner("🔍 Analyzing your resume... please wait"):
-                try:
-                    # 1. Parse resume
-                    parser      = ResumeParser()
-                    resume_data = parser.get_resume_data(uploaded_file)
-                    st.session_state.resume_data = resume_data
-
-                    # 2. Extract skills
-                    extractor   = SkillExtractor()
-                    skills_data = extractor.extract_all_skills(resume_data)
-                    st.session_state.skills_data = skills_data
-
-                    # 3. Match jobs (with portal links)
-                    matcher          = JobMatcher()
-                    recommendations  = matcher.get_job_recommendations(
-                        skills_data, top_k=5,
-                        location=st.session_state.location
-                    )
-                    st.session_state.job_matches = recommendations.get('top_matches', [])
-
-                    # 4. Init chatbot
-                    st.session_state.chatbot = ResumeChat(
-                        resume_data  = resume_data,
-                        skills_data  = skills_data,
-                        job_matches  = st.session_state.job_matches
-                    )
-
-                    st.success("✅ Resume analyzed successfully! Go to **🎯 Job Matches** to see results.")
-
-                except Exception as e:
-                    st.error(f"❌ Error analyzing resume: {str(e)}")
-                    st.error("Make sure your PDF is text-based (not scanned image).")
+        status = st.empty()
 
     with col_tips:
         st.info("""
@@ -250,36 +397,71 @@ if page == "📤 Upload Resume":
 ✅ Use standard section headers
         """)
 
-    # ── Show extracted information ──
-    if st.session_state.resume_data:
+    pipeline = st.session_state.pipeline
+    fresh    = False
+    if uploaded_file is not None:
+        # Streamlit reruns this script on every interaction; only a new file is analyzed
+        if pipeline is None or pipeline.cancelled or not pipeline.matches(uploaded_file.getvalue()):
+            if pipeline is not None:
+                # Stop whatever the previous upload still has running
+                pipeline.cancel()
+            pipeline = ResumeAnalysisPipeline(
+                uploaded_file.getvalue(),
+                parser   = ResumeParser(cache=get_extraction_cache()),
+                location = st.session_state.location,
+            )
+            pipeline.set_filters(st.session_state.categories, st.session_state.departments)
+            fresh = True
+            st.session_state.pipeline     = pipeline
+            st.session_state.chat_history = []
+
+    # ── Results, rendered stage by stage as the analysis progresses ──
+    if pipeline is not None:
         st.markdown("---")
-        st.markdown('<div class="sub-header">📋 Extracted Information</div>', unsafe_allow_html=True)
-
-        r = st.session_state.resume_data
-        c1, c2, c3 = st.columns(3)
-        c1.metric("👤 Name",  r.get('name',  'Not found'))
-        c2.metric("📧 Email", r.get('email', 'Not found'))
-        c3.metric("📞 Phone", r.get('phone', 'Not found'))
-
-        # ── Skills Summary ──
-        if st.session_state.skills_data:
-            sd = st.session_state.skills_data
-            st.markdown('<div class="sub-header">🎯 Skills Extracted</div>', unsafe_allow_html=True)
-
-            m1, m2 = st.columns(2)
-            m1.metric("Total Skills Found",   sd.get('skills_count', 0))
-            m2.metric("Years of Experience",  f"{sd.get('experience_years', 0)} yrs")
-
-            categorized = sd.get('categorized_skills', {})
-            if categorized:
-                st.markdown("#### Skills by Category:")
-                for category, skills_list in categorized.items():
-                    if skills_list:
-                        badges = "".join(
-                            f'<span style="color:black;" class="skill-badge">{s}</span>'
-                            for s in skills_list
-                        )
-                        st.markdown(f"**{category}:** {badges}", unsafe_allow_html=True)
+        slots = {name: st.empty() for name in ANALYSIS_STAGES}
+        for name, waiting in ANALYSIS_STAGES.items():
+            if not pipeline.computed(name):
+                slots[name].info(waiting)
+
+        profiled = (profile_request('analyze', meta={'file': uploaded_file.name, 'bytes': uploaded_file.size})
+                    if fresh else nullcontext())
+        try:
+            # The matcher warm-up overlaps parsing and the resume embedding
+            # overlaps skill extraction; advice is computed after the
+            # matches are shown, the chatbot only when the chat tab is opened.
+            # A rerun mid-analysis leaves it running in the background for the
+            # next run to pick up; only a different upload cancels it (above).
+            with profiled as profile_dir:
+                # cProfile only sees its own thread: a sampled upload computes
+                # the stages here, one after another, so the dump covers them
+                stages = list(ANALYSIS_STAGES) + BACKGROUND_STAGES
+                if profile_dir:
+                    events = pipeline.iter_stages(stages)
+                else:
+                    events = pipeline.stream(stages, cancel_on_close=False)
+                with closing(events):
+                    for name, value in events:
+                        if name in slots:
+                            with slots[name].container():
+                                STAGE_RENDERERS[name](value)
+                        if name == 'recommendations':
+                            save_analysis(pipeline)
+
+            for message in pipeline.limits:
+                st.warning(f"⚠️ Partial analysis: {message}")
+            status.success("✅ Resume analyzed successfully! Go to **🎯 Job Matches** to see results.")
+
+        except AnalysisCancelled:
+            pass
+        except Exception as e:
+            st.session_state.pipeline = None
+            for slot in slots.values():
+                slot.empty()
+            if isinstance(e, ResourceLimitError):
+                status.error(f"❌ This document is too large to analyze. {e}")
+            else:
+                status.error(f"❌ Error analyzing resume: {str(e)}\n\n"
+                             "Make sure your PDF is text-based (not scanned image).")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -288,33 +470,33 @@ if page == "📤 Upload Resume":
 elif page == "🎯 Job Matches":
     st.markdown('<div class="sub-header">🎯 Your Top Job Matches</div>', unsafe_allow_html=True)
 
-    if not st.session_state.job_matches:
+    pipeline = st.session_state.pipeline
+    if not pipeline:
         st.warning("⚠️ Please upload your resume first to see job matches!")
         st.info("👈 Go to **📤 Upload Resume** in the sidebar.")
     else:
-        # ── Location refresh button ──
+        # Recomputed only after a location or filter change or a catalog reload
+        with st.spinner("🔍 Matching jobs..."):
+            job_matches = pipeline.job_matches
+
+        # ── Refresh button ──
         col_info, col_refresh = st.columns([3, 1])
         with col_info:
             st.success(
-                f"✅ Found **{len(st.session_state.job_matches)} matching job roles** "
-                f"— portal links set for **{st.session_state.location}**"
+                f"✅ Found **{len(job_matches)} matching job roles** "
+                f"— portal links set for **{pipeline.location}**"
+                + (f", filtered to {', '.join(pipeline.categories + pipeline.departments)}"
+                   if pipeline.categories or pipeline.departments else "")
             )
         with col_refresh:
-            if st.button("🔄 Refresh Links for New Location"):
-                if st.session_state.skills_data:
-                    matcher         = JobMatcher()
-                    recommendations = matcher.get_job_recommendations(
-                        st.session_state.skills_data,
-                        top_k=5,
-                        location=st.session_state.location
-                    )
-                    st.session_state.job_matches = recommendations.get('top_matches', [])
-                    st.rerun()
+            if st.button("🔄 Refresh Matches"):
+                pipeline.invalidate('recommendations')
+                st.rerun()
 
         st.markdown("---")
 
         # ── Render each job card ──────────────────────────────────────────────
-        for rank, job in enumerate(st.session_state.job_matches, start=1):
+        for rank, job in enumerate(job_matches, start=1):
 
             match_score = job.get('final_score', job.get('match_percentage', 0))
             title       = job.get('title', 'Unknown Role')
@@ -404,14 +586,12 @@ elif page == "🎯 Job Matches":
 elif page == "💡 Career Advice":
     st.markdown('<div class="sub-header">💡 Personalized Career Advice</div>', unsafe_allow_html=True)
 
-    if not st.session_state.job_matches or not st.session_state.skills_data:
+    if not st.session_state.pipeline:
         st.warning("⚠️ Please upload a resume first to get career advice!")
     else:
-        advisor = CareerAdvisor()
-        advice  = advisor.get_career_advice(
-            st.session_state.skills_data,
-            st.session_state.job_matches
-        )
+        # Computed on the first visit, then served from the pipeline
+        with profile_request('advice'), stage('advice'):
+            advice = st.session_state.pipeline.advice
 
         # Target Role
         st.markdown(f"### 🎯 Target Role: **{advice['target_role']}**")
@@ -482,7 +662,7 @@ elif page == "💡 Career Advice":
 elif page == "💬 Ask Questions":
     st.markdown('<div class="sub-header">💬 Ask About Your Resume</div>', unsafe_allow_html=True)
 
-    if not st.session_state.chatbot:
+    if not st.session_state.pipeline:
         st.warning("⚠️ Please upload a resume first to start chatting!")
     else:
         st.info("Ask me anything about your resume, skills, career advice, or job recommendations!")
@@ -497,7 +677,8 @@ elif page == "💬 Ask Questions":
         user_input = st.chat_input("Type your question here...")
         if user_input:
             st.session_state.chat_history.append({'role': 'user',      'content': user_input})
-            response = st.session_state.chatbot.chat(user_input)
+            with profile_request('chat'), stage('chat'):
+                response = st.session_state.pipeline.chatbot.chat(user_input)
             st.session_state.chat_history.append({'role': 'assistant', 'content': response})
             st.rerun()
 
@@ -515,11 +696,101 @@ elif page == "💬 Ask Questions":
         for col, suggestion in zip(cols, suggestions):
             if col.button(suggestion, key=f"btn_{suggestion}"):
                 st.session_state.chat_history.append({'role': 'user',      'content': suggestion})
-                response = st.session_state.chatbot.chat(suggestion)
+                with profile_request('chat'), stage('chat'):
+                    response = st.session_state.pipeline.chatbot.chat(suggestion)
                 st.session_state.chat_history.append({'role': 'assistant', 'content': response})
                 st.rerun()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  PAGE 5 — COHORT REPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+elif page == "📊 Cohort Report":
+    import pandas as pd
+
+    st.markdown('<div class="sub-header">📊 Cohort Report</div>', unsafe_allow_html=True)
+    report = get_cohort().report(top_n=20)
+
+    if not report['resumes']:
+        st.warning("⚠️ No analyzed resumes yet. Upload resumes to build the cohort report.")
+    else:
+        st.metric("Resumes analyzed", report['resumes'])
+
+        col_skills, col_gaps = st.columns(2)
+        with col_skills:
+            st.markdown("#### 🎯 Most Common Skills")
+            if report['top_skills']:
+                st.bar_chart(pd.DataFrame(report['top_skills']).set_index('name')['count'])
+        with col_gaps:
+            st.markdown("#### 📉 Most Frequent Skill Gaps")
+            if report['top_gaps']:
+                st.bar_chart(pd.DataFrame(report['top_gaps']).set_index('name')['count'])
+
+        st.markdown("#### 🏆 Best-Fit Roles")
+        if report['top_roles']:
+            st.dataframe(pd.DataFrame(report['top_roles']).rename(columns={
+                'name': 'Role', 'count': 'Top match for', 'percentage': '% of cohort'}),
+                use_container_width=True, hide_index=True)
+
+        st.markdown("#### 📈 Role Fit Distribution")
+        if report['role_fit']:
+            fit = pd.DataFrame([{'Role': r['role'], 'Matched': r['matched'],
+                                 'Mean score': r['mean_score'], **r['histogram']}
+                                for r in report['role_fit']])
+            st.dataframe(fit, use_container_width=True, hide_index=True)
+
+        col_exp, col_cov = st.columns(2)
+        with col_exp:
+            st.markdown("#### 🕒 Experience (years)")
+            st.bar_chart(pd.Series(report['experience']))
+        with col_cov:
+            st.markdown("#### ✅ Skill Coverage of Target Roles (%)")
+            st.bar_chart(pd.Series(report['coverage']))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  PAGE 6 — PROFILES (only listed when RESUME_AI_PROFILE is set)
+# ═══════════════════════════════════════════════════════════════════════════════
+elif page == "🛠️ Profiles":
+    import pandas as pd
+
+    st.markdown('<div class="sub-header">🛠️ Request Profiles</div>', unsafe_allow_html=True)
+    st.caption(f"Sampling {profiling.sample_rate():.0%} of requests into `{profiling.profile_dir()}`")
+    dumps = profiling.list_dumps()
+
+    if not dumps:
+        st.warning("⚠️ No profiles recorded yet. Analyze a resume to create one.")
+    else:
+        st.dataframe(pd.DataFrame([{
+            'Started':          d.get('started'),
+            'Request':          d.get('name'),
+            'Seconds':          d.get('seconds'),
+            'Peak memory (MB)': d.get('peak_memory_mb'),
+            'Error':            d.get('error') or '',
+            'Dump':             os.path.basename(d['path']),
+        } for d in dumps]), use_container_width=True, hide_index=True)
+
+        labels = {os.path.basename(d['path']): d for d in dumps}
+        dump   = labels[st.selectbox("Inspect a profile:", list(labels))]
+
+        if dump.get('meta'):
+            st.json(dump['meta'])
+        if dump.get('stages'):
+            st.markdown("#### ⏱️ Stages")
+            st.dataframe(pd.DataFrame(dump['stages']), use_container_width=True, hide_index=True)
+
+        st.markdown("#### 🐢 Top Functions (cumulative time)")
+        st.code(profiling.read_dump_file(dump['path'], 'profile.txt') or 'missing', language='text')
+        st.markdown("#### 🧠 Top Allocations")
+        st.code(profiling.read_dump_file(dump['path'], 'memory.txt') or 'missing', language='text')
+
+        prof_path = os.path.join(dump['path'], 'profile.prof')
+        if os.path.exists(prof_path):
+            with open(prof_path, 'rb') as f:
+                st.download_button("⬇️ Download profile.prof", f.read(),
+                                   file_name=f"{os.path.basename(dump['path'])}.prof")
+
+
 # ─── Footer ────────────────────────────────────────────────────────────────────
 st.markdown("---")
 st.markdown("""